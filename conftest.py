@@ -1,94 +1,166 @@
 # conftest.py
+import asyncio
 import os
 import json
 from pathlib import Path
+from typing import Awaitable, Callable, NoReturn
 import pytest
-from playwright.sync_api import Browser, Page
+import pytest_asyncio
+from playwright.async_api import (
+    Browser as AsyncBrowser,
+    BrowserContext as AsyncBrowserContext,
+    Page as AsyncPage,
+    async_playwright,
+)
+from playwright.sync_api import Browser, BrowserContext, Error as PWError, Page
 from dotenv import load_dotenv, find_dotenv
 from filelock import FileLock, Timeout
 
+from pages.base_page import base_url
+from utils.asset_cache import AssetCache
+from utils.auth_cache import clear_validation, read_validation, record_validation
+from utils.auth_state import inspect_state, load_state, remove_compact
+from utils.browser_server import ENDPOINTS_ENV, read_endpoints
+from utils.context_pool import ContextPool
+from utils import perf
+from utils.har import HarSession
+from utils.image_factory import ImageFactory
+from utils.login_probe import is_logged_in, is_logged_in_async
+from utils.resource_policy import ResourceBlocker
+from utils.scheduling import discover_profiles
+from utils.tracing import TraceSession
+
+pytest_plugins = [
+    "plugins.resource_blocking",
+    "plugins.har",
+    "plugins.standin",
+    # Before shared_browser, which imports its PROXY_KEY
+    "plugins.browser_watchdog",
+    "plugins.shared_browser",
+    "plugins.perf",
+    "plugins.bench",
+    "plugins.artifacts",
+    "plugins.tracing",
+    "plugins.scheduling",
+    "plugins.asset_cache",
+]
+
 # --- Paths / env -------------------------------------------------------------
 ROOT = Path(__file__).resolve().parent
 load_dotenv(find_dotenv())
-AUTH_DIR = ROOT / ".auth"
+AUTH_DIR = Path(os.getenv("AVITO_AUTH_DIR", ROOT / ".auth"))
 AUTH_DIR.mkdir(exist_ok=True)
 DATA_DIR = ROOT / "test_data"
 USERS_JSON = DATA_DIR / "test_users.json"
-BASE_URL = os.getenv("AVITO_BASE_URL", "https://www.avito.ru")
+# Idle logged-in contexts kept per worker (0 = fresh context per test, the old behaviour)
+CONTEXT_POOL_SIZE = int(os.getenv("AVITO_CONTEXT_POOL_SIZE", "2"))
+# Recycle a pooled context after this many tests to bound renderer state growth
+CONTEXT_POOL_MAX_USES = int(os.getenv("AVITO_CONTEXT_POOL_MAX_USES", "50"))
+
+_POOL_KEY = pytest.StashKey[ContextPool]()
+# nodeid -> profile it logs in as (see utils.scheduling), for pre-warming
+_PROFILES_KEY = pytest.StashKey[dict[str, str | None]]()
 
-# Remember which profiles we've already validated this session
+# Remember which profiles we've already validated this session. Other workers
+# learn the result from the sidecar record written by utils.auth_cache.
 _STATE_VALIDATED: dict[str, bool] = {}
+# One async validation per profile at a time (async_login_factory under asyncio.gather)
+_ASYNC_VALIDATION_LOCKS: dict[str, asyncio.Lock] = {}
 
 
 # --- Small helpers (no login attempts here) ----------------------------------
 def _state_file_for(profile: str) -> Path:
     """Generates the expected path for a profile's saved auth state."""
-    return AUTH_DIR / f"{profile}.json"
+    # Read at call time: the stand-in fixture points AVITO_AUTH_DIR at seeded states
+    return Path(os.getenv("AVITO_AUTH_DIR", AUTH_DIR)) / f"{profile}.json"
 
 
-def _click_continue_if_present(page: Page) -> None:
-    """Clicks the 'Continue' button if it appears after navigation."""
+def _fail_invalid_state(
+    profile: str, state_file: Path, reason: str = "session is not logged in"
+) -> NoReturn:
+    """Deletes the bad state file (and its validation record) and fails the test."""
+    _STATE_VALIDATED[profile] = False
+    clear_validation(state_file)
+    remove_compact(state_file)
     try:
-        page.get_by_text("Продолжить", exact=False).first.click(timeout=1000)
-    except Exception:
-        pass
+        state_file.unlink()
+        print(f"\n[auth] Deleted invalid state file: {state_file}")
+    except OSError as e:
+        print(f"\n[auth] Warning: Could not delete invalid state file: {e}")
 
+    pytest.fail(
+        f"Cached session is invalid for profile '{profile}' ({reason}). The bad file has been deleted.\n"
+        f"Please create a new one by running:\n"
+        f"    python tools/bootstrap_auth.py --profile {profile}"
+    )
 
-def _looks_logged_in(page: Page) -> bool:
-    """Heuristically checks if the page session is authenticated."""
-    url = page.url.lower()
-    if "profile/login" in url:
-        return False
-    if (
-        page.locator("input[name='login']").count()
-        or page.locator("input[type='password']").count()
-    ):
-        return False
-    if page.locator("text=Мой профиль").count():
-        return True
-    return "profile" in url and "login" not in url
 
+def _fail_unreadable_state(profile: str, state_file: Path, reason: str) -> NoReturn:
+    """Fails the test but keeps the file: an unreadable state is not proof of logout."""
+    pytest.fail(
+        f"Cannot read the saved session for profile '{profile}' ({reason}): {state_file}\n"
+        f"Fix or remove it, or create a new one by running:\n"
+        f"    python tools/bootstrap_auth.py --profile {profile}"
+    )
 
-def _validate_state_once(browser: Browser, profile: str, state_file: Path) -> None:
+
+def _validate_state_once(
+    browser: Browser,
+    profile: str,
+    state_file: Path,
+    blocker: ResourceBlocker | None = None,
+) -> None:
     """
     (Process-safe) Opens a temporary context to verify the session is active.
     If invalid, deletes the bad state file and fails with a clear message.
+    An expired or just-saved state is decided offline from its cookies; a state
+    whose auth cookie is merely not found goes to the probe, since only a
+    confirmed logout or expiry deletes the file. A fresh validation record written by any worker (or by tools/) is trusted
+    without taking the lock or opening a browser.
     """
     if _STATE_VALIDATED.get(profile):
         return
 
+    report = inspect_state(profile, state_file)
+    if report.status == "unreadable":
+        _fail_unreadable_state(profile, state_file, report.detail)
+    if report.status == "expired":
+        _fail_invalid_state(profile, state_file, report.detail)
+    if report.status == "fresh":
+        _STATE_VALIDATED[profile] = True
+        return
+
+    cached = read_validation(state_file)
+    if cached is not None:
+        if not cached:
+            _fail_invalid_state(profile, state_file)
+        _STATE_VALIDATED[profile] = True
+        return
+
     lock_file = state_file.with_suffix(".json.lock")
     try:
         with FileLock(str(lock_file), timeout=120):
             if _STATE_VALIDATED.get(profile):
                 return
+            # Another worker may have validated while we waited for the lock
+            if read_validation(state_file):
+                _STATE_VALIDATED[profile] = True
+                return
 
-            ctx = browser.new_context(storage_state=str(state_file))
+            ctx = browser.new_context(storage_state=load_state(state_file))
+            if blocker is not None:
+                blocker.apply(ctx)
             page = ctx.new_page()
             page.set_default_timeout(20_000)
             try:
-                page.goto(f"{BASE_URL}/profile", timeout=60_000)
-                _click_continue_if_present(page)
-
-                for _ in range(10):
-                    if _looks_logged_in(page):
-                        _STATE_VALIDATED[profile] = True
-                        return
-                    page.wait_for_timeout(500)
-                    _click_continue_if_present(page)
+                page.goto(f"{base_url()}/profile", timeout=60_000)
+                if is_logged_in(page):
+                    _STATE_VALIDATED[profile] = True
+                    record_validation(state_file, True)
+                    return
 
                 # State is invalid: delete the file before failing
-                try:
-                    state_file.unlink()
-                    print(f"\n[auth] Deleted invalid state file: {state_file}")
-                except OSError as e:
-                    print(f"\n[auth] Warning: Could not delete invalid state file: {e}")
-
-                pytest.fail(
-                    f"Cached session is invalid for profile '{profile}'. The bad file has been deleted.\n"
-                    f"Please create a new one by running:\n"
-                    f"    python tools/bootstrap_auth.py --profile {profile}"
-                )
+                _fail_invalid_state(profile, state_file)
             finally:
                 ctx.close()
     except Timeout:
@@ -97,6 +169,90 @@ def _validate_state_once(browser: Browser, profile: str, state_file: Path) -> No
         )
 
 
+async def _validate_state_once_async(
+    browser: AsyncBrowser, profile: str, state_file: Path
+) -> None:
+    """
+    Async twin of `_validate_state_once`. Offline and cached verdicts are shared
+    with the sync path; only a cache miss probes /profile, without the file lock
+    (blocking the event loop on it would stall every concurrent page).
+    Concurrent calls for one profile wait for the first: it probes once, and
+    the others reuse its verdict instead of racing it (an invalid state is
+    deleted while they would still be loading it).
+    """
+    if _STATE_VALIDATED.get(profile):
+        return
+    lock = _ASYNC_VALIDATION_LOCKS.setdefault(profile, asyncio.Lock())
+    async with lock:
+        verdict = _STATE_VALIDATED.get(profile)
+        if verdict:
+            return
+        if verdict is False:
+            pytest.fail(
+                f"Cached session for profile '{profile}' was found invalid and deleted.\n"
+                f"Please create a new one by running:\n"
+                f"    python tools/bootstrap_auth.py --profile {profile}"
+            )
+        await _probe_state_async(browser, profile, state_file)
+
+
+async def _probe_state_async(
+    browser: AsyncBrowser, profile: str, state_file: Path
+) -> None:
+    report = inspect_state(profile, state_file)
+    if report.status == "unreadable":
+        _fail_unreadable_state(profile, state_file, report.detail)
+    if report.status == "expired":
+        _fail_invalid_state(profile, state_file, report.detail)
+    cached = read_validation(state_file)
+    if report.status == "fresh" or cached:
+        _STATE_VALIDATED[profile] = True
+        return
+    if cached is False:
+        _fail_invalid_state(profile, state_file)
+
+    ctx = await browser.new_context(storage_state=load_state(state_file))
+    try:
+        page = await ctx.new_page()
+        await page.goto(f"{base_url()}/profile", timeout=60_000)
+        if await is_logged_in_async(page):
+            _STATE_VALIDATED[profile] = True
+            record_validation(state_file, True)
+            return
+    finally:
+        await ctx.close()
+    _fail_invalid_state(profile, state_file)
+
+
+# --- Hooks -------------------------------------------------------------------
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item: pytest.Item, nextitem: pytest.Item | None):
+    yield
+    # The finished test's context is parked by now; if the next test logs in as
+    # another profile, warm a context for it before its setup asks for one.
+    pool = item.config.stash.get(_POOL_KEY, None)
+    if (
+        pool is None
+        or nextitem is None
+        or "login_factory" not in getattr(nextitem, "fixturenames", ())
+    ):
+        return
+    profiles = item.config.stash.get(_PROFILES_KEY, None)
+    if profiles is None:
+        nodeids = [i.nodeid for i in item.session.items]
+        profiles = discover_profiles(nodeids, item.config.rootpath)
+        item.config.stash[_PROFILES_KEY] = profiles
+    profile = profiles.get(nextitem.nodeid)
+    # Only states this worker already validated: a bad one still fails in its test
+    if profile is None or not _STATE_VALIDATED.get(profile):
+        return
+    state_file = _state_file_for(profile)
+    try:
+        pool.prewarm(profile, state_file)
+    except (OSError, PWError):
+        pass  # the next test's acquire creates its context as before
+
+
 # --- Fixtures ----------------------------------------------------------------
 @pytest.fixture(scope="session")
 def test_users() -> dict:
@@ -107,19 +263,94 @@ def test_users() -> dict:
     return {}
 
 
+@pytest.fixture(scope="session")
+def image_factory() -> ImageFactory:
+    """
+    Upload photos as in-memory `set_input_files` payloads. Each size/format
+    variant is encoded once and cached on disk for every worker.
+
+    Usage:
+        PostAdPage(page).upload_photos(image_factory.payloads(3, width=800, height=600))
+    """
+    return ImageFactory()
+
+
+@pytest.fixture
+def state_validator(browser: Browser) -> Callable[..., None]:
+    """
+    `_validate_state_once` for tests of validation itself (tests/bench):
+    `forget=True` drops this worker's in-memory verdict first, so the call
+    falls back to the validation record, or to the probe once that is cleared.
+    """
+
+    def _validate(profile: str, state_file: Path, *, forget: bool = False) -> None:
+        if forget:
+            _STATE_VALIDATED.pop(profile, None)
+        _validate_state_once(browser, profile, state_file)
+
+    return _validate
+
+
+@pytest.fixture(scope="session")
+def context_pool(browser: Browser, pytestconfig: pytest.Config):
+    """Per-worker pool of reusable logged-in contexts (one per xdist process)."""
+    pool = ContextPool(
+        browser, max_idle=CONTEXT_POOL_SIZE, max_uses=CONTEXT_POOL_MAX_USES
+    )
+    pytestconfig.stash[_POOL_KEY] = pool
+    yield pool
+    del pytestconfig.stash[_POOL_KEY]
+    pool.close()
+
+
 @pytest.fixture
-def login_factory(browser: Browser, request: pytest.FixtureRequest):
+def login_factory(
+    browser: Browser,
+    context_pool: ContextPool,
+    resource_policy: ResourceBlocker,
+    har_session: HarSession | None,
+    trace_session: TraceSession,
+    static_asset_cache: AssetCache | None,
+    track_page: Callable[[Page], None],
+    request: pytest.FixtureRequest,
+):
     """
     Factory fixture to get a logged-in Page object for a specific test profile.
+    Contexts come from the worker's `context_pool` and are reset after the test;
+    set AVITO_CONTEXT_POOL_SIZE=0 to get a fresh context per call instead.
+    Every context gets the test's resource-blocking policy (see `resource_policy`)
+    and, with --har-record/--har-replay, the test's HAR archive. Contexts are
+    traced per --trace-policy (see `trace_session`), and with --asset-cache on
+    static assets come from the shared store (see `static_asset_cache`).
 
     Usage:
         page = login_factory("profile1")
         page = login_factory("profile2")
     """
+    recording = har_session is not None and har_session.recording
+    replaying = har_session is not None and not har_session.recording
+
+    def _wire(ctx: BrowserContext) -> Page:
+        # First registered, so it runs last: only requests no other route handled
+        if static_asset_cache is not None:
+            static_asset_cache.apply(ctx)
+        resource_policy.apply(ctx)
+        if har_session is not None:
+            har_session.attach(ctx)
+        perf.instrument(ctx)  # no-op without --perf
+        trace_session.attach(ctx)
+        # Registered after close/release, so it runs first: the chunk ends on a live context
+        request.addfinalizer(lambda: trace_session.detach(ctx))
+        page = ctx.new_page()
+        track_page(page)  # captured if the test fails
+        return page
 
     def _login(profile: str = "profile1", *, reuse_state: bool = True) -> Page:
         profile = profile.lower().strip()
         state_file = _state_file_for(profile)
+        # Recorded responses don't depend on cookies: replay works without a session
+        if replaying and not state_file.exists():
+            reuse_state = False
 
         if reuse_state:
             if not state_file.exists():
@@ -128,13 +359,107 @@ def login_factory(browser: Browser, request: pytest.FixtureRequest):
                     f"Create it manually:\n"
                     f"    python tools/bootstrap_auth.py --profile {profile}"
                 )
-            _validate_state_once(browser, profile, state_file)
-            ctx = browser.new_context(storage_state=str(state_file))
+            if not replaying:
+                with perf.step("auth.validate", kind="fixture"):
+                    _validate_state_once(browser, profile, state_file, resource_policy)
+            # A HAR recording is only flushed on close, so it needs its own context
+            if CONTEXT_POOL_SIZE > 0 and not recording:
+                with perf.step("login_factory.context", kind="fixture"):
+                    ctx = context_pool.acquire(profile, state_file)
+                request.addfinalizer(lambda: context_pool.release(ctx))
+                return _wire(ctx)
+            with perf.step("login_factory.context", kind="fixture"):
+                ctx = browser.new_context(storage_state=load_state(state_file))
         else:
             ctx = browser.new_context()
 
-        page = ctx.new_page()
         request.addfinalizer(ctx.close)
-        return page
+        return _wire(ctx)
 
     return _login
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_browser(browser_name: str, browser_type_launch_args: dict):
+    """
+    One async browser per worker, launched with pytest-playwright's CLI options,
+    or a connection to a --shared-browser server when the controller runs them.
+    """
+    published = os.getenv(ENDPOINTS_ENV)
+    endpoints = read_endpoints(Path(published)) if published else []
+    async with async_playwright() as p:
+        browser_type = getattr(p, browser_name)
+        if endpoints:
+            worker = os.getenv("PYTEST_XDIST_WORKER", "gw0")
+            slot = int(worker[2:] or 0) % len(endpoints)
+            browser = await browser_type.connect(endpoints[slot])
+        else:
+            browser = await browser_type.launch(**browser_type_launch_args)
+        yield browser
+        await browser.close()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def async_login_factory(
+    async_browser: AsyncBrowser,
+    resource_policy: ResourceBlocker,
+    har_session: HarSession | None,
+    trace_session: TraceSession,
+    static_asset_cache: AssetCache | None,
+    capture_async_pages: Callable[[list[AsyncPage]], Awaitable[None]],
+):
+    """
+    Async counterpart of `login_factory`: every call returns a page in its own
+    context, so one worker can drive many pages concurrently on one event loop.
+    Contexts are wired the same way (resource policy, HAR, --perf, traces,
+    asset cache) but never pooled; pages of a failed test are captured at
+    teardown (see `capture_async_pages`).
+
+    Usage:
+        pages = await asyncio.gather(*(async_login_factory("profile1") for _ in range(5)))
+    """
+    contexts: list[AsyncBrowserContext] = []
+    pages: list[AsyncPage] = []
+    replaying = har_session is not None and not har_session.recording
+
+    async def _login(
+        profile: str = "profile1", *, reuse_state: bool = True
+    ) -> AsyncPage:
+        profile = profile.lower().strip()
+        state_file = _state_file_for(profile)
+        # Recorded responses don't depend on cookies: replay works without a session
+        if replaying and not state_file.exists():
+            reuse_state = False
+        if reuse_state:
+            if not state_file.exists():
+                pytest.fail(
+                    f"Missing cached session for profile '{profile}': {state_file}\n"
+                    f"Create it manually:\n"
+                    f"    python tools/bootstrap_auth.py --profile {profile}"
+                )
+            if not replaying:
+                with perf.step("auth.validate", kind="fixture"):
+                    await _validate_state_once_async(async_browser, profile, state_file)
+            with perf.step("login_factory.context", kind="fixture"):
+                state = load_state(state_file)
+                ctx = await async_browser.new_context(storage_state=state)
+        else:
+            ctx = await async_browser.new_context()
+        contexts.append(ctx)
+        # Same order as login_factory's _wire: the asset cache's route runs last
+        if static_asset_cache is not None:
+            await static_asset_cache.apply_async(ctx)
+        await resource_policy.apply_async(ctx)
+        if har_session is not None:
+            await har_session.attach_async(ctx)
+        await perf.instrument_async(ctx)
+        await trace_session.attach_async(ctx)
+        page = await ctx.new_page()
+        pages.append(page)
+        return page
+
+    yield _login
+    await capture_async_pages(pages)
+    for ctx in contexts:
+        await trace_session.detach_async(ctx)
+        await ctx.close()
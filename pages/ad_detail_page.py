@@ -1,8 +1,106 @@
 # pages/ad_detail_page.py
 from __future__ import annotations
 
-from typing import Optional
-from playwright.sync_api import Page, Locator
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Union
+from playwright.sync_api import Page, Locator, TimeoutError as PWTimeout
+
+from pages.locators import AdDetailLocators
+from utils.perf import timed
+
+# One in-page pass over every field. With `ready` set it returns null until title
+# and price are visible (see EXTRACT_WHEN_READY_JS).
+EXTRACT_JS = """
+({ sel, ready }) => {
+    const visible = (el) => !!el && el.getClientRects().length > 0
+        && getComputedStyle(el).visibility !== "hidden";
+    const text = (el) => (el && el.textContent ? el.textContent.trim() : null);
+    const title = document.querySelector(sel.title);
+    const price = document.querySelector(sel.price);
+    if (ready && !(visible(title) && visible(price))) return null;
+    const location = document.querySelector(sel.location);
+    return {
+        title: text(title) || "",
+        price: text(price) || "",
+        location: visible(location) ? text(location) : null,
+        itemId: text(document.querySelector(sel.itemId)),
+        url: window.location.href,
+    };
+}
+"""
+# Polls EXTRACT_JS in-page until title and price are visible and resolves with the
+# fields, or with null after `timeout` ms: waiting and reading are one `evaluate`
+EXTRACT_WHEN_READY_JS = (
+    """
+async ({ sel, timeout }) => {
+    const extract = """
+    + EXTRACT_JS.strip()
+    + """;
+    const deadline = performance.now() + timeout;
+    for (;;) {
+        const data = extract({ sel, ready: true });
+        if (data !== null || performance.now() >= deadline) return data;
+        await new Promise((resolve) => setTimeout(resolve, 20));
+    }
+}
+"""
+)
+EXTRACT_SELECTORS = {
+    "title": AdDetailLocators.TITLE,
+    "price": AdDetailLocators.PRICE,
+    "location": AdDetailLocators.LOCATION,
+    "itemId": AdDetailLocators.ITEM_ID,
+}
+
+_CURRENCIES = {"₽": "RUB", "руб": "RUB", "$": "USD", "€": "EUR"}
+_ITEM_ID_IN_URL = re.compile(r"_(\d+)(?:[?#]|$)")
+
+
+@dataclass(frozen=True, slots=True)
+class AdDetails:
+    """Everything the ad page shows that tests read, captured in one round-trip."""
+
+    title: str
+    price_raw: str
+    price: Optional[int]
+    currency: Optional[str]
+    location: Optional[str]
+    item_id: Optional[str]
+    url: str
+
+
+def parse_price(raw: str) -> tuple[Optional[int], Optional[str]]:
+    """Split '12 990 ₽' into (12990, 'RUB'); (None, None) for 'Цена не указана'."""
+    digits = re.sub(r"\D", "", raw)
+    currency = next((code for sign, code in _CURRENCIES.items() if sign in raw), None)
+    return (int(digits) if digits else None), currency
+
+
+def ad_details_from(data: dict[str, Any]) -> AdDetails:
+    """Build the typed record from EXTRACT_JS output."""
+    price, currency = parse_price(data["price"])
+    url = data["url"]
+    match = _ITEM_ID_IN_URL.search(url)
+    item_id = match.group(1) if match else re.sub(r"\D", "", data.get("itemId") or "")
+    return AdDetails(
+        title=data["title"],
+        price_raw=data["price"],
+        price=price,
+        currency=currency,
+        location=data["location"],
+        item_id=item_id or None,
+        url=url,
+    )
+
+
+def when_ready(data: Optional[dict[str, Any]], timeout: float) -> dict[str, Any]:
+    """EXTRACT_WHEN_READY_JS output, or TimeoutError for its null (not ready in time)."""
+    if data is None:
+        raise PWTimeout(
+            f"Timeout {timeout:g}ms exceeded waiting for the ad title and price."
+        )
+    return data
 
 
 class AdDetailPage:
@@ -11,14 +109,11 @@ class AdDetailPage:
     def __init__(self, page: Page) -> None:
         self.page = page
         # Scoped to main content area to avoid duplicates in sticky footer / related ads
-        self._title_locator: Locator = page.locator(
-            '[data-marker="item-view/title-info"]'
-        )
-        self._price_locator: Locator = page.locator(
-            '.js-item-view-title-info [data-marker="item-view/item-price"]'
-        )
-        self._location_locator: Locator = page.locator('[itemprop="address"]')
+        self._title_locator: Locator = page.locator(AdDetailLocators.TITLE)
+        self._price_locator: Locator = page.locator(AdDetailLocators.PRICE)
+        self._location_locator: Locator = page.locator(AdDetailLocators.LOCATION)
 
+    @timed("ad.wait_for_loaded")
     def wait_for_loaded(self, timeout: float = 15_000) -> AdDetailPage:
         """Wait until core ad elements are visible — user signal of load."""
         self._title_locator.wait_for(state="visible", timeout=timeout)
@@ -41,3 +136,39 @@ class AdDetailPage:
             loc = self._location_locator.text_content()
             return loc.strip() if loc else None
         return None
+
+    @timed("ad.extract")
+    def extract(self, timeout: Optional[float] = None) -> AdDetails:
+        """
+        Read title, price, location and item id in one `evaluate` call.
+        With `timeout`, the same call first waits in-page for title and price to
+        be visible (replaces `wait_for_loaded` + the individual getters) and
+        raises Playwright's TimeoutError if they are not within `timeout` ms.
+        """
+        if timeout is None:
+            arg = {"sel": EXTRACT_SELECTORS, "ready": False}
+            return ad_details_from(self.page.evaluate(EXTRACT_JS, arg))
+        arg = {"sel": EXTRACT_SELECTORS, "timeout": timeout}
+        return ad_details_from(
+            when_ready(self.page.evaluate(EXTRACT_WHEN_READY_JS, arg), timeout)
+        )
+
+
+def extract_many(
+    targets: Iterable[Union[Page, str]],
+    page: Optional[Page] = None,
+    timeout: float = 15_000,
+) -> List[AdDetails]:
+    """
+    Extract several ads: already-open pages are read in place, URLs are opened
+    one after another in `page` (required when any target is a URL).
+    """
+    results: List[AdDetails] = []
+    for target in targets:
+        if isinstance(target, str):
+            if page is None:
+                raise ValueError("extract_many needs `page` to open ad URLs")
+            page.goto(target, wait_until="domcontentloaded")
+            target = page
+        results.append(AdDetailPage(target).extract(timeout=timeout))
+    return results
@@ -0,0 +1,60 @@
+# pages/aio/ad_detail_page.py
+from __future__ import annotations
+
+from typing import Optional
+from playwright.async_api import Page, Locator
+
+from pages.ad_detail_page import (
+    EXTRACT_JS,
+    EXTRACT_SELECTORS,
+    EXTRACT_WHEN_READY_JS,
+    AdDetails,
+    ad_details_from,
+    when_ready,
+)
+from pages.locators import AdDetailLocators
+from utils.perf import timed
+
+
+class AdDetailPage:
+    """Async Avito ad detail page: same locators and reads as pages.ad_detail_page."""
+
+    def __init__(self, page: Page) -> None:
+        self.page = page
+        self._title_locator: Locator = page.locator(AdDetailLocators.TITLE)
+        self._price_locator: Locator = page.locator(AdDetailLocators.PRICE)
+        self._location_locator: Locator = page.locator(AdDetailLocators.LOCATION)
+
+    @timed("ad.wait_for_loaded")
+    async def wait_for_loaded(self, timeout: float = 15_000) -> AdDetailPage:
+        """Wait until core ad elements are visible — user signal of load."""
+        await self._title_locator.wait_for(state="visible", timeout=timeout)
+        await self._price_locator.wait_for(state="visible", timeout=timeout)
+        return self
+
+    async def get_title(self) -> str:
+        """Return ad title text (assumes element is visible due to wait_for_loaded)."""
+        title = await self._title_locator.text_content()
+        return title.strip() if title else ""
+
+    async def get_price(self) -> str:
+        """Return ad price text (e.g., '12 990 ₽')."""
+        price = await self._price_locator.text_content()
+        return price.strip() if price else ""
+
+    async def get_location(self) -> Optional[str]:
+        """Return ad location if present and visible."""
+        if await self._location_locator.is_visible():
+            loc = await self._location_locator.text_content()
+            return loc.strip() if loc else None
+        return None
+
+    @timed("ad.extract")
+    async def extract(self, timeout: Optional[float] = None) -> AdDetails:
+        """Async twin of pages.ad_detail_page.AdDetailPage.extract (one round-trip)."""
+        if timeout is None:
+            arg = {"sel": EXTRACT_SELECTORS, "ready": False}
+            return ad_details_from(await self.page.evaluate(EXTRACT_JS, arg))
+        arg = {"sel": EXTRACT_SELECTORS, "timeout": timeout}
+        data = await self.page.evaluate(EXTRACT_WHEN_READY_JS, arg)
+        return ad_details_from(when_ready(data, timeout))
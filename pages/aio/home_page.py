@@ -0,0 +1,58 @@
+# pages/aio/home_page.py
+from __future__ import annotations
+
+from typing import List
+from playwright.async_api import Page, Locator
+
+from pages.aio.search_results_page import SearchResultsPage
+from pages.base_page import base_url
+from pages.home_page import AD_HREFS_JS, AD_TITLES_JS
+from pages.locators import HomeLocators
+from pages.search_query import SearchQuery
+from utils.perf import timed
+
+
+class HomePage:
+    """Async Avito homepage: same locators and actions as pages.home_page.HomePage."""
+
+    def __init__(self, page: Page) -> None:
+        self.page = page
+        self._search_input: Locator = page.locator(HomeLocators.SEARCH_INPUT)
+        self._search_button: Locator = page.locator(HomeLocators.SEARCH_BUTTON)
+        self._first_ad_title: Locator = page.locator(HomeLocators.AD_TITLE).first
+        self._ad_title_locator: Locator = page.locator(HomeLocators.AD_TITLE)
+
+    @timed("home.navigate")
+    async def navigate(self) -> HomePage:
+        """Open Avito homepage and wait for initial render."""
+        await self.page.goto(base_url(), wait_until="domcontentloaded")
+        return self
+
+    @timed("home.search")
+    async def search(self, query: str) -> HomePage:
+        """Fill search input and click submit button."""
+        await self._search_input.fill(query)
+        await self._search_button.click()
+        return self
+
+    async def search_filtered(self, query: SearchQuery) -> SearchResultsPage:
+        """Open the results for `query` (text + filters) directly, skipping the form."""
+        return await SearchResultsPage(self.page).open(query)
+
+    @timed("home.wait_for_results")
+    async def wait_for_results(self, timeout: float = 15_000) -> HomePage:
+        """Wait until at least one ad title is visible (user signal that results loaded)."""
+        await self._first_ad_title.wait_for(state="visible", timeout=timeout)
+        return self
+
+    async def get_visible_ad_titles(self, max_count: int = 10) -> List[str]:
+        """Return up to `max_count` visible ad titles (read-only, no interaction)."""
+        return await self._ad_title_locator.evaluate_all(AD_TITLES_JS, max_count)
+
+    async def get_visible_ad_hrefs(self, max_count: int = 10) -> List[str]:
+        """Return up to `max_count` absolute ad URLs, to open directly (no popup)."""
+        return await self._ad_title_locator.evaluate_all(AD_HREFS_JS, max_count)
+
+    def results(self) -> SearchResultsPage:
+        """The listing currently shown, for lazy structured iteration."""
+        return SearchResultsPage(self.page)
@@ -0,0 +1,58 @@
+# pages/aio/login_page.py
+from __future__ import annotations
+
+from playwright.async_api import Page, Locator
+
+from pages.base_page import base_url
+from pages.locators import LoginLocators
+from utils.perf import timed
+
+
+class LoginPage:
+    """Async Avito login screen: same locators and actions as pages.login_page."""
+
+    def __init__(self, page: Page) -> None:
+        self.page = page
+        self._username_input: Locator = page.locator(LoginLocators.USERNAME)
+        self._password_input: Locator = page.locator(LoginLocators.PASSWORD)
+        self._submit_btn: Locator = page.get_by_role(
+            LoginLocators.SUBMIT_ROLE, name=LoginLocators.SUBMIT_NAME
+        )
+        self._error: Locator = page.locator(LoginLocators.ERROR)
+
+    # -------- actions (no assertions) --------
+    @timed("login.navigate")
+    async def navigate(self) -> None:
+        """Open login page and wait until the form is ready."""
+        await self.page.goto(
+            f"{base_url()}/profile/login", wait_until="domcontentloaded"
+        )
+        await self._username_input.wait_for(state="visible")
+
+    async def fill_username(self, username: str) -> None:
+        await self._username_input.fill(username)
+
+    async def fill_password(self, password: str) -> None:
+        await self._password_input.fill(password)
+
+    async def submit(self) -> None:
+        await self._submit_btn.click()
+
+    @timed("login.submit")
+    async def login(self, username: str, password: str) -> None:
+        """Convenience: fill both fields and click submit."""
+        await self.fill_username(username)
+        await self.fill_password(password)
+        await self.submit()
+
+    # -------- surfaced locators/data for tests --------
+    @property
+    def error_locator(self) -> Locator:
+        """Expose the error locator so tests can assert on it."""
+        return self._error
+
+    async def error_text_now(self) -> str | None:
+        """Return current error text if visible, else None (no assertions)."""
+        if await self._error.is_visible():
+            return await self._error.inner_text()
+        return None
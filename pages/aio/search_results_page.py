@@ -0,0 +1,91 @@
+# pages/aio/search_results_page.py
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Optional
+from playwright.async_api import Page, Locator, TimeoutError as PWTimeout
+
+from pages.locators import SearchResultsLocators
+from pages.search_query import SearchQuery
+from pages.search_results_page import (
+    CARD_SELECTORS,
+    CARDS_JS,
+    FILTER_SELECTORS,
+    FILTERS_JS,
+    MORE_CARDS_JS,
+    SCROLL_JS,
+    ResultCard,
+    filters_from,
+    result_card_from,
+)
+from utils.perf import timed
+
+
+class SearchResultsPage:
+    """Async Avito search listing: same scripts and paging as pages.search_results_page."""
+
+    def __init__(self, page: Page) -> None:
+        self.page = page
+        self._first_card: Locator = page.locator(SearchResultsLocators.CARD).first
+
+    @timed("results.open")
+    async def open(self, query: SearchQuery) -> SearchResultsPage:
+        """Go straight to the filtered listing: one navigation instead of UI filter clicks."""
+        await self.page.goto(query.url(), wait_until="domcontentloaded")
+        return self
+
+    async def refine(self, **changes: Any) -> SearchResultsPage:
+        """Re-open the current listing with some filters changed, e.g. `refine(price_max=5000)`."""
+        return await self.open((await self.active_filters()).updated(**changes))
+
+    async def active_filters(self) -> SearchQuery:
+        """The filters the rendered listing applies (URL + filter controls, one evaluate)."""
+        data = await self.page.evaluate(FILTERS_JS, {"sel": FILTER_SELECTORS})
+        return filters_from(data)
+
+    @timed("results.wait")
+    async def wait_for_results(self, timeout: float = 15_000) -> SearchResultsPage:
+        """Wait until at least one result card is visible."""
+        await self._first_card.wait_for(state="visible", timeout=timeout)
+        return self
+
+    async def iter_results(
+        self,
+        limit: Optional[int] = None,
+        batch_size: int = 10,
+        max_pages: Optional[int] = None,
+        scroll_timeout: float = 3_000,
+    ) -> AsyncIterator[ResultCard]:
+        """Async twin of pages.search_results_page.SearchResultsPage.iter_results."""
+        yielded, offset, pages = 0, 0, 1
+        while limit is None or yielded < limit:
+            want = batch_size if limit is None else min(batch_size, limit - yielded)
+            chunk = await self.page.evaluate(
+                CARDS_JS, {"sel": CARD_SELECTORS, "offset": offset, "limit": want}
+            )
+            if chunk["cards"]:
+                for data in chunk["cards"]:
+                    yield result_card_from(data)
+                yielded += len(chunk["cards"])
+                offset += len(chunk["cards"])
+                continue
+            if max_pages is not None and pages >= max_pages:
+                return
+            if chunk["next"]:
+                await self.page.goto(chunk["next"], wait_until="domcontentloaded")
+                await self.wait_for_results()
+                offset, pages = 0, pages + 1
+            elif not await self._scroll_for_more(chunk["total"], scroll_timeout):
+                return
+
+    async def _scroll_for_more(self, rendered: int, timeout: float) -> bool:
+        """Scroll to the bottom and wait for more cards (infinite-scroll listings)."""
+        await self.page.evaluate(SCROLL_JS)
+        try:
+            await self.page.wait_for_function(
+                MORE_CARDS_JS,
+                arg={"sel": SearchResultsLocators.CARD, "rendered": rendered},
+                timeout=timeout,
+            )
+        except PWTimeout:
+            return False
+        return True
@@ -0,0 +1,11 @@
+# pages/base_page.py
+from __future__ import annotations
+
+import os
+
+DEFAULT_BASE_URL = "https://www.avito.ru"
+
+
+def base_url() -> str:
+    """AVITO_BASE_URL read at call time, so a stand-in server started by a fixture is honoured."""
+    return os.getenv("AVITO_BASE_URL", DEFAULT_BASE_URL).strip().rstrip("/")
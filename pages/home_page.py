@@ -1,12 +1,18 @@
 # pages/home_page.py
 from __future__ import annotations
 
-import os
 from typing import List
 from playwright.sync_api import Page, Locator
 
-# Fix: strip trailing whitespace from BASE_URL
-BASE_URL = os.getenv("AVITO_BASE_URL", "https://www.avito.ru").strip()
+from pages.base_page import base_url
+from pages.locators import HomeLocators
+from pages.search_query import SearchQuery
+from pages.search_results_page import SearchResultsPage
+from utils.perf import timed
+
+# Slices in the page: only `n` strings cross the wire
+AD_TITLES_JS = "(els, n) => els.slice(0, n).map((el) => el.textContent)"
+AD_HREFS_JS = "(els, n) => els.slice(0, n).map((el) => el.href).filter(Boolean)"
 
 
 class HomePage:
@@ -15,28 +21,31 @@ class HomePage:
     def __init__(self, page: Page) -> None:
         self.page = page
         # Stable locators from live DOM (per data-marker)
-        self._search_input: Locator = page.locator(
-            '[data-marker="search-form/suggest/input"]'
-        )
-        self._search_button: Locator = page.locator(
-            '[data-marker="search-form/submit-button"]'
-        )
+        self._search_input: Locator = page.locator(HomeLocators.SEARCH_INPUT)
+        self._search_button: Locator = page.locator(HomeLocators.SEARCH_BUTTON)
         # CORRECTED: wait for at least one ad title to appear (user sees this)
-        self._first_ad_title: Locator = page.locator('[data-marker="item-title"]').first
-        self._ad_title_locator: Locator = page.locator('[data-marker="item-title"]')
+        self._first_ad_title: Locator = page.locator(HomeLocators.AD_TITLE).first
+        self._ad_title_locator: Locator = page.locator(HomeLocators.AD_TITLE)
 
+    @timed("home.navigate")
     def navigate(self) -> HomePage:
         """Open Avito homepage and wait for initial render."""
-        self.page.goto(BASE_URL, wait_until="domcontentloaded")
+        self.page.goto(base_url(), wait_until="domcontentloaded")
         self.page.wait_for_load_state("domcontentloaded")  # wait for initial render
         return self
 
+    @timed("home.search")
     def search(self, query: str) -> HomePage:
         """Fill search input and click submit button."""
         self._search_input.fill(query)
         self._search_button.click()
         return self
 
+    def search_filtered(self, query: SearchQuery) -> SearchResultsPage:
+        """Open the results for `query` (text + filters) directly, skipping the form."""
+        return SearchResultsPage(self.page).open(query)
+
+    @timed("home.wait_for_results")
     def wait_for_results(self, timeout: float = 15_000) -> HomePage:
         """Wait until at least one ad title is visible (user signal that results loaded)."""
         self._first_ad_title.wait_for(state="visible", timeout=timeout)
@@ -44,5 +53,12 @@ class HomePage:
 
     def get_visible_ad_titles(self, max_count: int = 10) -> List[str]:
         """Return up to `max_count` visible ad titles (read-only, no interaction)."""
-        titles = self._ad_title_locator.all_text_contents()
-        return titles[:max_count]
+        return self._ad_title_locator.evaluate_all(AD_TITLES_JS, max_count)
+
+    def get_visible_ad_hrefs(self, max_count: int = 10) -> List[str]:
+        """Return up to `max_count` absolute ad URLs, to open directly (no popup)."""
+        return self._ad_title_locator.evaluate_all(AD_HREFS_JS, max_count)
+
+    def results(self) -> SearchResultsPage:
+        """The listing currently shown, for lazy structured iteration."""
+        return SearchResultsPage(self.page)
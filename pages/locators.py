@@ -0,0 +1,64 @@
+# pages/locators.py
+# Selector definitions shared by the sync POMs (pages/*.py) and their async
+# counterparts (pages/aio/*.py), so both always target the same DOM.
+from __future__ import annotations
+
+from typing import Literal
+
+
+class HomeLocators:
+    """Stable locators from live DOM (per data-marker)."""
+
+    SEARCH_INPUT = '[data-marker="search-form/suggest/input"]'
+    SEARCH_BUTTON = '[data-marker="search-form/submit-button"]'
+    AD_TITLE = '[data-marker="item-title"]'
+
+
+class SearchResultsLocators:
+    """Result cards on a listing page; title/price are looked up inside each card."""
+
+    CARD = '[data-marker="item"]'
+    TITLE = '[data-marker="item-title"]'
+    PRICE = '[data-marker="item-price"]'
+    NEXT_PAGE = '[data-marker="pagination-button/nextPage"]'
+
+
+class SearchFilterLocators:
+    """Filter controls on a listing page, read back to see which filters are applied."""
+
+    QUERY = HomeLocators.SEARCH_INPUT
+    PRICE_FROM = '[data-marker="price/from"]'
+    PRICE_TO = '[data-marker="price/to"]'
+    SORT = '[data-marker="sort/select"]'
+    DELIVERY = '[data-marker="delivery-filter/checkbox"]'
+
+
+class AdDetailLocators:
+    """Scoped to main content area to avoid duplicates in sticky footer / related ads."""
+
+    TITLE = '[data-marker="item-view/title-info"]'
+    PRICE = '.js-item-view-title-info [data-marker="item-view/item-price"]'
+    LOCATION = '[itemprop="address"]'
+    ITEM_ID = '[data-marker="item-view/item-id"]'
+
+
+class PostAdLocators:
+    """Ad form at /additem: details, the photo step and the published confirmation."""
+
+    TITLE = '[data-marker="post-ad/title"]'
+    DESCRIPTION = '[data-marker="post-ad/description"]'
+    PRICE = '[data-marker="post-ad/price"]'
+    PHOTO_INPUT = '[data-marker="post-ad/photos"] input[type="file"]'
+    PHOTO_PREVIEW = '[data-marker="post-ad/photo-preview"]'
+    SUBMIT = '[data-marker="post-ad/submit"]'
+    ITEM_LINK = '[data-marker="post-ad/success"] a'
+
+
+class LoginLocators:
+    """Prefer stable attrs / roles; Avito widely uses data-marker."""
+
+    USERNAME = '[name="login"]'
+    PASSWORD = '[name="password"]'
+    SUBMIT_ROLE: Literal["button"] = "button"
+    SUBMIT_NAME = "Войти"
+    ERROR = '[data-marker="login-form/error"], [data-marker="auth/error"]'
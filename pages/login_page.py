@@ -1,10 +1,11 @@
 # pages/login_page.py
 from __future__ import annotations
 
-import os
 from playwright.sync_api import Page, Locator
 
-BASE_URL = os.getenv("AVITO_BASE_URL", "https://www.avito.ru")
+from pages.base_page import base_url
+from pages.locators import LoginLocators
+from utils.perf import timed
 
 
 class LoginPage:
@@ -13,18 +14,19 @@ class LoginPage:
     def __init__(self, page: Page) -> None:
         self.page = page
         # Locators — prefer stable attrs / roles; adjust to real DOM if needed.
-        self._username_input: Locator = page.locator('[name="login"]')
-        self._password_input: Locator = page.locator('[name="password"]')
-        self._submit_btn: Locator = page.get_by_role("button", name="Войти")
-        # Avito widely uses data-marker; include a tolerant selector.
-        self._error: Locator = page.locator(
-            '[data-marker="login-form/error"], [data-marker="auth/error"]'
+        self._username_input: Locator = page.locator(LoginLocators.USERNAME)
+        self._password_input: Locator = page.locator(LoginLocators.PASSWORD)
+        self._submit_btn: Locator = page.get_by_role(
+            LoginLocators.SUBMIT_ROLE, name=LoginLocators.SUBMIT_NAME
         )
+        # Avito widely uses data-marker; include a tolerant selector.
+        self._error: Locator = page.locator(LoginLocators.ERROR)
 
     # -------- actions (no assertions) --------
+    @timed("login.navigate")
     def navigate(self) -> None:
         """Open login page and wait until the form is ready."""
-        self.page.goto(f"{BASE_URL}/profile/login", wait_until="domcontentloaded")
+        self.page.goto(f"{base_url()}/profile/login", wait_until="domcontentloaded")
         self._username_input.wait_for(state="visible")
 
     def fill_username(self, username: str) -> None:
@@ -36,6 +38,7 @@ class LoginPage:
     def submit(self) -> None:
         self._submit_btn.click()
 
+    @timed("login.submit")
     def login(self, username: str, password: str) -> None:
         """Convenience: fill both fields and click submit."""
         self.fill_username(username)
@@ -0,0 +1,69 @@
+# pages/post_ad_page.py
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+from playwright.sync_api import FilePayload, Locator, Page
+
+from pages.base_page import base_url
+from pages.locators import PostAdLocators
+from utils.perf import timed
+
+
+class PostAdPage:
+    """Avito "post an ad" form: details, photo upload, publish (no assertions)."""
+
+    def __init__(self, page: Page) -> None:
+        self.page = page
+        self._title: Locator = page.locator(PostAdLocators.TITLE)
+        self._description: Locator = page.locator(PostAdLocators.DESCRIPTION)
+        self._price: Locator = page.locator(PostAdLocators.PRICE)
+        self._photo_input: Locator = page.locator(PostAdLocators.PHOTO_INPUT)
+        self._previews: Locator = page.locator(PostAdLocators.PHOTO_PREVIEW)
+        self._submit: Locator = page.locator(PostAdLocators.SUBMIT)
+        self._item_link: Locator = page.locator(PostAdLocators.ITEM_LINK)
+
+    @timed("post_ad.navigate")
+    def navigate(self) -> PostAdPage:
+        """Open the ad form and wait until it can be filled."""
+        self.page.goto(f"{base_url()}/additem", wait_until="domcontentloaded")
+        self._title.wait_for(state="visible")
+        return self
+
+    def fill_details(self, title: str, description: str, price: int) -> PostAdPage:
+        self._title.fill(title)
+        self._description.fill(description)
+        self._price.fill(str(price))
+        return self
+
+    @timed("post_ad.upload_photos")
+    def upload_photos(
+        self,
+        photos: Union[Sequence[FilePayload], Sequence[Path]],
+        timeout: float = 15_000,
+    ) -> PostAdPage:
+        """
+        Attach every photo in one `set_input_files` call, straight from memory
+        (see utils.image_factory) or from paths, then wait until the last
+        preview renders.
+        The selection replaces any earlier one, as the file input does.
+        """
+        self._photo_input.set_input_files(photos)
+        if photos:
+            self._previews.nth(len(photos) - 1).wait_for(
+                state="visible", timeout=timeout
+            )
+        return self
+
+    def photo_count(self) -> int:
+        """Previews currently shown."""
+        return self._previews.count()
+
+    @timed("post_ad.publish")
+    def publish(self, timeout: float = 30_000) -> Optional[str]:
+        """Submit the form; returns the published ad's URL once it is confirmed."""
+        self._submit.click()
+        self._item_link.wait_for(state="visible", timeout=timeout)
+        href = self._item_link.get_attribute("href")
+        return f"{base_url()}{href}" if href and href.startswith("/") else href
@@ -0,0 +1,133 @@
+# pages/search_query.py
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass, fields
+from enum import Enum
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from pages.base_page import base_url
+
+_SLUG = re.compile(r"^[a-z0-9_-]+$")
+ALL_REGIONS = "all"
+
+
+class Sort(Enum):
+    """Avito's `s` parameter."""
+
+    DEFAULT = "101"
+    DATE = "104"
+    PRICE_ASC = "1"
+    PRICE_DESC = "2"
+
+
+@dataclass(frozen=True, slots=True)
+class SearchQuery:
+    """
+    A listing search as Avito encodes it in the URL:
+    `/<region>[/<category>]?q=<text>&pmin=&pmax=&s=<sort>&d=1`.
+    Build one and open `url()` to get a filtered listing in a single navigation.
+    """
+
+    text: str = ""
+    category: Optional[str] = None
+    region: str = ALL_REGIONS
+    price_min: Optional[int] = None
+    price_max: Optional[int] = None
+    sort: Sort = Sort.DEFAULT
+    delivery: bool = False
+
+    def __post_init__(self) -> None:
+        self._check(*(f.name for f in fields(self)))
+
+    def _check(self, *names: str) -> None:
+        """Raise ValueError if one of the named filters is not valid input."""
+        for name in names:
+            value = getattr(self, name)
+            if value is None:
+                continue
+            if name in ("region", "category") and not _SLUG.match(value):
+                raise ValueError(f"{name} must be an Avito URL slug, got {value!r}")
+            if name in ("price_min", "price_max") and value < 0:
+                raise ValueError(f"{name} must not be negative, got {value}")
+        if (
+            {"price_min", "price_max"} & set(names)
+            and self.price_min is not None
+            and self.price_max is not None
+            and self.price_min > self.price_max
+        ):
+            raise ValueError(
+                f"price_min ({self.price_min}) is above price_max ({self.price_max})"
+            )
+
+    @classmethod
+    def lenient(cls, **values: Any) -> SearchQuery:
+        """
+        Build without validation, for filters read back from a URL or a page:
+        what Avito (or the stand-in) serves is taken as it is, not rejected.
+        """
+        names = {f.name for f in fields(cls)}
+        unknown = set(values) - names
+        if unknown:
+            raise TypeError(f"unknown SearchQuery fields: {', '.join(sorted(unknown))}")
+        query = object.__new__(cls)
+        for f in fields(cls):
+            object.__setattr__(query, f.name, values.get(f.name, f.default))
+        return query
+
+    def updated(self, **changes: Any) -> SearchQuery:
+        """A copy with `changes` applied; only the changed filters are validated."""
+        query = self.lenient(**{**asdict(self), **changes})
+        query._check(*changes)
+        return query
+
+    @property
+    def path(self) -> str:
+        return f"/{self.region}" + (f"/{self.category}" if self.category else "")
+
+    def params(self) -> dict[str, str]:
+        """Query-string parameters; defaults are left out, as Avito does."""
+        params = {}
+        if self.text:
+            params["q"] = self.text
+        if self.price_min is not None:
+            params["pmin"] = str(self.price_min)
+        if self.price_max is not None:
+            params["pmax"] = str(self.price_max)
+        if self.sort is not Sort.DEFAULT:
+            params["s"] = self.sort.value
+        if self.delivery:
+            params["d"] = "1"
+        return params
+
+    def url(self, base: Optional[str] = None) -> str:
+        """Results URL on `base` (default: AVITO_BASE_URL, read at call time)."""
+        query = urlencode(self.params())
+        return f"{base or base_url()}{self.path}" + (f"?{query}" if query else "")
+
+    @classmethod
+    def from_url(cls, url: str) -> SearchQuery:
+        """
+        Parse a results URL back, leniently (see `lenient`); unknown parameters
+        (page, tracking) are ignored.
+        """
+        parts = urlsplit(url)
+        segments = [s for s in parts.path.split("/") if s]
+        params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        sort = params.get("s", Sort.DEFAULT.value)
+        return cls.lenient(
+            text=params.get("q", ""),
+            region=segments[0] if segments else ALL_REGIONS,
+            category=segments[1] if len(segments) > 1 else None,
+            price_min=parse_amount(params.get("pmin")),
+            price_max=parse_amount(params.get("pmax")),
+            sort=next((s for s in Sort if s.value == sort), Sort.DEFAULT),
+            delivery=params.get("d") == "1",
+        )
+
+
+def parse_amount(raw: Optional[str]) -> Optional[int]:
+    """'15 000' / '15000' -> 15000; empty or non-numeric -> None."""
+    digits = re.sub(r"\D", "", raw or "")
+    return int(digits) if digits else None
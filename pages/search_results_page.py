@@ -0,0 +1,189 @@
+# pages/search_results_page.py
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator, Optional
+from playwright.sync_api import Page, Locator, TimeoutError as PWTimeout
+
+from pages.ad_detail_page import parse_price
+from pages.locators import SearchFilterLocators, SearchResultsLocators
+from pages.search_query import SearchQuery, Sort, parse_amount
+from utils.perf import timed
+
+# Reads one slice of cards in-page, so only `limit` cards ever cross the wire
+CARDS_JS = """
+({ sel, offset, limit }) => {
+    const cards = Array.from(document.querySelectorAll(sel.card));
+    const text = (el) => (el && el.textContent ? el.textContent.trim() : "");
+    const next = document.querySelector(sel.nextPage);
+    return {
+        total: cards.length,
+        next: next ? next.href : null,
+        cards: cards.slice(offset, offset + limit).map((card) => {
+            const link = card.querySelector(sel.title);
+            return {
+                title: text(link),
+                price: text(card.querySelector(sel.price)),
+                href: link ? link.href : null,
+                itemId: card.getAttribute("data-item-id"),
+            };
+        }),
+    };
+}
+"""
+SCROLL_JS = "window.scrollTo(0, document.body.scrollHeight)"
+MORE_CARDS_JS = (
+    "({ sel, rendered }) => document.querySelectorAll(sel).length > rendered"
+)
+# URL plus the filter controls' state, in one round-trip
+FILTERS_JS = """
+({ sel }) => {
+    const value = (s) => {
+        const el = document.querySelector(s);
+        return el ? el.value : null;
+    };
+    const box = document.querySelector(sel.delivery);
+    return {
+        url: location.href,
+        query: value(sel.query),
+        priceFrom: value(sel.priceFrom),
+        priceTo: value(sel.priceTo),
+        sort: value(sel.sort),
+        delivery: box ? box.checked : null,
+    };
+}
+"""
+FILTER_SELECTORS = {
+    "query": SearchFilterLocators.QUERY,
+    "priceFrom": SearchFilterLocators.PRICE_FROM,
+    "priceTo": SearchFilterLocators.PRICE_TO,
+    "sort": SearchFilterLocators.SORT,
+    "delivery": SearchFilterLocators.DELIVERY,
+}
+CARD_SELECTORS = {
+    "card": SearchResultsLocators.CARD,
+    "title": SearchResultsLocators.TITLE,
+    "price": SearchResultsLocators.PRICE,
+    "nextPage": SearchResultsLocators.NEXT_PAGE,
+}
+_ITEM_ID_IN_URL = re.compile(r"_(\d+)(?:[?#]|$)")
+
+
+@dataclass(frozen=True, slots=True)
+class ResultCard:
+    """One search result as rendered on the listing page."""
+
+    title: str
+    price_raw: str
+    price: Optional[int]
+    currency: Optional[str]
+    href: Optional[str]
+    item_id: Optional[str]
+
+
+def result_card_from(data: dict[str, Any]) -> ResultCard:
+    price, currency = parse_price(data["price"])
+    item_id = data.get("itemId")
+    if not item_id and data.get("href"):
+        match = _ITEM_ID_IN_URL.search(data["href"])
+        item_id = match.group(1) if match else None
+    return ResultCard(
+        title=data["title"],
+        price_raw=data["price"],
+        price=price,
+        currency=currency,
+        href=data.get("href"),
+        item_id=item_id,
+    )
+
+
+def filters_from(data: dict[str, Any]) -> SearchQuery:
+    """The URL's filters, overridden by whatever the rendered controls show."""
+    query = SearchQuery.from_url(data["url"])
+    changes: dict[str, Any] = {}
+    if data["query"] is not None:
+        changes["text"] = data["query"].strip()
+    if data["priceFrom"] is not None:
+        changes["price_min"] = parse_amount(data["priceFrom"])
+    if data["priceTo"] is not None:
+        changes["price_max"] = parse_amount(data["priceTo"])
+    if data["sort"]:
+        changes["sort"] = next((s for s in Sort if s.value == data["sort"]), query.sort)
+    if data["delivery"] is not None:
+        changes["delivery"] = bool(data["delivery"])
+    return SearchQuery.lenient(**{**asdict(query), **changes})
+
+
+class SearchResultsPage:
+    """Avito search listing: lazy, paginated result iteration (no assertions)."""
+
+    def __init__(self, page: Page) -> None:
+        self.page = page
+        self._first_card: Locator = page.locator(SearchResultsLocators.CARD).first
+
+    @timed("results.open")
+    def open(self, query: SearchQuery) -> SearchResultsPage:
+        """Go straight to the filtered listing: one navigation instead of UI filter clicks."""
+        self.page.goto(query.url(), wait_until="domcontentloaded")
+        return self
+
+    def refine(self, **changes: Any) -> SearchResultsPage:
+        """Re-open the current listing with some filters changed, e.g. `refine(price_max=5000)`."""
+        return self.open(self.active_filters().updated(**changes))
+
+    def active_filters(self) -> SearchQuery:
+        """The filters the rendered listing applies (URL + filter controls, one evaluate)."""
+        return filters_from(self.page.evaluate(FILTERS_JS, {"sel": FILTER_SELECTORS}))
+
+    @timed("results.wait")
+    def wait_for_results(self, timeout: float = 15_000) -> SearchResultsPage:
+        """Wait until at least one result card is visible."""
+        self._first_card.wait_for(state="visible", timeout=timeout)
+        return self
+
+    def iter_results(
+        self,
+        limit: Optional[int] = None,
+        batch_size: int = 10,
+        max_pages: Optional[int] = None,
+        scroll_timeout: float = 3_000,
+    ) -> Iterator[ResultCard]:
+        """
+        Yield result cards lazily, `batch_size` per round-trip. Follows the next-page
+        link (or infinite scroll when there is none) only when the consumer keeps
+        iterating past what is already rendered; stops at `limit` cards or `max_pages`.
+        """
+        yielded, offset, pages = 0, 0, 1
+        while limit is None or yielded < limit:
+            want = batch_size if limit is None else min(batch_size, limit - yielded)
+            chunk = self.page.evaluate(
+                CARDS_JS, {"sel": CARD_SELECTORS, "offset": offset, "limit": want}
+            )
+            if chunk["cards"]:
+                for data in chunk["cards"]:
+                    yield result_card_from(data)
+                yielded += len(chunk["cards"])
+                offset += len(chunk["cards"])
+                continue
+            if max_pages is not None and pages >= max_pages:
+                return
+            if chunk["next"]:
+                self.page.goto(chunk["next"], wait_until="domcontentloaded")
+                self.wait_for_results()
+                offset, pages = 0, pages + 1
+            elif not self._scroll_for_more(chunk["total"], scroll_timeout):
+                return
+
+    def _scroll_for_more(self, rendered: int, timeout: float) -> bool:
+        """Scroll to the bottom and wait for more cards (infinite-scroll listings)."""
+        self.page.evaluate(SCROLL_JS)
+        try:
+            self.page.wait_for_function(
+                MORE_CARDS_JS,
+                arg={"sel": SearchResultsLocators.CARD, "rendered": rendered},
+                timeout=timeout,
+            )
+        except PWTimeout:
+            return False
+        return True
@@ -0,0 +1,148 @@
+# plugins/artifacts.py
+# Screenshot + HTML of every open page when a test fails, written off the
+# critical path by utils.artifacts (deduplicated, size-capped).
+from __future__ import annotations
+
+import functools
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import BrowserContext, Page
+
+from utils import artifacts
+
+# Captures referenced by failed tests (controller-side, all workers)
+_CAPTURED: dict[str, list[str]] = {}
+# Set when setup or call failed; read by async fixtures capturing at teardown
+_FAILED_KEY = pytest.StashKey[bool]()
+# Pages a test opened through login_factory, checked by the failure hook
+_PAGES_KEY = pytest.StashKey[list[Page]]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("artifacts", "failure artifacts")
+    group.addoption(
+        "--artifacts",
+        choices=("on-failure", "off"),
+        default=os.getenv("AVITO_ARTIFACTS", "on-failure"),
+        help="Capture open pages when a test fails (AVITO_ARTIFACTS). Default: %(default)s",
+    )
+    group.addoption(
+        "--artifact-dir",
+        type=Path,
+        default=artifacts.ARTIFACT_DIR,
+        help="Content-addressed artifact store. Default: %(default)s",
+    )
+    group.addoption(
+        "--artifact-max-mb",
+        type=float,
+        default=artifacts.MAX_BYTES / 1024 / 1024,
+        help="Evict the oldest artifacts beyond this size. Default: %(default)s",
+    )
+    group.addoption(
+        "--artifact-full-page",
+        action="store_true",
+        help="Full-page screenshots (slower) instead of the viewport.",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("--artifacts") == "off":
+        return
+    writer = artifacts.writer()
+    writer.root = config.getoption("--artifact-dir")
+    writer.max_bytes = int(config.getoption("--artifact-max-mb") * 1024 * 1024)
+
+
+def _open_pages(item: pytest.Item) -> list[Page]:
+    """`page` fixtures, pages of `context` fixtures and pages from login_factory."""
+    funcargs = getattr(item, "funcargs", {})
+    tracked: list[Page] = item.stash.get(_PAGES_KEY, [])
+    found = list(tracked)
+    for value in funcargs.values():
+        if isinstance(value, Page):
+            found.append(value)
+        elif isinstance(value, BrowserContext):
+            found.extend(value.pages)
+    unique = {id(p): p for p in found if not p.is_closed()}
+    return list(unique.values())
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo):
+    outcome = yield
+    report: pytest.TestReport = outcome.get_result()
+    if not report.failed or report.when == "teardown":
+        return
+    item.stash[_FAILED_KEY] = True
+    if item.config.getoption("--artifacts") == "off":
+        return
+    full_page = item.config.getoption("--artifact-full-page")
+    names = []
+    for index, page in enumerate(_open_pages(item)):
+        label = item.nodeid if index == 0 else f"{item.nodeid} [page {index}]"
+        names += artifacts.save_failure(page, label, full_page).names
+    if names:
+        # A fresh list: the report otherwise shares item.user_properties with later phases
+        report.user_properties = [*report.user_properties, ("artifacts", names)]
+        report.sections.append(("artifacts", "\n".join(names)))
+
+
+@pytest.fixture
+def track_page(request: pytest.FixtureRequest):
+    """Factory fixtures call this with each page they hand out: captured on failure."""
+    return functools.partial(_track_page, request.node)
+
+
+def _track_page(item: pytest.Item, page: Page) -> None:
+    item.stash.setdefault(_PAGES_KEY, []).append(page)
+
+
+@pytest.fixture
+def capture_async_pages(request: pytest.FixtureRequest):
+    """
+    Async factory fixtures await this with their pages at teardown, before
+    closing their contexts: the report hook cannot drive async pages itself.
+    """
+    return functools.partial(_save_async_pages, request.node)
+
+
+async def _save_async_pages(item: pytest.Item, pages: list[AsyncPage]) -> None:
+    """Capture `pages` if setup or call of `item` failed."""
+    if not item.stash.get(_FAILED_KEY, False):
+        return
+    if item.config.getoption("--artifacts") == "off":
+        return
+    full_page = item.config.getoption("--artifact-full-page")
+    names = []
+    open_pages = [page for page in pages if not page.is_closed()]
+    for index, page in enumerate(open_pages):
+        label = f"{item.nodeid} [async page {index}]"
+        names += (await artifacts.save_failure_async(page, label, full_page)).names
+    if names:
+        item.user_properties.append(("artifacts", names))
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    props: dict[str, Any] = dict(report.user_properties)
+    if "artifacts" in props:
+        _CAPTURED.setdefault(report.nodeid, []).extend(props["artifacts"])
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    if session.config.getoption("--artifacts") != "off":
+        artifacts.writer().flush()
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    if not _CAPTURED:
+        return
+    root = config.getoption("--artifact-dir")
+    terminalreporter.write_line(
+        f"[artifacts] {len(_CAPTURED)} failed tests captured -> {root}"
+    )
+    for nodeid, names in sorted(_CAPTURED.items()):
+        terminalreporter.write_line(f"[artifacts]   {nodeid}: {', '.join(names)}")
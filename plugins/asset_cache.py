@@ -0,0 +1,94 @@
+# plugins/asset_cache.py
+# --asset-cache (opt-in): serve login_factory contexts' static assets from the shared
+# on-disk store in utils.asset_cache, with hit/miss totals in the run summary.
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from utils import asset_cache
+from utils.asset_cache import AssetCache
+from utils.har import HarSession
+
+_FIELDS = ("hits", "revalidated", "misses", "stored", "bytes_saved")
+# Summed from teardown reports, so on the xdist controller it covers every worker
+_TOTALS = dict.fromkeys(("tests", *_FIELDS), 0)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("asset_cache", "static-asset cache")
+    group.addoption(
+        "--asset-cache",
+        choices=("on", "off"),
+        default=asset_cache.DEFAULT_ASSET_CACHE,
+        help="Opt in to serving cacheable scripts, styles, images and fonts from a "
+        "store shared by all contexts and workers; every request of a cached context "
+        "is routed through Python (AVITO_ASSET_CACHE). Default: %(default)s",
+    )
+    group.addoption(
+        "--asset-cache-dir",
+        type=Path,
+        default=asset_cache.ASSET_CACHE_DIR,
+        help="Content-addressed asset store. Default: %(default)s",
+    )
+    group.addoption(
+        "--asset-cache-max-mb",
+        type=float,
+        default=asset_cache.MAX_BYTES / 1024 / 1024,
+        help="Evict the least recently used assets beyond this size. Default: %(default)s",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    store = asset_cache.shared_store()
+    store.root = config.getoption("--asset-cache-dir")
+    store.max_bytes = int(config.getoption("--asset-cache-max-mb") * 1024 * 1024)
+
+
+@pytest.fixture
+def static_asset_cache(request: pytest.FixtureRequest, har_session: HarSession | None):
+    """
+    AssetCache for this test's contexts, or None when it is off. HAR runs
+    bypass it: recordings need the real traffic, replays never touch the network.
+    """
+    if request.config.getoption("--asset-cache") == "off" or har_session is not None:
+        yield None
+        return
+    cache = AssetCache()
+    yield cache
+    if cache.stats.hits or cache.stats.misses:
+        request.node.user_properties += [
+            (f"asset_cache_{name}", getattr(cache.stats, name)) for name in _FIELDS
+        ]
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    if report.when != "teardown":
+        return
+    props: dict[str, Any] = dict(report.user_properties)
+    if "asset_cache_hits" not in props:
+        return
+    _TOTALS["tests"] += 1
+    for name in _FIELDS:
+        _TOTALS[name] += int(props[f"asset_cache_{name}"])
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    # Workers trim what they wrote since their last eviction (skipped if another is at it)
+    store = asset_cache.shared_store()
+    if store.dirty:
+        store.evict()
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    if not _TOTALS["tests"]:
+        return
+    lookups = _TOTALS["hits"] + _TOTALS["misses"]
+    terminalreporter.write_line(
+        f"[asset-cache] {_TOTALS['hits']} hits ({_TOTALS['revalidated']} revalidated), "
+        f"{_TOTALS['misses']} misses across {_TOTALS['tests']} tests "
+        f"({_TOTALS['hits'] / lookups:.0%} hit rate), "
+        f"{_TOTALS['bytes_saved'] / 1_000_000:.1f} MB not downloaded"
+    )
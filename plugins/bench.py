@@ -0,0 +1,153 @@
+# plugins/bench.py
+# --bench: framework micro-benchmarks (tests/bench), recorded over time and
+# failed when a metric regresses past --bench-threshold.
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+from utils import bench as bench_utils
+
+ROOT = Path(__file__).resolve().parents[1]
+HISTORY = Path(
+    os.getenv("AVITO_BENCH_HISTORY", ROOT / "artifacts" / "bench" / "history.jsonl")
+)
+
+# name -> median ms, merged from teardown reports (all workers)
+_RESULTS: dict[str, float] = {}
+# Metrics that failed their test; recorded, but kept out of later baselines
+_REGRESSED: set[str] = set()
+_HISTORY_KEY = pytest.StashKey[list[dict[str, Any]]]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("bench", "framework micro-benchmarks")
+    group.addoption(
+        "--bench",
+        action="store_true",
+        help="Run tests marked `bench` (skipped otherwise); use with -n 0.",
+    )
+    group.addoption(
+        "--bench-history",
+        type=Path,
+        default=HISTORY,
+        help="JSONL file runs are appended to and compared against. Default: %(default)s",
+    )
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        default=0.25,
+        help="Fail a benchmark that is this much slower than its baseline. Default: %(default)s",
+    )
+    group.addoption(
+        "--bench-window",
+        type=int,
+        default=5,
+        help="Baseline = median of the last N recorded runs. Default: %(default)s",
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    if config.getoption("--bench"):
+        return
+    skip = pytest.mark.skip(reason="benchmark: run with --bench")
+    for item in items:
+        if "bench" in item.keywords:
+            item.add_marker(skip)
+
+
+class Bench:
+    """Measures and records metrics for one test; fails it on a regression."""
+
+    def __init__(self, request: pytest.FixtureRequest) -> None:
+        config = request.config
+        if _HISTORY_KEY not in config.stash:
+            config.stash[_HISTORY_KEY] = bench_utils.load_history(
+                config.getoption("--bench-history")
+            )
+        self._history = config.stash[_HISTORY_KEY]
+        self._threshold = config.getoption("--bench-threshold")
+        self._window = config.getoption("--bench-window")
+        self._node = request.node
+
+    def __call__(
+        self, name: str, fn: Callable[[], Any], rounds: int = 20, warmup: int = 1
+    ) -> bench_utils.BenchResult:
+        result = bench_utils.measure(name, fn, rounds=rounds, warmup=warmup)
+        self.record(name, result.median_ms)
+        return result
+
+    def record(self, name: str, ms: float) -> None:
+        """Record a metric measured by the test itself (e.g. across processes)."""
+        self._node.user_properties.append(("bench", json.dumps({name: ms})))
+        base = bench_utils.baseline(self._history, name, self._window)
+        if bench_utils.regressed(ms, base, self._threshold):
+            self._node.user_properties.append(("bench_regressed", name))
+            pytest.fail(
+                f"{name} regressed: {ms:.2f}ms vs baseline {base:.2f}ms "
+                f"(threshold +{self._threshold:.0%})"
+            )
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest) -> Bench:
+    """`bench(name, fn, rounds=20)` times `fn`; `bench.record(name, ms)` takes a value."""
+    return Bench(request)
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    if report.when != "call":
+        return
+    for name, value in report.user_properties:
+        if name == "bench":
+            _RESULTS.update(json.loads(str(value)))
+        elif name == "bench_regressed":
+            _REGRESSED.add(str(value))
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    config = session.config
+    if hasattr(config, "workerinput") or not _RESULTS:
+        return
+    rounded = {name: round(ms, 3) for name, ms in sorted(_RESULTS.items())}
+    meta: dict[str, Any] = {"git": _git_revision()}
+    if _REGRESSED:
+        meta["regressed"] = sorted(_REGRESSED)
+    bench_utils.append_run(config.getoption("--bench-history"), rounded, **meta)
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    if not _RESULTS:
+        return
+    history = config.stash.get(_HISTORY_KEY, None)
+    if history is None:  # benchmarks ran on xdist workers only
+        history = bench_utils.load_history(config.getoption("--bench-history"))[:-1]
+    window = config.getoption("--bench-window")
+    write = terminalreporter.write_line
+    write(f"[bench] {len(_RESULTS)} metrics -> {config.getoption('--bench-history')}")
+    for name, ms in sorted(_RESULTS.items()):
+        base = bench_utils.baseline(history, name, window)
+        delta = f"{(ms / base - 1):+.0%} vs {base:.3f}ms" if base else "no baseline"
+        flag = "  REGRESSED" if name in _REGRESSED else ""
+        write(f"[bench]   {name:<40} {ms:10.3f}ms  {delta}{flag}")
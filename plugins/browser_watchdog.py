@@ -0,0 +1,92 @@
+# plugins/browser_watchdog.py
+# Between tests: close leaked pages, sample the worker's browser memory and
+# recycle the `browser` once RSS or contexts served cross a threshold.
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from utils.browser_server import BrowserProxy
+from utils.browser_watchdog import MAX_CONTEXTS, MAX_RSS_MB, BrowserWatchdog
+
+# The worker's `browser` fixture handle, set by plugins/shared_browser.py
+PROXY_KEY = pytest.StashKey[BrowserProxy]()
+_WATCHDOG_KEY = pytest.StashKey[BrowserWatchdog]()
+# worker id -> BrowserWatchdog.report() (controller-side, all workers)
+_MEMORY: dict[str, dict[str, Any]] = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("browser-watchdog", "per-worker browser recycling")
+    group.addoption(
+        "--browser-max-rss-mb",
+        type=float,
+        default=MAX_RSS_MB,
+        help="Recycle a worker's browser between tests once its processes use more "
+        "RSS than this (AVITO_BROWSER_MAX_RSS_MB; 0 = never). Default: %(default)s",
+    )
+    group.addoption(
+        "--browser-max-contexts",
+        type=int,
+        default=MAX_CONTEXTS,
+        help="Recycle a worker's browser after it created this many contexts "
+        "(AVITO_BROWSER_MAX_CONTEXTS; 0 = never). Default: %(default)s",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.stash[_WATCHDOG_KEY] = BrowserWatchdog(
+        config.getoption("--browser-max-rss-mb"),
+        config.getoption("--browser-max-contexts"),
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item: pytest.Item, nextitem: pytest.Item | None):
+    yield
+    # After the test's fixtures are gone; the last test's teardown closes the browser
+    proxy = item.config.stash.get(PROXY_KEY, None)
+    if (
+        proxy is None
+        or nextitem is None
+        or "browser" not in getattr(item, "fixturenames", ())
+    ):
+        return
+    watchdog = item.config.stash[_WATCHDOG_KEY]
+    leaked = watchdog.leaked_pages
+    reason = watchdog.check(proxy)
+    if watchdog.leaked_pages > leaked:
+        item.user_properties.append(("leaked_pages", watchdog.leaked_pages - leaked))
+    if reason is not None:
+        item.user_properties.append(("browser_recycled", reason))
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    config = session.config
+    proxy = config.stash.get(PROXY_KEY, None)
+    if proxy is None:
+        return
+    report = config.stash[_WATCHDOG_KEY].report(proxy)
+    workeroutput = getattr(config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["browser_memory"] = report
+    else:
+        _MEMORY["main"] = report
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    report = getattr(node, "workeroutput", {}).get("browser_memory")
+    if report:
+        _MEMORY[node.workerinput["workerid"]] = report
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    for worker, r in sorted(_MEMORY.items()):
+        terminalreporter.write_line(
+            f"[browser-memory] {worker}: peak {r['peak_mb']:.0f} MB "
+            f"(renderers {r['renderer_peak_mb']:.0f} MB in {r['renderers']}), "
+            f"{r['contexts']} contexts, {r['recycles']} recycle(s), "
+            f"{r['leaked_pages']} leaked page(s) closed"
+        )
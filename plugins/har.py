@@ -0,0 +1,81 @@
+# plugins/har.py
+# HAR record/replay for the whole suite: --har-record captures each test's traffic,
+# --har-replay serves it back through context routing with no network access.
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from utils.har import HarSession
+
+ROOT = Path(__file__).resolve().parents[1]
+HAR_DIR = Path(os.getenv("AVITO_HAR_DIR", ROOT / "artifacts" / "har"))
+
+# test nodeid -> URLs that had no recorded response (controller-side, all workers)
+_UNMATCHED: dict[str, list[str]] = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("har", "HAR record/replay")
+    group.addoption(
+        "--har-record",
+        action="store_true",
+        help="Record each test's traffic into per-test HAR archives.",
+    )
+    group.addoption(
+        "--har-replay",
+        action="store_true",
+        help="Serve traffic from recorded HAR archives; no network access.",
+    )
+    group.addoption(
+        "--har-dir",
+        default=str(HAR_DIR),
+        help="Directory holding the HAR archives. Default: %(default)s",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("--har-record") and config.getoption("--har-replay"):
+        raise pytest.UsageError("--har-record and --har-replay are mutually exclusive")
+
+
+@pytest.fixture
+def har_session(request: pytest.FixtureRequest):
+    """HarSession for this test, or None when neither HAR mode is enabled."""
+    config = request.config
+    if config.getoption("--har-record"):
+        mode = "record"
+    elif config.getoption("--har-replay"):
+        mode = "replay"
+    else:
+        yield None
+        return
+    session = HarSession(mode, Path(config.getoption("--har-dir")), request.node.nodeid)
+    yield session
+    if session.unmatched:
+        request.node.user_properties.append(("har_unmatched", session.unmatched))
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    if report.when != "teardown":
+        return
+    props: dict[str, Any] = dict(report.user_properties)
+    if "har_unmatched" in props:
+        _UNMATCHED[report.nodeid] = list(props["har_unmatched"])
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    if not _UNMATCHED:
+        return
+    total = sum(len(urls) for urls in _UNMATCHED.values())
+    terminalreporter.section("HAR replay: unmatched requests")
+    terminalreporter.write_line(f"{total} requests had no recorded response:")
+    for nodeid, urls in sorted(_UNMATCHED.items()):
+        terminalreporter.write_line(f"  {nodeid} ({len(urls)})")
+        for url in urls[:5]:
+            terminalreporter.write_line(f"    {url}")
+        if len(urls) > 5:
+            terminalreporter.write_line(f"    ... and {len(urls) - 5} more")
@@ -0,0 +1,100 @@
+# plugins/perf.py
+# --perf: per-test POM step / fixture / navigation timings, one report per run.
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from statistics import median
+from typing import Any
+
+import pytest
+
+from utils import perf
+
+ROOT = Path(__file__).resolve().parents[1]
+PERF_DIR = Path(os.getenv("AVITO_PERF_DIR", ROOT / "artifacts" / "perf"))
+
+# Merged from teardown reports, so on the xdist controller it covers every worker
+_ROWS: list[dict[str, Any]] = []
+_RESULT: dict[str, Any] = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("perf", "navigation / step timing report")
+    group.addoption(
+        "--perf",
+        action="store_true",
+        default=os.getenv("AVITO_PERF", "0") == "1",
+        help="Record POM step, fixture and navigation timings (AVITO_PERF=1).",
+    )
+    group.addoption(
+        "--perf-dir",
+        type=Path,
+        default=PERF_DIR,
+        help="Where perf-report.json/.csv are written. Default: %(default)s",
+    )
+    group.addoption(
+        "--perf-budgets",
+        type=Path,
+        default=os.getenv("AVITO_PERF_BUDGETS"),
+        help='JSON of ms budgets, e.g. {"home.navigate": 4000, "home.navigate:lcp": 2500}.',
+    )
+    group.addoption(
+        "--perf-strict",
+        action="store_true",
+        help="Fail the run if any budget is exceeded (default: only report).",
+    )
+
+
+@pytest.fixture(autouse=True)
+def perf_recorder(request: pytest.FixtureRequest):
+    """Active PerfRecorder for this test (None unless --perf)."""
+    if not request.config.getoption("--perf"):
+        yield None
+        return
+    recorder = perf.PerfRecorder(request.node.nodeid)
+    perf.activate(recorder)
+    yield recorder
+    perf.activate(None)
+    request.node.user_properties.append(("perf_rows", json.dumps(recorder.rows)))
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    if report.when != "teardown":
+        return
+    for name, value in report.user_properties:
+        if name == "perf_rows":
+            _ROWS.extend(json.loads(str(value)))
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    config = session.config
+    if hasattr(config, "workerinput") or not config.getoption("--perf"):
+        return
+    budgets_file = config.getoption("--perf-budgets")
+    budgets = perf.load_budgets(budgets_file) if budgets_file else {}
+    _RESULT["breaches"] = perf.check_budgets(_ROWS, budgets)
+    _RESULT["paths"] = perf.write_report(_ROWS, config.getoption("--perf-dir"))
+    if _RESULT["breaches"] and config.getoption("--perf-strict"):
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    if "paths" not in _RESULT:
+        return
+    write = terminalreporter.write_line
+    by_name: dict[tuple[str, str], list[float]] = {}
+    for row in _ROWS:
+        value = row["lcp"] if row["kind"] == "navigation" else row["ms"]
+        if value is not None:
+            by_name.setdefault((row["kind"], row["name"]), []).append(value)
+    write(f"[perf] {len(_ROWS)} timings -> {', '.join(map(str, _RESULT['paths']))}")
+    for (kind, name), values in sorted(by_name.items()):
+        label = f"{name} (lcp)" if kind == "navigation" else name
+        write(
+            f"[perf]   {kind:<10} {label:<32} n={len(values):<3} "
+            f"p50={median(values):.0f}ms max={max(values):.0f}ms"
+        )
+    for breach in _RESULT["breaches"]:
+        write(f"[perf] over budget: {breach}")
@@ -0,0 +1,71 @@
+# plugins/resource_blocking.py
+# Pytest wiring for utils.resource_policy: CLI option, per-test marker and run summary.
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from utils.resource_policy import DEFAULT_POLICY, POLICIES, ResourceBlocker
+
+# Aggregated from teardown reports, so on the xdist controller it covers every worker
+_TOTALS = {"tests": 0, "blocked": 0, "est_saved_bytes": 0}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--resource-policy",
+        choices=POLICIES,
+        default=DEFAULT_POLICY,
+        help="Resource-blocking policy for login_factory contexts "
+        "(overridden per test by @pytest.mark.resources). Default: %(default)s",
+    )
+
+
+def marker_policy(marker: pytest.Mark) -> str:
+    """The policy named by `@pytest.mark.resources("...")`."""
+    if len(marker.args) != 1 or marker.args[0] not in POLICIES:
+        raise pytest.UsageError(
+            f"@pytest.mark.resources takes one policy name ({', '.join(POLICIES)}), "
+            f"got {marker.args!r}"
+        )
+    return marker.args[0]
+
+
+@pytest.fixture
+def resource_policy(request: pytest.FixtureRequest):
+    """ResourceBlocker for this test: the `resources` marker wins over --resource-policy."""
+    marker = request.node.get_closest_marker("resources")
+    name = (
+        marker_policy(marker)
+        if marker
+        else request.config.getoption("--resource-policy")
+    )
+    blocker = ResourceBlocker(name)
+    yield blocker
+    if blocker.policy != "full":
+        request.node.user_properties += [
+            ("resource_policy", blocker.policy),
+            ("blocked_requests", blocker.stats.blocked),
+            ("est_saved_bytes", blocker.stats.est_saved_bytes),
+        ]
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    if report.when != "teardown":
+        return
+    props: dict[str, Any] = dict(report.user_properties)
+    if "blocked_requests" not in props:
+        return
+    _TOTALS["tests"] += 1
+    _TOTALS["blocked"] += int(props["blocked_requests"])
+    _TOTALS["est_saved_bytes"] += int(props["est_saved_bytes"])
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    if not _TOTALS["tests"]:
+        return
+    terminalreporter.write_line(
+        f"[resources] {_TOTALS['blocked']} requests blocked across {_TOTALS['tests']} tests, "
+        f"~{_TOTALS['est_saved_bytes'] / 1_000_000:.1f} MB saved (estimated)"
+    )
@@ -0,0 +1,166 @@
+# plugins/scheduling.py
+# --profile-affinity: an xdist scheduler that keeps each profile's tests on the
+# same workers and starts the longest ones first, using recorded durations.
+from __future__ import annotations
+
+import os
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+import pytest
+from xdist.scheduler import LoadScheduling  # type: ignore[import-untyped]
+
+from utils import scheduling
+
+ROOT = Path(__file__).resolve().parents[1]
+DURATIONS = Path(
+    os.getenv("AVITO_DURATIONS_FILE", ROOT / "artifacts" / "durations.json")
+)
+# Tests handed to a worker ahead of time; the rest stay stealable by idle workers
+PREFETCH = 2
+
+# nodeid -> seconds (setup + call + teardown), merged on the controller
+_MEASURED: dict[str, float] = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("scheduling", "profile-affinity scheduling")
+    group.addoption(
+        "--profile-affinity",
+        action="store_true",
+        default=os.getenv("AVITO_PROFILE_AFFINITY", "0") == "1",
+        help="With -n: group tests by login profile per worker, longest first "
+        "(AVITO_PROFILE_AFFINITY=1).",
+    )
+    group.addoption(
+        "--durations-file",
+        type=Path,
+        default=DURATIONS,
+        help="Per-test durations from earlier runs, updated after each "
+        "--profile-affinity run. Default: %(default)s",
+    )
+
+
+class ProfileAffinityScheduling(LoadScheduling):
+    """
+    LoadScheduling with a precomputed plan (utils.scheduling.plan): every
+    worker drains its own queue a few tests at a time, and a worker that
+    runs dry steals the tail (shortest tests) of the busiest queue.
+    """
+
+    collection: list[str] | None
+
+    def __init__(self, config: pytest.Config, log: Any = None) -> None:
+        super().__init__(config, log)
+        self.node2queue: dict[Any, deque[int]] = {}
+        self.durations: list[float] = []
+
+    def add_node(self, node: Any) -> None:
+        super().add_node(node)
+        self.node2queue[node] = deque()
+
+    def schedule(self) -> None:
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+        nodeids: list[str] = next(iter(self.node2collection.values()))
+        self.collection = nodeids
+        profiles = scheduling.discover_profiles(nodeids, self.config.rootpath)
+        history = scheduling.load_durations(self.config.getoption("--durations-file"))
+        self.durations = scheduling.estimate_durations(nodeids, history)
+        queues = scheduling.plan(
+            self.durations, [profiles[n] for n in nodeids], len(self.nodes)
+        )
+        for node, queue in zip(self.nodes, queues):
+            self.node2queue[node] = deque(queue)
+        self._sync_pending()
+        for node in self.nodes:
+            self.check_schedule(node)
+
+    def check_schedule(self, node: Any, duration: float = 0) -> None:
+        if node.shutting_down:
+            return
+        queue = self.node2queue[node]
+        if not queue:
+            self._steal_into(queue)
+        if not queue:
+            # Nothing left worth taking: let the worker finish what it holds
+            node.shutdown()
+            return
+        wanted = PREFETCH - len(self.node2pending[node])
+        batch = [queue.popleft() for _ in range(min(wanted, len(queue)))]
+        if batch:
+            self.node2pending[node].extend(batch)
+            node.send_runtest_some(batch)
+            self._sync_pending()
+
+    def mark_test_pending(self, item: str) -> None:
+        assert self.collection is not None
+        self._lightest_queue().appendleft(self.collection.index(item))
+        self._sync_pending()
+        for node in self.nodes:
+            self.check_schedule(node)
+
+    def remove_node(self, node: Any) -> str | None:
+        pending = self.node2pending.pop(node)
+        leftover = [*pending[1:], *self.node2queue.pop(node)]
+        crashitem = None
+        if pending:
+            assert self.collection is not None
+            crashitem = self.collection[pending[0]]
+        if leftover and self.node2queue:
+            self._lightest_queue().extend(leftover)
+        self._sync_pending()
+        for other in self.nodes:
+            self.check_schedule(other)
+        return crashitem
+
+    # -------- internals --------
+    def _work(self, queue: deque[int]) -> float:
+        return sum(self.durations[i] for i in queue)
+
+    def _lightest_queue(self) -> deque[int]:
+        live = [q for n, q in self.node2queue.items() if not n.shutting_down]
+        return min(live or self.node2queue.values(), key=self._work)
+
+    def _steal_into(self, queue: deque[int]) -> None:
+        """Move up to half the work of the busiest queue, from its tail, into `queue`."""
+        victim = max(self.node2queue.values(), key=self._work)
+        share = self._work(victim) / 2
+        stolen: list[int] = []
+        taken = 0.0
+        while len(victim) > 1 and (
+            not stolen or taken + self.durations[victim[-1]] <= share
+        ):
+            stolen.append(victim.pop())
+            taken += self.durations[stolen[-1]]
+        queue.extend(reversed(stolen))
+
+    def _sync_pending(self) -> None:
+        # LoadScheduling's bookkeeping (tests_finished / has_pending) reads .pending
+        self.pending = [i for queue in self.node2queue.values() for i in queue]
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config: pytest.Config, log: Any):
+    if config.getoption("--profile-affinity"):
+        return ProfileAffinityScheduling(config, log)
+    return None
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    _MEASURED[report.nodeid] = _MEASURED.get(report.nodeid, 0.0) + report.duration
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    config = session.config
+    if hasattr(config, "workerinput") or not config.getoption("--profile-affinity"):
+        return
+    if _MEASURED:
+        scheduling.update_durations(config.getoption("--durations-file"), _MEASURED)
@@ -0,0 +1,135 @@
+# plugins/shared_browser.py
+# --shared-browser N: the xdist controller launches N browser servers and every
+# worker connects to one of them instead of launching its own browser.
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, cast
+
+import pytest
+from playwright.sync_api import Browser, BrowserType
+
+from plugins.browser_watchdog import PROXY_KEY
+from utils.browser_server import (
+    ENDPOINTS_ENV,
+    BrowserFarm,
+    BrowserProxy,
+    LaunchedBrowser,
+    SharedBrowser,
+    launch_options_for_server,
+)
+
+_FARM_KEY = pytest.StashKey[BrowserFarm]()
+# (mode, seconds) per worker: "launch" = own browser, "connect" = shared server
+_STARTUP: list[tuple[str, float]] = []
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("shared-browser", "browser servers shared by xdist workers")
+    group.addoption(
+        "--shared-browser",
+        type=int,
+        default=int(os.getenv("AVITO_SHARED_BROWSERS", "0")),
+        metavar="N",
+        help="Launch N browser servers once and connect all workers to them "
+        "(0 = every worker launches its own browser). Default: %(default)s",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    count = config.getoption("--shared-browser")
+    if hasattr(config, "workerinput") or count <= 0:
+        return
+    names = config.getoption("--browser") or ["chromium"]
+    if len(names) > 1:
+        raise pytest.UsageError("--shared-browser supports a single --browser")
+    launch_args = {
+        "headless": not config.getoption("--headed"),
+        "channel": config.getoption("--browser-channel"),
+        "slow_mo": config.getoption("--slowmo") or None,
+    }
+    endpoints_file = Path(tempfile.mkdtemp(prefix="avito-browsers-")) / "endpoints.json"
+    farm = BrowserFarm(
+        count, names[0], launch_options_for_server(launch_args), endpoints_file
+    )
+    try:
+        farm.start()
+    except RuntimeError as e:
+        raise pytest.UsageError(f"--shared-browser: {e}") from e
+    config.stash[_FARM_KEY] = farm
+    os.environ[ENDPOINTS_ENV] = str(endpoints_file)
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    farm = config.stash.get(_FARM_KEY, None)
+    if farm is not None:
+        farm.stop()
+        os.environ.pop(ENDPOINTS_ENV, None)
+
+
+@pytest.fixture(scope="session")
+def browser(
+    launch_browser: Callable[[], Browser],
+    browser_type: BrowserType,
+    pytestconfig: pytest.Config,
+):
+    """
+    Overrides pytest-playwright's `browser`: connects to a shared server when
+    the controller published one, otherwise launches as usual. Either way the
+    startup time is reported in the run summary, and the handle can be
+    recycled between tests (see plugins/browser_watchdog.py).
+    """
+    endpoints = os.getenv(ENDPOINTS_ENV)
+    started = time.perf_counter()
+    proxy: BrowserProxy
+    if not endpoints:
+        proxy = LaunchedBrowser(launch_browser)
+        mode = "launch"
+    else:
+        worker = os.getenv("PYTEST_XDIST_WORKER", "gw0")
+        proxy = SharedBrowser(browser_type, Path(endpoints), slot=int(worker[2:] or 0))
+        mode = "connect"
+    proxy.browser  # launch/connect now, so the first test doesn't pay for it
+    _record(pytestconfig, mode, time.perf_counter() - started)
+    pytestconfig.stash[PROXY_KEY] = proxy
+    # Delegates every Browser attribute; reopens after a recycle or server relaunch
+    yield cast(Browser, proxy)
+    proxy.close()
+
+
+def _record(config: pytest.Config, mode: str, seconds: float) -> None:
+    workeroutput = getattr(config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["browser_startup"] = (mode, seconds)
+    else:
+        _STARTUP.append((mode, seconds))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    startup = getattr(node, "workeroutput", {}).get("browser_startup")
+    if startup:
+        _STARTUP.append(tuple(startup))
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    if not _STARTUP:
+        return
+    total = sum(seconds for _, seconds in _STARTUP)
+    workers = len(_STARTUP)
+    farm = config.stash.get(_FARM_KEY, None)
+    if farm is None:
+        terminalreporter.write_line(
+            f"[browser] {workers} worker(s) launched their own browser: "
+            f"{total / workers:.2f}s avg, {total:.2f}s total"
+        )
+        return
+    launched = sum(s.launch_seconds for s in farm.servers)
+    terminalreporter.write_line(
+        f"[browser] {len(farm.servers)} shared server(s) up in {farm.startup_seconds:.2f}s "
+        f"({launched:.2f}s of launches, {farm.relaunches} relaunch(es)); "
+        f"{workers} worker(s) connected in {total / workers:.2f}s avg, {total:.2f}s total"
+    )
@@ -0,0 +1,119 @@
+# plugins/standin.py
+# Session-scoped local Avito stand-in: --standin (or AVITO_STANDIN=1) points
+# AVITO_BASE_URL and AVITO_AUTH_DIR at it for the whole run; without it, only
+# tests that request `standin_env` do, and only for their own duration.
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from utils.standin_server import ROUTES, AvitoStandIn, StandInConfig
+
+USERS_JSON = Path(__file__).resolve().parents[1] / "test_data" / "test_users.json"
+# Profiles seeded with a logged-in state on top of the ones in test_users.json
+DEFAULT_PROFILES = ("profile1", "buyer", "seller")
+
+
+def _route_map(raw: str, scale: float = 1.0) -> dict[str, float]:
+    """Parse 'search=200,item=50' into {'search': 0.2, 'item': 0.05} (scale=1/1000)."""
+    result: dict[str, float] = {}
+    for part in filter(None, (p.strip() for p in raw.split(","))):
+        route, _, value = part.partition("=")
+        if route not in ROUTES:
+            raise pytest.UsageError(
+                f"Unknown stand-in route '{route}'. Choose from: {', '.join(ROUTES)}"
+            )
+        result[route] = float(value) * scale
+    return result
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("standin", "local Avito stand-in server")
+    group.addoption(
+        "--standin",
+        action="store_true",
+        default=os.getenv("AVITO_STANDIN", "0") == "1",
+        help="Run against a local Avito stand-in instead of avito.ru.",
+    )
+    group.addoption(
+        "--standin-results",
+        type=int,
+        default=20,
+        help="Number of results per search page. Default: %(default)s",
+    )
+    group.addoption(
+        "--standin-latency",
+        default="",
+        help="Per-route latency in ms, e.g. 'search=300,item=100'.",
+    )
+    group.addoption(
+        "--standin-failure-rate",
+        default="",
+        help="Per-route failure rate (0..1) answered with 503, e.g. 'item=0.1'.",
+    )
+
+
+def _profiles() -> set[str]:
+    profiles = set(DEFAULT_PROFILES)
+    if USERS_JSON.exists():
+        profiles |= set(json.loads(USERS_JSON.read_text(encoding="utf-8")))
+    return profiles
+
+
+@pytest.fixture(scope="session")
+def avito_standin(pytestconfig: pytest.Config):
+    """
+    Start the stand-in on a random port (one per xdist worker). The environment
+    is left alone: use `standin_env` (or --standin) for code that reads
+    AVITO_BASE_URL / AVITO_AUTH_DIR.
+    """
+    config = StandInConfig(
+        result_count=pytestconfig.getoption("--standin-results"),
+        latency=_route_map(pytestconfig.getoption("--standin-latency"), 1 / 1000),
+        failure_rate=_route_map(pytestconfig.getoption("--standin-failure-rate")),
+    )
+    standin = AvitoStandIn(config).start()
+    try:
+        yield standin
+    finally:
+        standin.stop()
+
+
+@pytest.fixture(scope="session")
+def standin_auth_dir(
+    avito_standin: AvitoStandIn, tmp_path_factory: pytest.TempPathFactory
+) -> Path:
+    """An auth dir with a stand-in logged-in state for every known profile."""
+    auth_dir = tmp_path_factory.mktemp("standin-auth")
+    for profile in _profiles():
+        (auth_dir / f"{profile}.json").write_text(
+            json.dumps(avito_standin.storage_state(profile)), encoding="utf-8"
+        )
+    return auth_dir
+
+
+def _point_at(request: pytest.FixtureRequest, mp: pytest.MonkeyPatch) -> AvitoStandIn:
+    standin: AvitoStandIn = request.getfixturevalue("avito_standin")
+    mp.setenv("AVITO_BASE_URL", standin.base_url)
+    mp.setenv("AVITO_AUTH_DIR", str(request.getfixturevalue("standin_auth_dir")))
+    return standin
+
+
+@pytest.fixture
+def standin_env(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch):
+    """`avito_standin`, with AVITO_BASE_URL / AVITO_AUTH_DIR pointing at it for this test."""
+    return _point_at(request, monkeypatch)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _standin_when_enabled(request: pytest.FixtureRequest):
+    """With --standin, point the whole session at `avito_standin`; restored afterwards."""
+    if not request.config.getoption("--standin"):
+        yield
+        return
+    with pytest.MonkeyPatch.context() as mp:
+        _point_at(request, mp)
+        yield
@@ -0,0 +1,97 @@
+# plugins/tracing.py
+# --trace-policy: per-test Playwright traces for login_factory contexts, kept by
+# policy (pytest-playwright's own --tracing only covers its `context` fixture).
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from utils.tracing import DEFAULT_TRACING, MODES, TRACE_DIR, TracePolicy, TraceSession
+
+_SESSION_KEY = pytest.StashKey[TraceSession]()
+# Traces kept, merged from teardown reports (all workers)
+_SAVED: dict[str, list[str]] = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("tracing", "Playwright tracing")
+    group.addoption(
+        "--trace-policy",
+        default=DEFAULT_TRACING,
+        help=f"Tracing policy for login_factory contexts: {' | '.join(MODES)} "
+        "(AVITO_TRACING; @pytest.mark.tracing overrides per test). Default: %(default)s",
+    )
+    group.addoption(
+        "--trace-dir",
+        type=Path,
+        default=TRACE_DIR,
+        help="Where kept traces are written. Default: %(default)s",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    try:
+        TracePolicy(config.getoption("--trace-policy"))
+    except ValueError as e:
+        raise pytest.UsageError(str(e)) from None
+
+
+def marker_policy(marker: pytest.Mark) -> TracePolicy:
+    """The policy named by `@pytest.mark.tracing("...")`."""
+    if len(marker.args) != 1 or not isinstance(marker.args[0], str):
+        raise pytest.UsageError(
+            f"@pytest.mark.tracing takes one policy ({', '.join(MODES)}), "
+            f"got {marker.args!r}"
+        )
+    try:
+        return TracePolicy(marker.args[0])
+    except ValueError as e:
+        raise pytest.UsageError(f"@pytest.mark.tracing: {e}") from None
+
+
+@pytest.fixture
+def trace_session(request: pytest.FixtureRequest):
+    """TraceSession for this test; login_factory attaches every context it hands out."""
+    marker = request.node.get_closest_marker("tracing")
+    policy = (
+        marker_policy(marker)
+        if marker
+        else TracePolicy(request.config.getoption("--trace-policy"))
+    )
+    session = TraceSession(
+        policy, request.node.nodeid, request.config.getoption("--trace-dir")
+    )
+    request.node.stash[_SESSION_KEY] = session
+    yield session
+    saved = session.finish()
+    if saved:
+        request.node.user_properties.append(("traces", [str(p) for p in saved]))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo):
+    outcome = yield
+    report: pytest.TestReport = outcome.get_result()
+    session = item.stash.get(_SESSION_KEY, None)
+    if session is not None and report.failed and report.when != "teardown":
+        session.failed = True
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    if report.when != "teardown":
+        return
+    props: dict[str, Any] = dict(report.user_properties)
+    if "traces" in props:
+        _SAVED[report.nodeid] = list(props["traces"])
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    if not _SAVED:
+        return
+    total = sum(len(paths) for paths in _SAVED.values())
+    terminalreporter.write_line(f"[tracing] kept {total} traces:")
+    for nodeid, paths in sorted(_SAVED.items()):
+        for path in paths:
+            terminalreporter.write_line(f"[tracing]   {nodeid}: {path}")
@@ -0,0 +1,77 @@
+# tests/bench/test_bench_context.py
+# Cost of what login_factory does before a test gets its page.
+import json
+import os
+import time
+
+import pytest
+
+from utils.auth_cache import clear_validation
+
+pytestmark = pytest.mark.bench
+
+
+def _state(base: dict, cookies: int, origins: int) -> dict:
+    """`base` (a stand-in session) padded with filler cookies and localStorage."""
+    domain = base["cookies"][0]["domain"]
+    return {
+        "cookies": base["cookies"]
+        + [
+            {
+                "name": f"c{i}",
+                "value": "x" * 64,
+                "domain": domain,
+                "path": "/",
+                "expires": -1,
+                "httpOnly": False,
+                "secure": False,
+                "sameSite": "Lax",
+            }
+            for i in range(cookies)
+        ],
+        "origins": [
+            {
+                "origin": f"http://{domain}:{9000 + o}",
+                "localStorage": [
+                    {"name": f"k{i}", "value": "v" * 256} for i in range(50)
+                ],
+            }
+            for o in range(origins)
+        ],
+    }
+
+
+@pytest.mark.parametrize("cookies, origins", [(0, 0), (50, 1), (500, 5)])
+def test_new_context_by_state_size(bench, browser, avito_standin, cookies, origins):
+    state = _state(avito_standin.storage_state("bench"), cookies, origins)
+
+    bench(
+        f"context.new.cookies{cookies}.origins{origins}",
+        lambda: browser.new_context(storage_state=state).close(),
+        rounds=10,
+    )
+
+
+def test_validate_state_once_cold_and_warm(
+    bench, state_validator, standin_env, tmp_path
+):
+    state_file = tmp_path / "bench.json"
+    state_file.write_text(json.dumps(standin_env.storage_state("bench")), "utf-8")
+    old = time.time() - 3600  # past AVITO_AUTH_FRESH_WINDOW: force the probe
+    os.utime(state_file, (old, old))
+
+    def _cold():
+        clear_validation(state_file)
+        state_validator("bench", state_file, forget=True)
+
+    bench("validate.cold_probe", _cold, rounds=5)
+    bench(
+        "validate.warm_record",
+        lambda: state_validator("bench", state_file, forget=True),
+        rounds=50,
+    )
+    bench(
+        "validate.warm_memory",
+        lambda: state_validator("bench", state_file),
+        rounds=200,
+    )
@@ -0,0 +1,21 @@
+# tests/bench/test_bench_locks.py
+# FileLock contention on one state file, as N xdist workers validating at once.
+from concurrent.futures import ProcessPoolExecutor
+from statistics import median
+
+import pytest
+
+from utils.bench import contend_lock
+
+pytestmark = pytest.mark.bench
+
+
+@pytest.mark.parametrize("workers", [1, 4, 8])
+def test_filelock_contention(bench, tmp_path, workers):
+    lock_path = str(tmp_path / "profile1.json.lock")
+    with ProcessPoolExecutor(workers) as pool:
+        per_acquire = list(
+            pool.map(contend_lock, [lock_path] * workers, [1000] * workers)
+        )
+
+    bench.record(f"filelock.acquire.workers{workers}", median(per_acquire))
@@ -0,0 +1,30 @@
+# tests/bench/test_bench_pages.py
+# POM construction and extraction round-trips against the local stand-in.
+import pytest
+
+from pages.ad_detail_page import AdDetailPage
+from pages.home_page import HomePage
+from pages.search_results_page import SearchResultsPage
+
+pytestmark = pytest.mark.bench
+
+
+def test_pom_construction(bench, page):
+    bench("pom.construct.home", lambda: HomePage(page), rounds=500)
+    bench("pom.construct.ad_detail", lambda: AdDetailPage(page), rounds=500)
+    bench("pom.construct.search_results", lambda: SearchResultsPage(page), rounds=500)
+
+
+def test_extraction_round_trips(bench, page, avito_standin):
+    page.goto(f"{avito_standin.base_url}/moskva/telefony/item_1000001")
+    ad = AdDetailPage(page)
+    bench("extract.ad_detail", lambda: ad.extract(timeout=5_000), rounds=50)
+
+    page.goto(f"{avito_standin.base_url}/all?q=iphone")
+    home = HomePage(page)
+    bench("extract.home_titles", lambda: home.get_visible_ad_titles(10), rounds=50)
+    bench(
+        "extract.results_first_page",
+        lambda: list(SearchResultsPage(page).iter_results(limit=20, max_pages=1)),
+        rounds=20,
+    )
@@ -0,0 +1,40 @@
+# tests/bench/test_bench_upload.py
+# Multi-photo upload on the stand-in form: in-memory payloads vs files on disk.
+import pytest
+
+from pages.post_ad_page import PostAdPage
+from utils.image_factory import ImageFactory
+
+pytestmark = pytest.mark.bench
+
+
+@pytest.fixture
+def post_ad_page(browser, standin_env):
+    context = browser.new_context(storage_state=standin_env.storage_state("bench"))
+    page = context.new_page()
+    yield PostAdPage(page).navigate()
+    context.close()
+
+
+@pytest.mark.parametrize("count", [1, 5, 10])
+def test_upload_from_memory_and_from_disk(bench, post_ad_page, tmp_path, count):
+    factory = ImageFactory(tmp_path / "cache")
+    payloads = factory.payloads(count)
+
+    bench(
+        f"upload.memory.photos{count}",
+        lambda: post_ad_page.upload_photos(payloads),
+        rounds=10,
+    )
+
+    paths = []
+    for payload in payloads:
+        path = tmp_path / payload["name"]
+        path.write_bytes(payload["buffer"])
+        paths.append(path)
+
+    bench(
+        f"upload.disk.photos{count}",
+        lambda: post_ad_page.upload_photos(paths),
+        rounds=10,
+    )
@@ -1,6 +1,10 @@
 # tests/smoke/test_ad_detail_page.py
+import pytest
+
+from pages.aio.home_page import HomePage as AsyncHomePage
 from pages.home_page import HomePage
 from pages.ad_detail_page import AdDetailPage
+from utils.ad_crawler import crawl_ads
 
 
 def test_can_view_ad_detail(login_factory):
@@ -20,12 +24,31 @@ def test_can_view_ad_detail(login_factory):
     new_page = popup_info.value
     new_page.wait_for_load_state("domcontentloaded")
 
-    # Use the new page for ad detail
-    ad_detail = AdDetailPage(new_page)
-    ad_detail.wait_for_loaded()
+    # Use the new page for ad detail: wait + read every field in one in-page poll
+    ad = AdDetailPage(new_page).extract(timeout=15_000)
+
+    assert len(ad.title) > 0, "Ad title should not be empty"
+    assert len(ad.price_raw) > 0, "Ad price should not be empty"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_first_results_open_concurrently(async_login_factory):
+    """
+    Smoke test: the first results open directly (no popup) in a bounded page pool,
+    so validating a result list takes about as long as the slowest ad.
+    """
+    page = await async_login_factory("profile1")
+    home = AsyncHomePage(page)
+    await home.navigate()
+    await home.search("iphone")
+    await home.wait_for_results()
 
-    title = ad_detail.get_title()
-    price = ad_detail.get_price()
+    hrefs = [
+        card.href async for card in home.results().iter_results(limit=4) if card.href
+    ]
+    report = await crawl_ads(page.context, hrefs, concurrency=4)
 
-    assert len(title) > 0, "Ad title should not be empty"
-    assert len(price) > 0, "Ad price should not be empty"
+    assert report.ads, f"No ad could be extracted: {report.failures}"
+    for ad in report.ads:
+        assert len(ad.title) > 0, f"Ad title should not be empty: {ad.url}"
+        assert len(ad.price_raw) > 0, f"Ad price should not be empty: {ad.url}"
@@ -0,0 +1,28 @@
+# tests/smoke/test_async_search.py
+import asyncio
+
+import pytest
+
+from pages.aio.home_page import HomePage
+
+QUERIES = ["iphone", "велосипед", "диван", "ноутбук"]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_search_fans_out_across_queries(async_login_factory):
+    """
+    Smoke test: one worker drives several searches concurrently on one event loop.
+    Uses cached session state — no login-page interaction.
+    """
+
+    async def _search(query: str) -> list[str]:
+        home = HomePage(await async_login_factory("profile1"))
+        await home.navigate()
+        await home.search(query)
+        await home.wait_for_results()
+        return await home.get_visible_ad_titles(max_count=5)
+
+    results = await asyncio.gather(*(_search(q) for q in QUERIES))
+
+    for query, titles in zip(QUERIES, results):
+        assert len(titles) > 0, f"Expected at least one ad for '{query}'"
@@ -1,7 +1,10 @@
 # tests/smoke/test_home_page.py
+import pytest
+
 from pages.home_page import HomePage
 
 
+@pytest.mark.resources("text-only")
 def test_home_page_search_smoke(login_factory):
     """
     P0 smoke test: authenticated user can search and see results.
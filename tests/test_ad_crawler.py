@@ -0,0 +1,52 @@
+# tests/test_ad_crawler.py
+import pytest
+
+from utils.ad_crawler import crawl_ads
+from utils.standin_server import AvitoStandIn, StandInConfig
+
+ITEM_LATENCY = 0.5  # seconds the stand-in holds every ad page
+ADS = 6
+
+
+@pytest.fixture
+def slow_standin():
+    standin = AvitoStandIn(StandInConfig(latency={"item": ITEM_LATENCY})).start()
+    yield standin
+    standin.stop()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_ads_load_concurrently(async_browser, slow_standin):
+    """
+    Every ad answers after ITEM_LATENCY: crawled with one page per ad, the
+    whole batch should take about one latency, not ADS of them.
+    """
+    hrefs = [
+        f"{slow_standin.base_url}/moskva/telefony/ad_{1_000_001 + n}"
+        for n in range(ADS)
+    ]
+    context = await async_browser.new_context()
+    try:
+        report = await crawl_ads(context, hrefs, concurrency=ADS)
+    finally:
+        await context.close()
+
+    assert report.complete, report.failures
+    assert [ad.item_id for ad in report.ads] == [h.rsplit("_", 1)[1] for h in hrefs]
+    assert report.elapsed < 2 * ITEM_LATENCY < ADS * ITEM_LATENCY
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_a_missing_ad_is_reported_without_losing_the_rest(
+    async_browser, slow_standin
+):
+    good = f"{slow_standin.base_url}/moskva/telefony/ad_1000001"
+    missing = f"{slow_standin.base_url}/nowhere"
+    context = await async_browser.new_context()
+    try:
+        report = await crawl_ads(context, [good, missing, good], timeout=3_000)
+    finally:
+        await context.close()
+
+    assert [ad.item_id for ad in report.ads] == ["1000001"]
+    assert list(report.failures) == [missing]
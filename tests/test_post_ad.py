@@ -0,0 +1,28 @@
+# tests/test_post_ad.py
+import pytest
+
+from pages.post_ad_page import PostAdPage
+
+
+def test_seller_posts_ad_with_photos(request, login_factory, image_factory):
+    """
+    Seller journey: open the form → fill details → upload 3 photos → publish.
+    Photos come from memory (one encode per variant for the whole run).
+    Only against the stand-in: publishing on avito.ru would create a real ad.
+    """
+    if not request.config.getoption("--standin"):
+        pytest.skip("Posting ads runs against the stand-in only (--standin)")
+    standin = request.getfixturevalue("avito_standin")
+    page = login_factory("seller")
+    photos = image_factory.payloads(3, width=1024, height=768)
+
+    post = PostAdPage(page).navigate()
+    post.fill_details("Велосипед горный", "Почти новый, 21 скорость", 15_000)
+    post.upload_photos(photos)
+    assert post.photo_count() == 3, "Every uploaded photo should get a preview"
+
+    url = post.publish()
+    ad = standin.posted[-1]
+    assert url and url.endswith(f"_{ad.item_id}"), f"Unexpected ad URL: {url}"
+    assert (ad.title, ad.price) == ("Велосипед горный", 15_000)
+    assert [size for _, _, size in ad.photos] == [len(p["buffer"]) for p in photos]
@@ -1,5 +1,38 @@
 # tests/test_search_filters.py
+from pages.ad_detail_page import AdDetailPage
+from pages.home_page import HomePage
+from pages.search_query import SearchQuery, Sort
+
+
 def test_buyer_search(login_factory):
+    """
+    Buyer journey: search → filter → open ad. The filtered listing is opened
+    with one navigation (no clicks through the filter panel), then the filters
+    the page shows as applied are read back and checked against the results.
+    """
     page = login_factory("buyer")  # Logs as buyer, reuses state if available
-    page.goto("https://www.avito.ru")
-    # Perform search actions
+    query = SearchQuery(
+        "iphone", price_min=10_000, price_max=100_000, sort=Sort.PRICE_ASC
+    )
+
+    results = HomePage(page).search_filtered(query).wait_for_results()
+
+    applied = results.active_filters()
+    assert (applied.text, applied.price_min, applied.price_max, applied.sort) == (
+        query.text,
+        query.price_min,
+        query.price_max,
+        query.sort,
+    ), f"Listing did not apply the requested filters: {applied}"
+
+    cards = list(results.iter_results(limit=5))
+    assert cards, "Expected at least one result for the filtered search"
+    prices = [card.price for card in cards if card.price is not None]
+    assert all(10_000 <= price <= 100_000 for price in prices), prices
+
+    # Open the first result directly rather than through its target=_blank popup
+    assert cards[0].href, "First result has no link"
+    page.goto(cards[0].href, wait_until="domcontentloaded")
+    ad = AdDetailPage(page).extract(timeout=15_000)
+    assert len(ad.title) > 0, "Ad title should not be empty"
+    assert ad.price is None or 10_000 <= ad.price <= 100_000
@@ -0,0 +1,75 @@
+# tests/unit/test_ad_detail_extract.py
+from unittest.mock import Mock
+
+import pytest
+
+from playwright.sync_api import TimeoutError as PWTimeout
+
+from pages.ad_detail_page import (
+    EXTRACT_WHEN_READY_JS,
+    AdDetailPage,
+    extract_many,
+    parse_price,
+)
+
+RAW = {
+    "title": "iPhone 15 Pro, 256 ГБ",
+    "price": "112 990 ₽",
+    "location": "Москва, м. Тверская",
+    "itemId": "№ 4321",
+    "url": "https://www.avito.ru/moskva/telefony/iphone_15_pro_3902116514?context=x",
+}
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("12 990 ₽", (12990, "RUB")),
+        ("1 500 руб.", (1500, "RUB")),
+        ("Цена не указана", (None, None)),
+        ("$ 250", (250, "USD")),
+    ],
+)
+def test_parse_price(raw, expected):
+    assert parse_price(raw) == expected
+
+
+def test_extract_is_one_round_trip():
+    page = Mock()
+    page.evaluate.return_value = RAW
+
+    ad = AdDetailPage(page).extract()
+
+    page.evaluate.assert_called_once()
+    page.locator.return_value.text_content.assert_not_called()
+    assert ad.title == "iPhone 15 Pro, 256 ГБ"
+    assert (ad.price, ad.currency) == (112990, "RUB")
+    assert ad.item_id == "3902116514"  # URL wins over the on-page marker
+    assert not hasattr(ad, "__dict__")  # slotted record
+
+
+def test_extract_with_timeout_waits_in_page():
+    page = Mock()
+    page.evaluate.return_value = dict(RAW, url="https://www.avito.ru/ad")
+
+    ad = AdDetailPage(page).extract(timeout=5_000)
+
+    script, arg = page.evaluate.call_args.args
+    assert (script, arg["timeout"]) == (EXTRACT_WHEN_READY_JS, 5_000)
+    assert ad.item_id == "4321"
+
+    page.evaluate.return_value = None  # not ready within the timeout
+    with pytest.raises(PWTimeout, match="5000ms"):
+        AdDetailPage(page).extract(timeout=5_000)
+
+
+def test_extract_many_opens_urls_in_the_given_page():
+    page = Mock()
+    page.evaluate.return_value = RAW
+
+    ads = extract_many(["https://a/1_1", "https://a/2_2"], page=page)
+
+    assert len(ads) == 2
+    assert page.goto.call_count == 2
+    with pytest.raises(ValueError):
+        extract_many(["https://a/1_1"])
@@ -0,0 +1,122 @@
+# tests/unit/test_artifacts.py
+import asyncio
+import gzip
+import json
+import os
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from plugins import artifacts as plugin
+from utils.artifacts import (
+    INDEX_NAME,
+    ArtifactWriter,
+    Capture,
+    capture,
+    capture_async,
+)
+
+
+def _page(html="<html>fail</html>", screenshot=b"\xff\xd8jpeg"):
+    page = Mock(url="https://www.avito.ru/profile")
+    page.content.return_value = html
+    page.screenshot.return_value = screenshot
+    return page
+
+
+def test_capture_is_best_effort():
+    page = _page()
+    page.screenshot.side_effect = RuntimeError("page crashed")
+
+    captured = capture(page, "t")
+
+    assert captured.screenshot is None
+    assert captured.names == [captured.html_name]
+    assert captured.html_name.endswith(".html.gz")
+
+
+def test_async_capture_matches_sync_names():
+    page = AsyncMock(url="https://www.avito.ru/profile")
+    page.content.return_value = "<html>fail</html>"
+    page.screenshot.return_value = b"\xff\xd8jpeg"
+
+    captured = asyncio.run(capture_async(page, "t"))
+
+    assert captured.names == capture(_page(), "t").names
+
+
+def test_identical_html_is_stored_once_and_indexed_per_capture(tmp_path):
+    writer = ArtifactWriter(tmp_path, max_bytes=10_000_000)
+    first = writer.submit(capture(_page(), "test_a"))
+    second = writer.submit(capture(_page(), "test_b"))
+    writer.flush()
+
+    assert first.names == second.names
+    blobs = sorted(
+        p.name for p in tmp_path.iterdir() if not p.name.startswith(INDEX_NAME)
+    )
+    assert blobs == sorted(first.names)
+    html = gzip.decompress((tmp_path / first.html_name).read_bytes())
+    assert html == b"<html>fail</html>"
+    index = [
+        json.loads(line)
+        for line in (tmp_path / INDEX_NAME).read_text("utf-8").splitlines()
+    ]
+    assert [e["label"] for e in index] == ["test_a", "test_b"]
+    assert not writer.errors
+
+
+def test_oldest_blobs_are_evicted_past_the_cap(tmp_path):
+    writer = ArtifactWriter(tmp_path, max_bytes=10_000_000)
+    names = []
+    for i in range(3):
+        captured = capture(_page(html=os.urandom(600).hex(), screenshot=None), f"t{i}")
+        writer.write(captured)
+        os.utime(tmp_path / captured.html_name, (i, i))  # deterministic age
+        names.append(captured.html_name)
+
+    sizes = [(tmp_path / n).stat().st_size for n in names]
+    writer.max_bytes = sizes[1] + sizes[2]
+    evicted = writer.evict()
+
+    assert evicted == [names[0]]
+    assert not (tmp_path / names[0]).exists()
+    assert (tmp_path / names[2]).exists()
+    index = (tmp_path / INDEX_NAME).read_text("utf-8").splitlines()
+    assert [json.loads(line)["label"] for line in index] == ["t1", "t2"]
+
+
+def test_tracked_pages_are_found_once_and_only_while_open():
+    item = Mock(stash=pytest.Stash(), funcargs={})
+    page, closed = Mock(), Mock()
+    page.is_closed.return_value = False
+    closed.is_closed.return_value = True
+    for p in (page, page, closed):
+        plugin._track_page(item, p)
+
+    assert plugin._open_pages(item) == [page]
+
+
+def test_async_pages_are_captured_only_for_failed_tests(monkeypatch):
+    saved = []
+
+    async def save(page, label, full_page):
+        saved.append(label)
+        return Capture(label, page.url, b"<html/>", None, 0.0)
+
+    monkeypatch.setattr(plugin.artifacts, "save_failure_async", save)
+    item = Mock(nodeid="t.py::test", stash=pytest.Stash(), user_properties=[])
+    item.config.getoption.side_effect = {
+        "--artifacts": "on-failure",
+        "--artifact-full-page": False,
+    }.get
+    page = Mock(url="https://www.avito.ru/")
+    page.is_closed.return_value = False
+
+    asyncio.run(plugin._save_async_pages(item, [page]))
+    assert saved == []
+
+    item.stash[plugin._FAILED_KEY] = True
+    asyncio.run(plugin._save_async_pages(item, [page]))
+    assert saved == ["t.py::test [async page 0]"]
+    assert item.user_properties[0][0] == "artifacts"
@@ -0,0 +1,168 @@
+# tests/unit/test_asset_cache.py
+import asyncio
+import os
+from unittest.mock import AsyncMock, Mock
+
+from utils.asset_cache import (
+    AssetCache,
+    AssetStore,
+    cacheable_request,
+    expires_at,
+    storable,
+)
+
+JS = {
+    "content-type": "application/javascript",
+    "cache-control": "public, max-age=31536000, immutable",
+    "etag": '"abc"',
+    "set-cookie": "u=1",
+}
+URL = "https://www.avito.ru/s/a/app.3f2e.js"
+
+
+def _route(url=URL, resource_type="script", method="GET"):
+    route = Mock()
+    route.request.url = url
+    route.request.method = method
+    route.request.resource_type = resource_type
+    route.request.headers = {"accept": "*/*"}
+    return route
+
+
+def _response(status=200, headers=JS, body=b"console.log(1)"):
+    response = Mock(status=status, headers=dict(headers))
+    response.body.return_value = body
+    return response
+
+
+def test_only_static_get_requests_are_looked_up():
+    assert cacheable_request("GET", "script")
+    assert cacheable_request("GET", "font")
+    assert not cacheable_request("GET", "document")
+    assert not cacheable_request("GET", "xhr")
+    assert not cacheable_request("POST", "image")
+
+
+def test_freshness_from_max_age_expires_and_last_modified():
+    now = 1_000_000.0
+    assert expires_at({"cache-control": "max-age=60", "age": "10"}, now) == now + 50
+    assert expires_at({"cache-control": "no-cache, max-age=60"}, now) == now
+    dated = {
+        "date": "Thu, 01 Jan 2026 00:00:00 GMT",
+        "expires": "Thu, 01 Jan 2026 01:00:00 GMT",
+    }
+    assert expires_at(dated, now) == now + 3600
+    heuristic = {
+        "date": "Sat, 11 Jan 2026 00:00:00 GMT",
+        "last-modified": "Thu, 01 Jan 2026 00:00:00 GMT",
+    }
+    assert expires_at(heuristic, now) == now + 86_400
+    assert expires_at({}, now) == now
+
+
+def test_html_api_and_private_responses_are_not_stored():
+    assert storable(200, JS)
+    assert not storable(404, JS)
+    assert not storable(200, {**JS, "content-type": "text/html; charset=utf-8"})
+    assert not storable(200, {**JS, "content-type": "application/json"})
+    assert not storable(200, {**JS, "cache-control": "private, max-age=60"})
+    assert not storable(200, {**JS, "vary": "Cookie"})
+    assert storable(200, {**JS, "vary": "Accept-Encoding"})
+    # Neither fresh nor revalidatable: nothing to gain
+    assert not storable(200, {"content-type": "image/png"})
+
+
+def test_identical_bodies_share_one_blob(tmp_path):
+    store = AssetStore(tmp_path, max_bytes=1_000_000)
+    a = store.put("https://x/a.js", JS, b"same")
+    b = store.put("https://x/b.js", JS, b"same")
+    assert a is not None and b is not None and a.blob == b.blob
+    assert len(list(store.blobs.iterdir())) == 1
+    entry = store.lookup("https://x/b.js")
+    assert entry is not None and store.read(entry) == b"same"
+    assert "set-cookie" not in entry.headers
+    assert store.lookup("https://x/other.js") is None
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    store = AssetStore(tmp_path, max_bytes=1_000_000)
+    for i, name in enumerate("abc"):
+        entry = store.put(f"https://x/{name}.js", JS, name.encode() * 100)
+        assert entry is not None
+        os.utime(store.blobs / entry.blob, (i, i))
+    used = store.lookup("https://x/a.js")
+    assert used is not None and store.read(used)  # now the most recently used
+    store.max_bytes = 250
+
+    store.evict()
+
+    assert store.lookup("https://x/b.js") is not None
+    b = store.lookup("https://x/b.js")
+    assert b is not None and store.read(b) is None  # blob gone, entry dropped
+    assert store.lookup("https://x/b.js") is None
+    assert store.read(used) == b"a" * 100
+
+
+def test_miss_fetches_stores_and_next_request_is_a_hit(tmp_path):
+    store = AssetStore(tmp_path, max_bytes=1_000_000)
+    first = AssetCache(store)
+    route = _route()
+    route.fetch.return_value = _response()
+
+    first._handle(route)
+
+    route.fetch.assert_called_once_with(headers=None)
+    route.fulfill.assert_called_once()
+    assert (first.stats.misses, first.stats.stored) == (1, 1)
+
+    second = AssetCache(store)
+    again = _route()
+    second._handle(again)
+
+    again.fetch.assert_not_called()
+    assert again.fulfill.call_args.kwargs["body"] == b"console.log(1)"
+    assert second.stats.hits == 1
+    assert second.stats.bytes_saved == len(b"console.log(1)")
+
+
+def test_stale_entry_is_revalidated_with_its_validators(tmp_path):
+    store = AssetStore(tmp_path, max_bytes=1_000_000)
+    store.put(URL, {**JS, "cache-control": "no-cache"}, b"old body")
+    cache = AssetCache(store)
+    route = _route()
+    route.fetch.return_value = _response(304, {"cache-control": "max-age=60"}, b"")
+
+    cache._handle(route)
+
+    sent = route.fetch.call_args.kwargs["headers"]
+    assert sent["if-none-match"] == '"abc"'
+    assert route.fulfill.call_args.kwargs["body"] == b"old body"
+    assert (cache.stats.hits, cache.stats.revalidated) == (1, 1)
+    entry = store.lookup(URL)
+    assert entry is not None and entry.fresh()
+
+
+def test_documents_and_api_calls_go_to_the_network(tmp_path):
+    cache = AssetCache(AssetStore(tmp_path))
+    for route in (_route(resource_type="document"), _route(resource_type="fetch")):
+        cache._handle(route)
+        route.fallback.assert_called_once()
+        route.fetch.assert_not_called()
+    assert cache.stats.misses == 0
+
+
+def test_async_contexts_share_the_store(tmp_path):
+    store = AssetStore(tmp_path, max_bytes=1_000_000)
+    store.put(URL, JS, b"cached")
+    cache = AssetCache(store)
+    context = AsyncMock()
+    asyncio.run(cache.apply_async(context))
+    handler = context.route.call_args.args[1]
+
+    route = AsyncMock()
+    route.request = _route().request
+    asyncio.run(handler(route))
+
+    route.fetch.assert_not_awaited()
+    route.fulfill.assert_awaited_once()
+    assert cache.stats.hits == 1
@@ -0,0 +1,55 @@
+# tests/unit/test_auth_cache.py
+import json
+
+from utils.auth_cache import (
+    clear_validation,
+    read_validation,
+    record_validation,
+    sidecar_for,
+)
+
+
+def _state_file(tmp_path, content='{"cookies": [], "origins": []}'):
+    path = tmp_path / "profile1.json"
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def test_recorded_result_is_read_back(tmp_path):
+    state_file = _state_file(tmp_path)
+    assert read_validation(state_file) is None
+
+    record_validation(state_file, True)
+    assert read_validation(state_file) is True
+
+    record_validation(state_file, False)
+    assert read_validation(state_file) is False
+
+
+def test_record_is_ignored_after_state_changes(tmp_path):
+    state_file = _state_file(tmp_path)
+    record_validation(state_file, True)
+
+    state_file.write_text('{"cookies": [{"name": "sessid"}]}', encoding="utf-8")
+    assert read_validation(state_file) is None
+
+
+def test_record_expires_after_ttl(tmp_path):
+    state_file = _state_file(tmp_path)
+    record_validation(state_file, True, ttl=60)
+
+    sidecar = sidecar_for(state_file)
+    record = json.loads(sidecar.read_text(encoding="utf-8"))
+    record["validated_at"] -= 61
+    sidecar.write_text(json.dumps(record), encoding="utf-8")
+    assert read_validation(state_file) is None
+
+
+def test_corrupt_or_cleared_record_means_unknown(tmp_path):
+    state_file = _state_file(tmp_path)
+    sidecar_for(state_file).write_text("{not json", encoding="utf-8")
+    assert read_validation(state_file) is None
+
+    record_validation(state_file, True)
+    clear_validation(state_file)
+    assert read_validation(state_file) is None
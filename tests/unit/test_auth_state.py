@@ -0,0 +1,108 @@
+# tests/unit/test_auth_state.py
+import json
+import os
+
+import pytest
+
+from utils.auth_state import (
+    classify_state,
+    compact_path_for,
+    compact_state,
+    inspect_state,
+    load_state,
+    write_compact,
+)
+
+NOW = 1_760_000_000.0
+
+
+def _state(expires):
+    return {"cookies": [{"name": "sessid", "value": "x", "expires": expires}]}
+
+
+def test_missing_auth_cookie_is_dead():
+    report = classify_state("profile1", {"cookies": []}, age=10, now=NOW)
+    assert report.status == "missing"
+    assert report.is_dead
+
+
+def test_expired_auth_cookie_is_dead():
+    report = classify_state("profile1", _state(NOW - 1), age=10, now=NOW)
+    assert report.status == "expired"
+    assert report.is_dead
+
+
+def test_recent_state_skips_probe_within_window():
+    report = classify_state(
+        "profile1", _state(NOW + 7200), age=30, fresh_window=600, now=NOW
+    )
+    assert report.status == "fresh"
+    assert report.remaining == 7200
+
+
+def test_old_state_needs_probe():
+    report = classify_state("profile1", _state(-1), age=3600, fresh_window=600, now=NOW)
+    assert report.status == "unverified"
+    assert report.remaining is None
+    assert not report.is_dead
+
+
+def test_unreadable_file_is_dead(tmp_path):
+    state_file = tmp_path / "profile1.json"
+    state_file.write_text("{broken", encoding="utf-8")
+    report = inspect_state("profile1", state_file)
+    assert report.status == "unreadable"
+    assert report.is_dead
+
+    state_file.write_text(json.dumps(_state(-1)), encoding="utf-8")
+    assert inspect_state("profile1", state_file).status == "fresh"
+
+
+FULL_STATE = {
+    "cookies": [
+        {"name": "sessid", "value": "s", "domain": ".avito.ru", "expires": -1},
+        {"name": "u", "value": "1", "domain": "www.avito.ru", "expires": -1},
+        {"name": "_ga", "value": "GA1", "domain": ".google.com", "expires": -1},
+    ],
+    "origins": [
+        {
+            "origin": "https://www.avito.ru",
+            "localStorage": [{"name": "a", "value": "1"}],
+        },
+        {
+            "origin": "https://mc.yandex.ru",
+            "localStorage": [{"name": "b", "value": "2"}],
+        },
+    ],
+}
+
+
+def test_compact_auth_cookies_level_keeps_only_session_cookies():
+    compact = compact_state(FULL_STATE, "auth-cookies")
+    assert [c["name"] for c in compact["cookies"]] == ["sessid"]
+    assert compact["origins"] == []
+
+
+def test_compact_first_party_level_drops_third_party_data():
+    compact = compact_state(FULL_STATE, "first-party")
+    assert [c["name"] for c in compact["cookies"]] == ["sessid", "u"]
+    assert [o["origin"] for o in compact["origins"]] == ["https://www.avito.ru"]
+
+    with pytest.raises(ValueError):
+        compact_state(FULL_STATE, "everything")
+
+
+def test_newer_compact_copy_is_loaded_instead_of_full_file(tmp_path):
+    state_file = tmp_path / "profile1.json"
+    state_file.write_text(json.dumps(FULL_STATE), encoding="utf-8")
+    assert load_state(state_file) == FULL_STATE
+
+    compact = write_compact(state_file, compact_state(FULL_STATE, "auth-cookies"))
+    assert compact == compact_path_for(state_file)
+    assert compact.stat().st_size < state_file.stat().st_size
+    assert [c["name"] for c in load_state(state_file)["cookies"]] == ["sessid"]
+
+    # A re-bootstrapped (newer) full file wins over a stale compact copy
+    stat = compact.stat()
+    os.utime(state_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_state(state_file) == FULL_STATE
@@ -0,0 +1,57 @@
+# tests/unit/test_bench.py
+from utils.bench import (
+    append_run,
+    baseline,
+    contend_lock,
+    load_history,
+    measure,
+    regressed,
+)
+
+
+def test_measure_times_only_the_timed_rounds():
+    calls = []
+    result = measure("noop", lambda: calls.append(1), rounds=5, warmup=2)
+
+    assert len(calls) == 7
+    assert result.rounds == 5
+    assert 0 <= result.min_ms <= result.median_ms
+
+
+def test_history_round_trip_and_windowed_baseline(tmp_path):
+    history_file = tmp_path / "bench" / "history.jsonl"
+    for value in (10.0, 50.0, 11.0, 12.0):
+        append_run(history_file, {"context.new": value}, git="abc123")
+    append_run(history_file, {"other": 1.0})
+
+    history = load_history(history_file)
+
+    assert len(history) == 5
+    assert history[0]["git"] == "abc123"
+    assert baseline(history, "context.new", window=3) == 12.0
+    assert baseline(history, "context.new", window=10) == 11.5
+    assert baseline(history, "missing") is None
+
+
+def test_regressed_runs_do_not_feed_the_baseline(tmp_path):
+    history_file = tmp_path / "history.jsonl"
+    append_run(history_file, {"context.new": 10.0, "other": 1.0})
+    append_run(
+        history_file, {"context.new": 40.0, "other": 1.2}, regressed=["context.new"]
+    )
+
+    history = load_history(history_file)
+
+    assert baseline(history, "context.new") == 10.0
+    assert baseline(history, "other") == 1.1
+
+
+def test_regression_needs_both_relative_and_absolute_slowdown():
+    assert regressed(13.0, 10.0, threshold=0.25)
+    assert not regressed(12.0, 10.0, threshold=0.25)
+    assert not regressed(0.04, 0.01, threshold=0.25)  # timer noise
+    assert not regressed(99.0, None, threshold=0.25)  # first run
+
+
+def test_contend_lock_reports_time_per_acquisition(tmp_path):
+    assert contend_lock(str(tmp_path / "x.lock"), 10) > 0
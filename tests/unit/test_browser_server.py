@@ -0,0 +1,69 @@
+# tests/unit/test_browser_server.py
+import json
+from unittest.mock import Mock
+
+from utils.browser_server import (
+    BrowserFarm,
+    SharedBrowser,
+    launch_options_for_server,
+    read_endpoints,
+)
+
+
+def test_launch_args_become_launch_server_options():
+    options = launch_options_for_server(
+        {
+            "headless": True,
+            "slow_mo": 50,
+            "executable_path": "/bin/chrome",
+            "channel": None,
+        }
+    )
+    assert options == {"headless": True, "slowMo": 50, "executablePath": "/bin/chrome"}
+
+
+def _farm(tmp_path, *alive):
+    farm = BrowserFarm(len(alive), "chromium", {}, tmp_path / "endpoints.json")
+    farm.servers = []
+    for i, up in enumerate(alive):
+        server = Mock(ws_endpoint=f"ws://127.0.0.1:{9000 + i}/a")
+        server.alive.return_value = up
+        server.restart.side_effect = lambda s=server: setattr(
+            s, "ws_endpoint", s.ws_endpoint.replace("/a", "/b")
+        )
+        farm.servers.append(server)
+    return farm
+
+
+def test_watchdog_check_relaunches_dead_servers_and_republishes(tmp_path):
+    farm = _farm(tmp_path, True, False)
+
+    assert farm.check() == 1
+
+    farm.servers[0].restart.assert_not_called()
+    assert farm.relaunches == 1
+    assert read_endpoints(farm.endpoints_file) == [
+        "ws://127.0.0.1:9000/a",
+        "ws://127.0.0.1:9001/b",
+    ]
+
+
+def test_shared_browser_reconnects_to_the_republished_endpoint(tmp_path):
+    endpoints = tmp_path / "endpoints.json"
+    endpoints.write_text(json.dumps(["ws://h:1/x", "ws://h:2/x"]), encoding="utf-8")
+    browser_type = Mock()
+    first, second = Mock(), Mock()
+    browser_type.connect.side_effect = [first, second]
+    shared = SharedBrowser(browser_type, endpoints, slot=3)
+
+    shared.new_context()
+    first.new_context.assert_called_once()
+    assert browser_type.connect.call_args.args[0] == "ws://h:2/x"  # slot 3 of 2
+
+    first.is_connected.return_value = False
+    endpoints.write_text(json.dumps(["ws://h:1/x", "ws://h:3/x"]), encoding="utf-8")
+    shared.new_context()
+
+    second.new_context.assert_called_once()
+    assert browser_type.connect.call_args.args[0] == "ws://h:3/x"
+    assert shared.connects == 2
@@ -0,0 +1,135 @@
+# tests/unit/test_browser_watchdog.py
+import subprocess
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+from utils.browser_server import BrowserProxy, LaunchedBrowser
+from utils.browser_watchdog import (
+    MB,
+    BrowserWatchdog,
+    MemorySample,
+    close_leaked_pages,
+    sample,
+)
+
+
+def _launcher():
+    return Mock(
+        side_effect=lambda: Mock(contexts=[], **{"is_connected.return_value": True})
+    )
+
+
+def test_recycled_proxy_launches_a_new_browser_on_next_use():
+    launch = _launcher()
+    proxy = LaunchedBrowser(launch)
+    first = proxy.browser
+    proxy.new_context()
+
+    proxy.recycle()
+
+    first.close.assert_called_once()
+    assert proxy.current is None
+    proxy.new_context()
+    assert proxy.browser is not first
+    assert (proxy.launches, proxy.recycles, proxy.contexts_served) == (2, 1, 2)
+
+
+def test_recycles_after_max_contexts_since_the_last_recycle():
+    proxy = LaunchedBrowser(_launcher())
+    watchdog = BrowserWatchdog(
+        max_rss_mb=0, max_contexts=3, sampler=lambda pids: MemorySample()
+    )
+    for _ in range(2):
+        proxy.new_context()
+    assert watchdog.check(proxy) is None
+
+    proxy.new_context()
+    assert watchdog.check(proxy) == "3 contexts served"
+    assert proxy.recycles == 1
+
+    proxy.new_context()
+    assert watchdog.check(proxy) is None  # counted from the recycle
+
+
+def test_recycles_over_rss_and_keeps_the_peak():
+    samples = iter([MemorySample(300 * MB, 200 * MB, 4), MemorySample(900 * MB, 0, 0)])
+    proxy = LaunchedBrowser(_launcher())
+    proxy.browser
+    watchdog = BrowserWatchdog(
+        max_rss_mb=800, max_contexts=0, sampler=lambda pids: next(samples)
+    )
+
+    assert watchdog.check(proxy) is None
+    assert watchdog.check(proxy) == "RSS 900 MB > 800 MB"
+    report = watchdog.report(proxy)
+    assert report["peak_mb"] == 900
+    assert report["recycles"] == 1
+
+
+def test_nothing_is_checked_before_a_browser_is_open():
+    sampler = Mock()
+    assert BrowserWatchdog(sampler=sampler).check(LaunchedBrowser(_launcher())) is None
+    sampler.assert_not_called()
+
+
+def test_leaked_pages_are_closed():
+    popup, leftover = Mock(), Mock()
+    leftover.close.side_effect = RuntimeError("Target closed")
+    browser = Mock()
+    browser.contexts = [Mock(pages=[popup]), Mock(pages=[]), Mock(pages=[leftover])]
+
+    assert close_leaked_pages(browser) == 1
+    popup.close.assert_called_once()
+
+
+def test_sample_counts_child_processes():
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+    try:
+        measured = sample()
+    finally:
+        child.kill()
+        child.wait()
+    assert measured.browser_rss > 0
+    assert measured.renderers == 0
+
+
+def test_proxy_needs_an_opener():
+    with pytest.raises(TypeError):
+        BrowserProxy()  # type: ignore[abstract]
+
+
+def test_launched_browser_is_sampled_by_its_own_process_tree():
+    other = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+    spawned = []
+
+    def launch():
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+        spawned.append(child)
+        return Mock(contexts=[], **{"is_connected.return_value": True})
+
+    proxy = LaunchedBrowser(launch)
+    sampled = []
+
+    def sampler(pids):
+        sampled.append(pids)
+        return MemorySample()
+
+    watchdog = BrowserWatchdog(max_rss_mb=0, max_contexts=0, sampler=sampler)
+    try:
+        proxy.browser
+        assert proxy.root_pids == [spawned[0].pid]
+        own = sample(proxy.root_pids)
+        everything = sample()
+        watchdog.reason(proxy)
+    finally:
+        for child in (other, *spawned):
+            child.kill()
+            child.wait()
+
+    assert 0 < own.browser_rss < everything.browser_rss
+    assert sampled == [[spawned[0].pid]]
+    assert sample([]) == MemorySample()
+    proxy.close()
+    assert proxy.root_pids == []
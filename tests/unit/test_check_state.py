@@ -0,0 +1,120 @@
+# tests/unit/test_check_state.py
+# ruff: noqa: E402
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# tools/ scripts import each other as top-level modules (see bootstrap_auth.py)
+sys.path.append(str(Path(__file__).resolve().parents[2] / "tools"))
+import check_state
+
+
+@pytest.fixture
+def auth_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(check_state, "AUTH_DIR", tmp_path)
+    return tmp_path
+
+
+def _save(auth_dir, profile, expires):
+    state = {"cookies": [{"name": "sessid", "value": "x", "expires": expires}]}
+    (auth_dir / f"{profile}.json").write_text(json.dumps(state), encoding="utf-8")
+
+
+def test_discover_profiles_skips_sidecar_files(auth_dir):
+    _save(auth_dir, "profile2", -1)
+    _save(auth_dir, "profile1", -1)
+    for sidecar in (
+        "profile1.json.lock",
+        "profile1.json.gz",
+        "profile1.json.validated",
+    ):
+        (auth_dir / sidecar).write_text("", encoding="utf-8")
+
+    assert check_state.discover_profiles() == ["profile1", "profile2"]
+
+
+def test_batch_decided_offline_never_launches_a_browser(auth_dir, capsys, monkeypatch):
+    _save(auth_dir, "fresh", time.time() + 3600)
+    _save(auth_dir, "expired", time.time() - 3600)
+    monkeypatch.setattr(check_state, "async_playwright", None)  # would raise if used
+
+    code = check_state.check_all(["fresh", "expired", "absent"])
+
+    summary = json.loads(capsys.readouterr().out)
+    by_profile = {r["profile"]: r for r in summary["profiles"]}
+    assert [r["profile"] for r in summary["profiles"]] == ["fresh", "expired", "absent"]
+    assert by_profile["fresh"]["status"] == "valid"
+    assert by_profile["expired"]["exit_code"] == 1
+    assert by_profile["absent"]["status"] == "missing"
+    assert {r["source"] for r in summary["profiles"]} == {"offline"}
+    assert code == summary["exit_code"] == 2
+
+
+class _FakePage:
+    url = "about:blank"
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    async def goto(self, url):
+        pass
+
+
+class _FakeContext:
+    async def new_page(self):
+        return _FakePage()
+
+    async def close(self):
+        pass
+
+
+class _FakeBrowser:
+    async def new_context(self, storage_state):
+        if storage_state["cookies"][0]["value"] == "bad":
+            raise RuntimeError("cookies rejected")
+        return _FakeContext()
+
+    async def close(self):
+        pass
+
+
+class _FakePlaywright:
+    class chromium:
+        @staticmethod
+        async def launch(headless):
+            return _FakeBrowser()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def test_one_bad_state_does_not_abort_the_batch(auth_dir, capsys, monkeypatch):
+    for profile in ("good1", "bad", "good2"):
+        _save(auth_dir, profile, -1)
+    state = json.loads((auth_dir / "bad.json").read_text(encoding="utf-8"))
+    state["cookies"][0]["value"] = "bad"
+    (auth_dir / "bad.json").write_text(json.dumps(state), encoding="utf-8")
+    monkeypatch.setattr(check_state, "async_playwright", _FakePlaywright)
+
+    async def logged_in(page):
+        return True
+
+    monkeypatch.setattr(check_state, "is_logged_in_async", logged_in)
+
+    code = check_state.check_all(
+        ["good1", "bad", "good2"],
+        use_cache=False,
+        resource_policy="full",
+        tracing="off",
+    )
+
+    summary = json.loads(capsys.readouterr().out)
+    codes = {r["profile"]: r["exit_code"] for r in summary["profiles"]}
+    assert codes == {"good1": 0, "bad": 3, "good2": 0}
+    assert code == summary["exit_code"] == 3
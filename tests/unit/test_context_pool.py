@@ -0,0 +1,108 @@
+# tests/unit/test_context_pool.py
+import json
+from unittest.mock import Mock
+
+from playwright.sync_api import Error as PWError
+
+from utils.auth_state import write_compact
+from utils.context_pool import ContextPool
+
+STATE = {
+    "cookies": [{"name": "sessid", "value": "x", "domain": ".avito.ru", "path": "/"}],
+    "origins": [],
+}
+
+
+def _state_file(tmp_path):
+    path = tmp_path / "profile1.json"
+    path.write_text(json.dumps(STATE), encoding="utf-8")
+    return path
+
+
+def _browser():
+    browser = Mock()
+    browser.new_context.side_effect = lambda **_: Mock(pages=[])
+    return browser
+
+
+def test_released_context_is_reset_and_reused(tmp_path):
+    browser = _browser()
+    pool = ContextPool(browser, max_idle=2)
+    state_file = _state_file(tmp_path)
+
+    ctx = pool.acquire("profile1", state_file)
+    pool.release(ctx)
+
+    assert pool.acquire("profile1", state_file) is ctx
+    assert browser.new_context.call_count == 1
+    ctx.clear_cookies.assert_called_once()
+    ctx.add_cookies.assert_called_once_with(STATE["cookies"])
+    ctx.unroute_all.assert_called_once()
+
+
+def test_context_is_closed_after_max_uses(tmp_path):
+    pool = ContextPool(_browser(), max_idle=2, max_uses=1)
+    state_file = _state_file(tmp_path)
+
+    ctx = pool.acquire("profile1", state_file)
+    pool.release(ctx)
+
+    ctx.close.assert_called_once()
+    assert pool.acquire("profile1", state_file) is not ctx
+
+
+def test_oldest_idle_context_is_evicted(tmp_path):
+    pool = ContextPool(_browser(), max_idle=1)
+    state_file = _state_file(tmp_path)
+
+    first = pool.acquire("profile1", state_file)
+    second = pool.acquire("profile1", state_file)
+    pool.release(first)
+    pool.release(second)
+
+    first.close.assert_called_once()
+    assert pool.acquire("profile1", state_file) is second
+
+
+def test_broken_context_falls_back_to_fresh(tmp_path):
+    pool = ContextPool(_browser(), max_idle=2)
+    state_file = _state_file(tmp_path)
+
+    ctx = pool.acquire("profile1", state_file)
+    ctx.clear_cookies.side_effect = PWError("Target closed")
+    pool.release(ctx)
+
+    assert pool.acquire("profile1", state_file) is not ctx
+
+
+def test_new_compact_copy_replaces_parked_contexts(tmp_path):
+    browser = _browser()
+    pool = ContextPool(browser, max_idle=2)
+    state_file = _state_file(tmp_path)
+    ctx = pool.acquire("profile1", state_file)
+    pool.release(ctx)
+
+    compact = {"cookies": STATE["cookies"], "origins": []}
+    write_compact(state_file, compact)
+
+    assert pool.acquire("profile1", state_file) is not ctx
+    ctx.close.assert_called_once()
+
+
+def test_prewarm_parks_a_context_for_the_next_profile(tmp_path):
+    browser = _browser()
+    pool = ContextPool(browser, max_idle=1)
+    buyer_state, seller_state = tmp_path / "buyer.json", tmp_path / "seller.json"
+    for path in (buyer_state, seller_state):
+        path.write_text(json.dumps(STATE), encoding="utf-8")
+
+    buyer = pool.acquire("buyer", buyer_state)
+    pool.release(buyer)
+    pool.prewarm("seller", seller_state)
+    pool.prewarm("seller", seller_state)  # already parked: no new context
+
+    buyer.close.assert_called_once()  # evicted to make room
+    assert browser.new_context.call_count == 2
+    warmed = pool.acquire("seller", seller_state)
+    assert browser.new_context.call_count == 2
+    assert warmed is not buyer
@@ -0,0 +1,108 @@
+# tests/unit/test_fake_page.py
+import pytest
+from playwright.sync_api import Error as PWError, TimeoutError as PWTimeout
+
+from utils.fake_page import FakePage, UnknownScript, parse_html, query_all
+
+HTML = """
+<div class="card main" data-marker="item" id="c1">
+  <a data-marker="item-title" href="/a_1"><h3>iPhone 15</h3></a>
+  <p data-marker="item-price">99 990 ₽</p>
+</div>
+<div data-marker="item" style="display: none">
+  <a data-marker="item-title" href="/a_2">Hidden phone</a>
+</div>
+<ul><li><span>nested</span></li></ul>
+<button aria-label="Закрыть">×</button>
+<input type="submit" value="Войти">
+<br><img src="x.png" alt="logo">
+"""
+
+
+def _tags(selector, html=HTML):
+    return [el.tag for el in query_all(parse_html(html), selector)]
+
+
+def test_css_subset():
+    assert _tags('[data-marker="item"]') == ["div", "div"]
+    assert _tags("div.card.main > a h3") == ["h3"]
+    assert _tags("#c1 [data-marker='item-price']") == ["p"]
+    assert _tags("ul > span") == []
+    assert _tags("ul span, img") == ["span", "img"]
+    assert _tags('[data-marker^="item-"]') == ["a", "p", "a"]
+    assert _tags('[data-marker="item"]:visible') == ["div"]
+    assert _tags('[data-marker="item"]:has-text("HIDDEN")') == ["div"]
+
+
+def test_unsupported_selectors_fail_loudly():
+    with pytest.raises(ValueError):
+        FakePage(HTML).locator("text=iPhone")
+    with pytest.raises(ValueError):
+        FakePage(HTML).locator("li:nth-child(2)")
+
+
+def test_locators_are_strict_lazy_and_recorded():
+    page = FakePage(HTML)
+    titles = page.locator('[data-marker="item-title"]')
+    assert page.round_trips == 0
+
+    with pytest.raises(PWError, match="strict mode violation"):
+        titles.text_content()
+    assert titles.first.text_content() == "iPhone 15"
+    assert titles.count() == 2
+    assert titles.last.is_visible() is False
+    assert [c.method for c in page.calls] == [
+        "text_content",
+        "text_content",
+        "count",
+        "is_visible",
+    ]
+
+
+def test_waits_resolve_or_time_out_immediately():
+    page = FakePage(HTML)
+    page.locator("#c1").wait_for(state="visible")
+    with pytest.raises(PWTimeout):
+        page.locator("#missing").wait_for(state="visible", timeout=50)
+    with pytest.raises(PWTimeout):
+        page.locator("#missing").text_content()
+
+
+def test_role_and_text_lookup():
+    page = FakePage(HTML)
+    assert page.get_by_role("button", name="Войти").count() == 1
+    assert page.get_by_role("button", name="закрыть").count() == 1
+    assert page.get_by_role("button", name="Закр", exact=True).count() == 0
+    assert page.get_by_role("link").count() == 1  # the hidden one is excluded
+    assert page.get_by_text("nested").count() == 1  # innermost element only
+
+
+def test_unregistered_scripts_are_reported():
+    with pytest.raises(UnknownScript, match="@emulates") as err:
+        FakePage(HTML).evaluate("() => document.title")
+    assert err.value.script == "() => document.title"
+
+
+def test_goto_loads_routes_and_fill_sets_value():
+    page = FakePage(routes={"https://x.test/form": "<input name='q'>"})
+    page.goto("https://x.test/form")
+    page.locator("[name='q']").fill("iphone")
+
+    assert page.locator("[name='q']").input_value() == "iphone"
+    assert page.url == "https://x.test/form"
+
+
+def test_login_probe_runs_against_the_fake():
+    from utils.login_probe import MAX_INTERSTITIALS, wait_for_login_state
+    from utils.standin_server import AvitoStandIn
+
+    standin = AvitoStandIn()
+    assert (
+        wait_for_login_state(FakePage(standin.render_profile(), url="http://x/profile"))
+        == "logged_in"
+    )
+    assert wait_for_login_state(FakePage(standin.render_login())) == "logged_out"
+
+    stuck = FakePage("<button>Продолжить</button>", url="http://x/")
+    assert wait_for_login_state(stuck) == "interstitial"
+    assert len(stuck.calls_to("click")) == MAX_INTERSTITIALS
@@ -0,0 +1,59 @@
+# tests/unit/test_har.py
+import asyncio
+from unittest.mock import AsyncMock, Mock, call
+
+import pytest
+
+from utils.har import HarSession
+
+NODEID = "tests/smoke/test_ad_detail_page.py::test_can_view_ad_detail"
+
+
+def test_one_archive_per_context(tmp_path):
+    session = HarSession("record", tmp_path, NODEID)
+    first, second = Mock(), Mock()
+    session.attach(first)
+    session.attach(second)
+
+    first_har = first.route_from_har.call_args.args[0]
+    second_har = second.route_from_har.call_args.args[0]
+    assert first_har.name.endswith("test_can_view_ad_detail.har")
+    assert second_har.name.endswith("test_can_view_ad_detail-1.har")
+
+
+def test_replay_falls_back_to_unmatched_catch_all(tmp_path):
+    session = HarSession("replay", tmp_path, NODEID)
+    session.har_path(0).write_text("{}", encoding="utf-8")
+    context = Mock()
+    session.attach(context)
+
+    # The catch-all must be registered before the HAR route so it runs last
+    assert context.mock_calls[:2] == [
+        call.route("**/*", session._abort_unmatched),
+        call.route_from_har(session.har_path(0), not_found="fallback"),
+    ]
+
+    route = Mock()
+    route.request.method = "GET"
+    route.request.url = "https://www.avito.ru/web/1/beacon"
+    session._abort_unmatched(route)
+    route.abort.assert_called_once()
+    assert session.unmatched == ["GET https://www.avito.ru/web/1/beacon"]
+
+
+def test_replay_without_recording_fails(tmp_path):
+    session = HarSession("replay", tmp_path, NODEID)
+    with pytest.raises(pytest.fail.Exception):
+        session.attach(Mock())
+
+
+def test_async_replay_registers_the_same_routes(tmp_path):
+    session = HarSession("replay", tmp_path, NODEID)
+    session.har_path(0).write_text("{}", encoding="utf-8")
+    context = AsyncMock()
+    asyncio.run(session.attach_async(context))
+
+    assert context.mock_calls[:2] == [
+        call.route("**/*", session._abort_unmatched_async),
+        call.route_from_har(session.har_path(0), not_found="fallback"),
+    ]
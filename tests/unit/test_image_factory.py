@@ -0,0 +1,61 @@
+# tests/unit/test_image_factory.py
+import io
+
+import pytest
+from PIL import Image
+
+from utils.image_factory import ImageFactory, ImageSpec
+
+
+@pytest.fixture
+def factory(tmp_path):
+    return ImageFactory(tmp_path / "cache", source=tmp_path / "missing.jpg")
+
+
+def test_variants_have_the_requested_size_and_format(factory):
+    for spec in (
+        ImageSpec(640, 480),
+        ImageSpec(200, 300, "PNG"),
+        ImageSpec(50, 50, "WEBP"),
+    ):
+        payload = factory.get(spec).payload()
+        with Image.open(io.BytesIO(payload["buffer"])) as img:
+            assert img.size == (spec.width, spec.height)
+            assert img.format == spec.format
+        assert payload["name"] == spec.name
+        assert payload["mimeType"].startswith("image/")
+
+
+def test_each_variant_is_encoded_once_per_cache(factory, tmp_path):
+    first = factory.get(ImageSpec(320, 240))
+    assert factory.get(ImageSpec(320, 240)) is first  # memory
+    assert factory.generated == 1
+
+    other_worker = ImageFactory(tmp_path / "cache", source=tmp_path / "missing.jpg")
+    assert other_worker.get(ImageSpec(320, 240)).buffer == first.buffer  # disk
+    assert other_worker.generated == 0
+
+
+def test_seeds_give_distinct_photos(factory):
+    payloads = factory.payloads(3, width=160, height=120)
+    assert len({p["buffer"] for p in payloads}) == 3
+    assert len({p["name"] for p in payloads}) == 3
+
+
+def test_a_readable_source_image_is_the_base(tmp_path):
+    source = tmp_path / "source.png"
+    Image.new("RGB", (400, 300), (0, 128, 0)).save(source)
+    photo = ImageFactory(tmp_path / "cache", source=source).get(
+        ImageSpec(40, 30, "PNG")
+    )
+    with Image.open(io.BytesIO(photo.buffer)) as img:
+        colours = img.getcolors(maxcolors=100_000)
+    assert colours is not None
+    assert max(colours)[1] == (0, 128, 0)
+
+
+def test_bad_specs_are_rejected():
+    with pytest.raises(ValueError):
+        ImageSpec(format="GIF")
+    with pytest.raises(ValueError):
+        ImageSpec(0, 10)
@@ -0,0 +1,156 @@
+# tests/unit/test_load_runner.py
+# ruff: noqa: E402
+import asyncio
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# tools/ scripts import each other as top-level modules (see bootstrap_auth.py)
+sys.path.append(str(Path(__file__).resolve().parents[2] / "tools"))
+import load_runner
+from load_runner import JourneyResult, LoadRun, Tally, percentile, start_offsets
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert [percentile(values, p) for p in (50, 95, 99, 100)] == [50, 95, 99, 100]
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([], 50) is None
+
+
+def test_start_offsets_linear_and_in_batches():
+    assert start_offsets(1, 30) == [0.0]
+    assert start_offsets(3, 0) == [0.0, 0.0, 0.0]
+    assert start_offsets(5, 8) == [0.0, 2.0, 4.0, 6.0, 8.0]
+    assert start_offsets(6, 10, steps=3) == [0.0, 0.0, 5.0, 5.0, 10.0, 10.0]
+
+
+def test_failures_are_charged_to_their_step():
+    result = JourneyResult(user=0, started=0.0)
+    with result.step("home.navigate"):
+        pass
+    with pytest.raises(TimeoutError):
+        with result.step("home.search"):
+            raise TimeoutError("Timeout 15000ms exceeded.\nCall log: ...")
+
+    assert not result.ok
+    assert list(result.steps) == ["home.navigate"]
+    assert (result.failed_step, result.error) == (
+        "home.search",
+        "TimeoutError: Timeout 15000ms exceeded.",
+    )
+
+
+def test_tally_reports_throughput_percentiles_and_errors():
+    tally = Tally()
+    for ms in (100.0, 200.0, 300.0):
+        tally.add(JourneyResult(0, 0.0, steps={"home.navigate": ms, "ad.open": ms}))
+    tally.add(
+        JourneyResult(
+            1, 0.0, {"home.navigate": 50.0}, failed_step="ad.open", error="LookupError"
+        )
+    )
+
+    summary = tally.summary(seconds=30)
+
+    assert (summary["journeys"], summary["ok"], summary["error_rate"]) == (4, 3, 0.25)
+    assert summary["journeys_per_min"] == 6.0
+    assert summary["journey"]["p50"] == 400.0
+    assert list(summary["steps"]) == ["home.navigate", "ad.open"]
+    assert summary["steps"]["home.navigate"]["count"] == 4
+    assert summary["steps"]["ad.open"] == {
+        "count": 3,
+        "p50": 200.0,
+        "p90": 300.0,
+        "p95": 300.0,
+        "p99": 300.0,
+        "max": 300.0,
+        "errors": 1,
+    }
+    assert summary["errors"] == {"LookupError": 1}
+
+
+def test_load_run_ramps_users_and_streams_ndjson():
+    opened: list[tuple[int, float]] = []
+    calls = 0
+
+    async def open_page(user):
+        opened.append((user, run.elapsed()))
+        return f"page{user}"
+
+    async def journey(page, result):
+        nonlocal calls
+        calls += 1
+        n = calls  # other users run while this one sleeps
+        with result.step("home.navigate"):
+            await asyncio.sleep(0.01)
+        if n % 4 == 0:
+            with result.step("ad.open"):
+                raise RuntimeError("boom")
+
+    sink = io.StringIO()
+    run = LoadRun(open_page, journey, [0.0, 0.1, 5.0], 0.3, report_every=0.1, sink=sink)
+    summary = asyncio.run(run.run())
+
+    # The third user's offset is past the end of the run: it never starts
+    assert [user for user, _ in opened] == [0, 1]
+    assert opened[1][1] >= 0.1
+    rows = [json.loads(line) for line in sink.getvalue().splitlines()]
+    kinds = {row["type"] for row in rows}
+    assert kinds == {"journey", "interval", "summary"}
+    assert rows[-1] == summary
+    intervals = [row for row in rows if row["type"] == "interval"]
+    assert sum(row["journeys"] for row in intervals) == summary["journeys"]
+    journeys = [row for row in rows if row["type"] == "journey"]
+    assert summary["journeys"] == len(journeys) == calls
+    assert summary["failed"] == calls // 4
+    assert summary["steps"]["ad.open"]["errors"] == calls // 4
+    assert summary["errors"] == {"RuntimeError: boom": calls // 4}
+
+
+def test_a_page_that_cannot_open_counts_as_a_failed_journey():
+    async def open_page(user):
+        raise RuntimeError("Target closed")
+
+    async def journey(page, result):  # pragma: no cover - never reached
+        raise AssertionError
+
+    run = LoadRun(open_page, journey, [0.0], 0.05)
+    summary = asyncio.run(run.run())
+
+    assert (summary["journeys"], summary["failed"]) == (1, 1)
+    assert summary["steps"]["open_page"]["errors"] == 1
+
+
+def test_missing_state_exits_2(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(load_runner, "AUTH_DIR", tmp_path)
+    args = load_runner._parser().parse_args(["--profile", "nobody"])
+
+    assert load_runner.main(args) == 2
+    assert "No saved state for profile 'nobody'" in capsys.readouterr().out
+
+
+def test_ndjson_on_stdout_moves_progress_lines_to_stderr(monkeypatch, capsys):
+    async def run_load(args, state, sink):
+        async def open_page(user):
+            return None
+
+        async def journey(page, result):
+            with result.step("home.navigate"):
+                await asyncio.sleep(0)
+
+        return await LoadRun(open_page, journey, [0.0], 0.02, sink=sink).run()
+
+    monkeypatch.setattr(load_runner, "run_load", run_load)
+    args = load_runner._parser().parse_args(["--profile", "", "--ndjson", "-"])
+
+    assert load_runner.main(args) == 0
+    captured = capsys.readouterr()
+    rows = [json.loads(line) for line in captured.out.splitlines()]
+    # The run ends before the first report: its only interval is the leftover one
+    assert [row["type"] for row in rows[-2:]] == ["interval", "summary"]
+    assert rows[-2]["journeys"] == rows[-1]["journeys"]
+    assert "[load]" in captured.err
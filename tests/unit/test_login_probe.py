@@ -0,0 +1,85 @@
+# tests/unit/test_login_probe.py
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from playwright.sync_api import Error as PWError, TimeoutError as PWTimeout
+
+from utils.login_probe import (
+    MAX_INTERSTITIALS,
+    PROBE_JS,
+    SIGNALS,
+    is_logged_in,
+    is_logged_in_async,
+    probe_login,
+    wait_for_login_state,
+)
+
+
+def _page(*states):
+    """A page whose in-page probe resolves to `states` in turn."""
+    page = Mock()
+    handles = []
+    for state in states:
+        handle = Mock()
+        handle.json_value.return_value = state
+        handles.append(handle)
+    page.wait_for_function.side_effect = handles
+    return page
+
+
+def test_probe_is_a_single_in_page_wait():
+    page = _page("logged_in")
+
+    assert probe_login(page, timeout=5_000) == "logged_in"
+    page.wait_for_function.assert_called_once_with(PROBE_JS, arg=SIGNALS, timeout=5_000)
+    page.wait_for_timeout.assert_not_called()
+    page.locator.assert_not_called()
+
+
+def test_no_signal_before_timeout_is_unknown():
+    page = Mock()
+    page.wait_for_function.side_effect = PWTimeout("Timeout 15000ms exceeded.")
+    assert probe_login(page) == "unknown"
+    assert not is_logged_in(_page("logged_out"))
+
+
+def test_interstitials_are_clicked_through_a_bounded_number_of_times():
+    page = _page("interstitial", "logged_in")
+    assert is_logged_in(page)
+    page.get_by_text.return_value.first.click.assert_called_once()
+
+    stuck = _page(*["interstitial"] * (MAX_INTERSTITIALS + 1))
+    assert wait_for_login_state(stuck) == "interstitial"
+    assert stuck.get_by_text.return_value.first.click.call_count == MAX_INTERSTITIALS
+
+
+def test_a_vanished_continue_button_is_re_probed_not_raised():
+    page = _page("interstitial", "logged_in")
+    page.get_by_text.return_value.first.click.side_effect = PWError("detached")
+    assert is_logged_in(page)
+    assert page.wait_for_function.call_count == 2
+
+
+def test_async_probe_follows_the_same_rules():
+    page = AsyncMock()
+    page.get_by_text = Mock()
+    page.get_by_text.return_value.first.click = AsyncMock()
+    handles = [AsyncMock(), AsyncMock()]
+    handles[0].json_value.return_value = "interstitial"
+    handles[1].json_value.return_value = "logged_in"
+    page.wait_for_function.side_effect = handles
+
+    assert asyncio.run(is_logged_in_async(page))
+    page.get_by_text.return_value.first.click.assert_awaited_once()
+
+
+def test_async_probe_survives_a_failed_click():
+    page = AsyncMock()
+    page.get_by_text = Mock()
+    page.get_by_text.return_value.first.click = AsyncMock(side_effect=PWError("gone"))
+    handles = [AsyncMock(), AsyncMock()]
+    handles[0].json_value.return_value = "interstitial"
+    handles[1].json_value.return_value = "logged_in"
+    page.wait_for_function.side_effect = handles
+
+    assert asyncio.run(is_logged_in_async(page))
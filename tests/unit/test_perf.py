@@ -0,0 +1,99 @@
+# tests/unit/test_perf.py
+import asyncio
+import csv
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from utils import perf
+
+
+@pytest.fixture
+def recorder():
+    rec = perf.PerfRecorder("tests/smoke/test_x.py::test_x")
+    perf.activate(rec)
+    yield rec
+    perf.activate(None)
+
+
+class _Page:
+    @perf.timed("home.navigate")
+    def navigate(self):
+        return self
+
+    @perf.timed("ad.extract")
+    async def extract(self):
+        return "ad"
+
+
+def test_steps_are_free_without_a_recorder(monkeypatch):
+    monkeypatch.setattr(perf, "_ACTIVE", None)  # even under --perf
+    assert _Page().navigate() is not None
+    context = Mock()
+    perf.instrument(context)
+    context.add_init_script.assert_not_called()
+
+
+def test_sync_and_async_steps_are_recorded(recorder):
+    _Page().navigate()
+    assert asyncio.run(_Page().extract()) == "ad"
+    with perf.step("auth.validate", kind="fixture"):
+        pass
+
+    assert [(r["kind"], r["name"]) for r in recorder.rows] == [
+        ("step", "home.navigate"),
+        ("step", "ad.extract"),
+        ("fixture", "auth.validate"),
+    ]
+    assert all(r["ms"] >= 0 for r in recorder.rows)
+
+
+def test_navigation_reports_go_to_the_last_started_step(recorder):
+    context = Mock()
+    perf.instrument(context)
+    perf.instrument(context)  # pooled context handed out again
+    context.expose_binding.assert_called_once()
+    report = context.expose_binding.call_args.args[1]
+
+    _Page().navigate()
+    report(None, {"url": "https://www.avito.ru/", "ttfb": 120.44, "lcp": 900.0})
+
+    nav = recorder.rows[-1]
+    assert (nav["kind"], nav["name"], nav["ttfb"], nav["lcp"]) == (
+        "navigation",
+        "home.navigate",
+        120.4,
+        900.0,
+    )
+
+
+def test_budgets_flag_steps_and_navigation_metrics(tmp_path):
+    rows = [
+        {"test": "t1", "kind": "step", "name": "home.navigate", "ms": 5100.0},
+        {
+            "test": "t1",
+            "kind": "navigation",
+            "name": "home.navigate",
+            "ms": None,
+            "lcp": 3000.0,
+            "fcp": 800.0,
+        },
+        {"test": "t2", "kind": "step", "name": "home.navigate", "ms": 900.0},
+    ]
+    budgets = {"home.navigate": 4000, "home.navigate:lcp": 2500}
+
+    breaches = perf.check_budgets(rows, budgets)
+
+    assert breaches == [
+        "t1: home.navigate 5100>4000ms",
+        "t1: home.navigate:lcp 3000>2500ms",
+    ]
+    assert rows[2]["over_budget"] == ""
+
+    json_path, csv_path = perf.write_report(rows, tmp_path / "perf")
+    assert json.loads(json_path.read_text("utf-8")) == rows
+    with csv_path.open(encoding="utf-8") as f:
+        assert [r["over_budget"] for r in csv.DictReader(f)][1] == (
+            "home.navigate:lcp 3000>2500ms"
+        )
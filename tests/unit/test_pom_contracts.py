@@ -1,5 +1,6 @@
 # tests/unit/test_pom_contracts.py
 from unittest.mock import Mock
+import pytest
 from pages.home_page import HomePage
 from pages.ad_detail_page import AdDetailPage
 
@@ -14,3 +15,188 @@ def test_ad_detail_page_instantiates():
     mock_page = Mock()
     ad = AdDetailPage(mock_page)
     assert ad is not None
+
+
+def test_sync_and_async_pages_share_locators():
+    from pages.aio.home_page import HomePage as AsyncHomePage
+    from pages.locators import HomeLocators
+
+    sync_page, async_page = Mock(), Mock()
+    HomePage(sync_page)
+    AsyncHomePage(async_page)
+
+    assert sync_page.locator.call_args_list == async_page.locator.call_args_list
+    sync_page.locator.assert_any_call(HomeLocators.SEARCH_INPUT)
+
+
+# --- Against FakePage: real selectors over stand-in HTML, no browser --------
+def _standin_page(render: str, *args, url: str = "http://avito.test/", **config):
+    from utils.fake_page import FakePage
+    from utils.standin_server import AvitoStandIn, StandInConfig
+
+    standin = AvitoStandIn(StandInConfig(**config))
+    return FakePage(getattr(standin, render)(*args), url=url), standin
+
+
+def test_visible_ad_titles_are_sliced_in_one_round_trip():
+    page, _ = _standin_page("render_results", "iphone", result_count=20)
+
+    titles = HomePage(page).wait_for_results().get_visible_ad_titles(max_count=3)
+
+    assert titles == [f"iphone — объявление {i}" for i in (1, 2, 3)]
+    assert [c.method for c in page.calls] == ["wait_for", "evaluate_all"]
+
+
+def test_visible_ad_hrefs_are_absolute_and_read_in_one_round_trip():
+    page, _ = _standin_page(
+        "render_results", "iphone", url="http://avito.test/all?q=iphone"
+    )
+
+    hrefs = HomePage(page).get_visible_ad_hrefs(max_count=2)
+
+    assert [h.rsplit("_", 1)[-1] for h in hrefs] == ["1000001", "1000002"]
+    assert all(h.startswith("http://avito.test/moskva/telefony/") for h in hrefs)
+    assert page.round_trips == 1
+
+
+def test_ad_location_is_read_only_when_visible():
+    page, standin = _standin_page("render_item", 1_000_007)
+    ad = AdDetailPage(page).wait_for_loaded()
+
+    assert ad.get_title() == "Объявление 7"
+    assert ad.get_location() == "Москва, Тверская ул., 1"
+
+    hidden = standin.render_item(1_000_007).replace(
+        "itemprop='address'", "itemprop='address' hidden"
+    )
+    page.set_content(hidden)
+    page.calls.clear()
+    assert AdDetailPage(page).get_location() is None
+    assert [c.method for c in page.calls] == ["is_visible"]  # no text read
+
+
+def test_extract_reads_every_field_in_one_in_page_pass():
+    page, _ = _standin_page(
+        "render_item", 1_000_007, url="http://avito.test/moskva/x_1000007"
+    )
+
+    ad = AdDetailPage(page).extract(timeout=1_000)
+
+    assert (ad.title, ad.currency, ad.item_id) == ("Объявление 7", "RUB", "1000007")
+    assert ad.price == int(ad.price_raw.replace(" ", "").rstrip("₽"))
+    # The wait and the read are one in-page poll
+    assert [c.method for c in page.calls] == ["evaluate"]
+    assert page.round_trips == 1
+
+    page.calls.clear()
+    assert AdDetailPage(page).extract() == ad
+    assert [c.method for c in page.calls] == ["evaluate"]
+
+
+def test_extract_times_out_while_the_price_is_hidden():
+    from playwright.sync_api import TimeoutError as PWTimeout
+
+    page, standin = _standin_page("render_item", 1_000_007)
+    page.set_content(
+        standin.render_item(1_000_007).replace(
+            "data-marker='item-view/item-price'",
+            "data-marker='item-view/item-price' hidden",
+        )
+    )
+    page.calls.clear()
+
+    with pytest.raises(PWTimeout):
+        AdDetailPage(page).extract(timeout=1_000)
+    assert page.round_trips == 1
+
+
+def test_login_error_text_only_when_shown():
+    from pages.login_page import LoginPage
+
+    page, standin = _standin_page("render_login")
+    login = LoginPage(page)
+    assert login.error_text_now() is None
+
+    page.set_content(standin.render_login(error="Неверный пароль"))
+    assert login.error_text_now() == "Неверный пароль"
+
+    login.login("user", "secret")
+    assert [c.method for c in page.calls[-3:]] == ["fill", "fill", "click"]
+
+
+def test_iter_results_follows_pagination_lazily():
+    from pages.search_results_page import SearchResultsPage
+    from utils.fake_page import FakePage
+    from utils.standin_server import AvitoStandIn, StandInConfig
+
+    standin = AvitoStandIn(StandInConfig(result_count=4, page_count=2))
+    first = "http://avito.test/all?q=tv"
+    page = FakePage(
+        standin.render_results("tv", 1),
+        url=first,
+        routes={"http://avito.test/all?q=tv&p=2": standin.render_results("tv", 2)},
+    )
+
+    cards = list(SearchResultsPage(page).iter_results(limit=6, batch_size=4))
+
+    assert [c.item_id for c in cards] == [str(1_000_001 + i) for i in range(6)]
+    assert cards[0].href.startswith("http://avito.test/moskva/telefony/")
+    assert [c.method for c in page.calls] == [
+        "evaluate",  # cards 1-4
+        "evaluate",  # empty: end of page 1
+        "goto",
+        "wait_for",
+        "evaluate",  # cards 5-6
+    ]
+
+
+def test_filtered_search_is_one_navigation_and_reads_back(monkeypatch):
+    from pages.search_query import SearchQuery, Sort
+    from utils.fake_page import FakePage
+    from utils.standin_server import AvitoStandIn, StandInConfig
+
+    monkeypatch.setenv("AVITO_BASE_URL", "http://avito.test")
+    standin = AvitoStandIn(StandInConfig(result_count=5))
+    query = SearchQuery(
+        "tv", region="moskva", price_max=60_000, sort=Sort.PRICE_DESC, delivery=True
+    )
+    page = FakePage("", routes={query.url(): standin.render_results("tv", 1, query)})
+
+    results = HomePage(page).search_filtered(query).wait_for_results()
+
+    assert [c.method for c in page.calls] == ["goto", "wait_for"]
+    assert results.active_filters() == query
+    prices = [c.price for c in results.iter_results(limit=5)]
+    assert prices == sorted(prices, reverse=True) and max(prices) <= 60_000
+
+
+def test_rendered_controls_win_over_the_url():
+    from pages.search_query import SearchQuery
+    from pages.search_results_page import SearchResultsPage
+    from utils.fake_page import FakePage
+    from utils.standin_server import AvitoStandIn
+
+    html = AvitoStandIn().render_results("tv", 1, SearchQuery(price_min=1_000))
+    page = FakePage(html, url="http://avito.test/all?q=tv&pmin=5000")
+
+    assert SearchResultsPage(page).active_filters() == SearchQuery(
+        "tv", price_min=1_000
+    )
+    assert page.round_trips == 1
+
+
+def test_post_ad_uploads_all_photos_in_one_call():
+    from pages.locators import PostAdLocators
+    from pages.post_ad_page import PostAdPage
+
+    page = Mock()
+    photos = [
+        {"name": f"{i}.jpg", "mimeType": "image/jpeg", "buffer": b"x"} for i in range(3)
+    ]
+
+    PostAdPage(page).upload_photos(photos)
+
+    page.locator.assert_any_call(PostAdLocators.PHOTO_INPUT)
+    file_input = page.locator.return_value
+    file_input.set_input_files.assert_called_once_with(photos)
+    file_input.nth.assert_called_once_with(2)
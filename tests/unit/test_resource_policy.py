@@ -0,0 +1,71 @@
+# tests/unit/test_resource_policy.py
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from utils.resource_policy import ResourceBlocker
+
+
+def test_full_policy_installs_no_route():
+    context = Mock()
+    ResourceBlocker("full").apply(context)
+    context.route.assert_not_called()
+
+
+def test_no_third_party_keeps_avito_hosts():
+    blocker = ResourceBlocker("no-third-party")
+    assert not blocker.should_block("https://www.avito.ru/all?q=iphone", "xhr")
+    assert not blocker.should_block("https://00.img.avito.st/image/1.jpg", "image")
+    assert blocker.should_block("https://mc.yandex.ru/watch/1", "script")
+
+
+def test_text_only_drops_heavy_first_party_assets():
+    blocker = ResourceBlocker("text-only")
+    assert blocker.should_block("https://00.img.avito.st/image/1.jpg", "image")
+    assert blocker.should_block("https://www.avito.ru/font.woff2", "font")
+    assert not blocker.should_block("https://www.avito.ru/s/app.css", "stylesheet")
+    assert not blocker.should_block("https://ads.example.com/", "document")
+
+
+def test_blocked_requests_are_counted():
+    blocker = ResourceBlocker("text-only")
+    route = Mock()
+    route.request.url = "https://00.img.avito.st/image/1.jpg"
+    route.request.resource_type = "image"
+
+    blocker._handle(route)
+
+    route.abort.assert_called_once()
+    assert blocker.stats.blocked == 1
+    assert blocker.stats.by_type["image"] == 1
+    assert blocker.stats.est_saved_bytes > 0
+
+
+def test_async_contexts_get_the_same_policy():
+    blocker = ResourceBlocker("text-only")
+    context = AsyncMock()
+    asyncio.run(blocker.apply_async(context))
+    handler = context.route.call_args.args[1]
+
+    route = AsyncMock()
+    route.request.url = "https://www.avito.ru/font.woff2"
+    route.request.resource_type = "font"
+    asyncio.run(handler(route))
+
+    route.abort.assert_awaited_once_with("blockedbyclient")
+    assert blocker.stats.by_type["font"] == 1
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        ResourceBlocker("images-only")
+
+
+def test_resources_marker_needs_one_known_policy():
+    from plugins.resource_blocking import marker_policy
+
+    assert marker_policy(pytest.mark.resources("text-only").mark) == "text-only"
+    for bad in (pytest.mark.resources, pytest.mark.resources("images-off")):
+        with pytest.raises(pytest.UsageError, match="takes one policy name"):
+            marker_policy(bad.mark)
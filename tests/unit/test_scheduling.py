@@ -0,0 +1,241 @@
+# tests/unit/test_scheduling.py
+import json
+import textwrap
+from collections import deque
+from unittest.mock import Mock
+
+import pytest
+
+from plugins.scheduling import PREFETCH, ProfileAffinityScheduling
+from utils.scheduling import (
+    discover_profiles,
+    estimate_durations,
+    load_durations,
+    plan,
+    update_durations,
+)
+
+
+def test_profiles_from_markers_and_literal_factory_calls(tmp_path):
+    (tmp_path / "test_x.py").write_text(
+        textwrap.dedent(
+            """
+            import pytest
+
+            def test_default(login_factory):
+                login_factory()
+
+            def test_buyer(login_factory):
+                page = login_factory("Buyer")
+
+            @pytest.mark.profile("seller")
+            def test_marked(login_factory):
+                login_factory(name)
+
+            def test_dynamic(login_factory):
+                login_factory(name)
+
+            @pytest.mark.profile("admin")
+            class TestAdmin:
+                async def test_inherits(self, async_login_factory):
+                    await async_login_factory(profile="other")
+            """
+        ),
+        "utf-8",
+    )
+    ids = [
+        f"test_x.py::{name}"
+        for name in (
+            "test_default",
+            "test_buyer[1-2]",
+            "test_marked",
+            "test_dynamic",
+            "TestAdmin::test_inherits",
+        )
+    ]
+    ids.append("missing.py::test_gone")
+
+    profiles = discover_profiles(ids, tmp_path)
+
+    assert list(profiles.values()) == [
+        "profile1",
+        "buyer",
+        "seller",
+        None,
+        "admin",
+        None,
+    ]
+
+
+def test_module_pytestmark(tmp_path):
+    (tmp_path / "test_m.py").write_text(
+        "import pytest\npytestmark = [pytest.mark.profile('buyer')]\n"
+        "def test_a(login_factory):\n    login_factory('profile1')\n",
+        "utf-8",
+    )
+    assert discover_profiles(["test_m.py::test_a"], tmp_path) == {
+        "test_m.py::test_a": "buyer"
+    }
+
+
+def test_durations_are_smoothed_and_unknown_tests_get_the_median(tmp_path):
+    path = tmp_path / "durations.json"
+    update_durations(path, {"a": 4.0, "b": 1.0})
+    update_durations(path, {"a": 2.0, "c": 3.0})
+
+    history = load_durations(path)
+
+    assert history == {"a": 3.0, "b": 1.0, "c": 3.0}
+    assert estimate_durations(["a", "new"], history) == [3.0, 3.0]
+    assert estimate_durations(["x"], {}) == [1.0]
+    assert load_durations(tmp_path / "missing.json") == {}
+
+
+def test_profiles_stay_together_and_longest_tests_start_first():
+    durations = [1.0, 3.0, 1.0, 1.0, 2.0, 2.0, 2.0]
+    profiles = ["a", "a", "a", "b", "b", None, None]
+
+    queues = plan(durations, profiles, workers=2)
+
+    placed = sorted(i for q in queues for i in q)
+    assert placed == list(range(7))
+    by_worker = [{profiles[i] for i in q} - {None} for q in queues]
+    assert sum(1 for s in by_worker if "a" in s) == 1
+    assert sum(1 for s in by_worker if "b" in s) == 1
+    a_queue = next(q for q in queues if 1 in q)
+    assert a_queue[0] == 1  # the 3s test leads its worker
+
+
+def test_an_oversized_profile_is_split_into_balanced_shards():
+    durations = [1.0] * 8
+    queues = plan(durations, ["a"] * 8, workers=2)
+
+    assert sorted(len(q) for q in queues) == [4, 4]
+
+
+def test_more_workers_than_tests():
+    assert sorted(map(len, plan([1.0], ["a"], workers=3))) == [0, 0, 1]
+
+
+# -------- ProfileAffinityScheduling, driven by fake xdist nodes --------
+
+
+class FakeNode:
+    def __init__(self, name: str) -> None:
+        self.gateway = Mock(id=name)
+        self.shutting_down = False
+        self.sent: list[int] = []
+
+    def send_runtest_some(self, indices: list[int]) -> None:
+        self.sent.extend(indices)
+
+    def shutdown(self) -> None:
+        self.shutting_down = True
+
+
+@pytest.fixture
+def make_scheduler(tmp_path):
+    def _make(nodeids, durations=None, workers=2):
+        durations_file = tmp_path / "durations.json"
+        durations_file.write_text(json.dumps(durations or {}), "utf-8")
+        config = Mock(rootpath=tmp_path)
+        config.getvalue.return_value = [f"{workers}*popen"]
+        config.getoption.side_effect = {
+            "maxschedchunk": None,
+            "--durations-file": durations_file,
+        }.get
+        sched = ProfileAffinityScheduling(config, log=Mock())
+        nodes = [FakeNode(f"gw{i}") for i in range(workers)]
+        for node in nodes:
+            sched.add_node(node)
+            sched.add_node_collection(node, nodeids)
+        return sched, nodes
+
+    return _make
+
+
+def _ids(count):
+    return [f"test_x.py::test_{i}" for i in range(count)]
+
+
+def test_each_worker_gets_a_prefetch_batch_and_the_rest_stays_queued(
+    make_scheduler,
+):
+    sched, nodes = make_scheduler(_ids(8))
+    sched.schedule()
+
+    assert [len(node.sent) for node in nodes] == [PREFETCH, PREFETCH]
+    queued = [i for node in nodes for i in sched.node2queue[node]]
+    assert sorted(queued + nodes[0].sent + nodes[1].sent) == list(range(8))
+    assert sorted(sched.pending) == sorted(queued)
+
+
+def test_an_idle_worker_steals_the_shortest_tail_of_the_busiest_queue(
+    make_scheduler,
+):
+    ids = _ids(6)
+    sched, (idle, busy) = make_scheduler(ids)
+    sched.collection = ids
+    sched.durations = [5.0, 4.0, 3.0, 2.0, 1.0, 1.0]
+    sched.node2queue[busy] = deque([0, 1, 2, 3, 4, 5])
+
+    sched.check_schedule(idle)
+
+    # Half of the busy queue's 16s, taken from the tail in running order
+    assert idle.sent == [2, 3]
+    assert list(sched.node2queue[idle]) == [4, 5]
+    assert list(sched.node2queue[busy]) == [0, 1]
+    assert not idle.shutting_down
+
+
+def test_a_victims_last_test_is_not_stolen(make_scheduler):
+    ids = _ids(1)
+    sched, (idle, busy) = make_scheduler(ids)
+    sched.collection = ids
+    sched.durations = [3.0]
+    sched.node2queue[busy] = deque([0])
+
+    sched.check_schedule(idle)
+
+    assert idle.sent == []
+    assert idle.shutting_down
+    assert list(sched.node2queue[busy]) == [0]
+
+
+def test_a_crashed_workers_tests_are_requeued_and_the_running_one_reported(
+    make_scheduler,
+):
+    ids = _ids(6)
+    sched, (crashed, survivor) = make_scheduler(ids)
+    sched.collection = ids
+    sched.durations = [1.0] * 6
+    sched.node2pending[crashed] = [0, 1]
+    sched.node2queue[crashed] = deque([2, 3])
+    sched.node2pending[survivor] = [4, 5]
+
+    crashitem = sched.remove_node(crashed)
+
+    assert crashitem == ids[0]
+    assert crashed not in sched.node2queue
+    assert list(sched.node2queue[survivor]) == [1, 2, 3]
+    assert sorted(sched.pending) == [1, 2, 3]
+    assert survivor.sent == []  # still holds PREFETCH tests
+
+
+def test_a_drained_worker_shuts_down_and_is_skipped_for_pending_tests(
+    make_scheduler,
+):
+    ids = _ids(3)
+    sched, (done, working) = make_scheduler(ids)
+    sched.collection = ids
+    sched.durations = [1.0] * 3
+    sched.node2pending[working] = [0, 1]
+
+    sched.check_schedule(done)
+    assert done.shutting_down
+
+    sched.mark_test_pending(ids[2])
+
+    assert list(sched.node2queue[working]) == [2]
+    assert list(sched.node2queue[done]) == []
+    assert done.sent == []
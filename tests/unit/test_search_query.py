@@ -0,0 +1,73 @@
+# tests/unit/test_search_query.py
+import pytest
+
+from pages.search_query import SearchQuery, Sort, parse_amount
+
+
+def test_defaults_are_left_out_of_the_url():
+    assert SearchQuery("iphone").url("https://www.avito.ru") == (
+        "https://www.avito.ru/all?q=iphone"
+    )
+    assert SearchQuery().url("https://www.avito.ru") == "https://www.avito.ru/all"
+
+
+def test_every_filter_is_encoded():
+    query = SearchQuery(
+        "iphone 15",
+        category="telefony",
+        region="moskva",
+        price_min=10_000,
+        price_max=50_000,
+        sort=Sort.PRICE_ASC,
+        delivery=True,
+    )
+    assert query.url("https://www.avito.ru") == (
+        "https://www.avito.ru/moskva/telefony"
+        "?q=iphone+15&pmin=10000&pmax=50000&s=1&d=1"
+    )
+
+
+def test_url_round_trips_and_ignores_unknown_params():
+    query = SearchQuery("tv", region="sankt-peterburg", price_max=9000, sort=Sort.DATE)
+    assert SearchQuery.from_url(query.url("https://x") + "&p=3&utm_source=y") == query
+    assert SearchQuery.from_url("https://x/all?s=999").sort is Sort.DEFAULT
+
+
+def test_base_url_is_read_at_call_time(monkeypatch):
+    monkeypatch.setenv("AVITO_BASE_URL", "http://127.0.0.1:8080/")
+    assert SearchQuery("x").url() == "http://127.0.0.1:8080/all?q=x"
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"price_min": 5, "price_max": 1},
+        {"price_min": -1},
+        {"region": "Москва"},
+        {"category": "telefony/../x"},
+    ],
+)
+def test_invalid_filters_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        SearchQuery("x", **kwargs)
+
+
+def test_amounts_are_parsed_from_formatted_input():
+    assert parse_amount("15 000 ₽") == 15_000
+    assert parse_amount("") is None
+    assert parse_amount(None) is None
+
+
+def test_urls_are_parsed_leniently():
+    query = SearchQuery.from_url("https://x/Москва/telefony.old?pmin=9000&pmax=10")
+    assert (query.region, query.category) == ("Москва", "telefony.old")
+    assert (query.price_min, query.price_max) == (9000, 10)
+
+
+def test_updated_validates_only_the_changes():
+    query = SearchQuery.from_url("https://x/Москва?q=tv")
+    assert query.updated(price_max=5000).price_max == 5000
+    with pytest.raises(ValueError):
+        query.updated(category="a/b")
+    with pytest.raises(TypeError):
+        query.updated(colour="red")
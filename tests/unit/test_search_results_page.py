@@ -0,0 +1,109 @@
+# tests/unit/test_search_results_page.py
+import asyncio
+from itertools import islice
+from unittest.mock import AsyncMock, Mock
+
+from pages.aio.search_results_page import SearchResultsPage as AsyncResultsPage
+from pages.search_query import SearchQuery, Sort
+from pages.search_results_page import SearchResultsPage
+
+
+def _chunk(cards, next_href=None, total=None):
+    return {"cards": cards, "next": next_href, "total": total or len(cards)}
+
+
+def _card(n):
+    return {
+        "title": f"Ad {n}",
+        "price": f"{n} 000 ₽",
+        "href": f"https://www.avito.ru/moskva/telefony/ad_{n}",
+        "itemId": None,
+    }
+
+
+def test_first_results_cost_one_round_trip():
+    page = Mock()
+    page.evaluate.return_value = _chunk([_card(1), _card(2), _card(3)])
+
+    cards = list(islice(SearchResultsPage(page).iter_results(limit=3), 3))
+
+    assert [c.title for c in cards] == ["Ad 1", "Ad 2", "Ad 3"]
+    assert cards[0].item_id == "1"
+    assert (cards[1].price, cards[1].currency) == (2000, "RUB")
+    page.evaluate.assert_called_once()
+    assert page.evaluate.call_args.args[1]["limit"] == 3
+    page.goto.assert_not_called()
+
+
+def test_next_page_is_followed_only_when_consumer_needs_it():
+    page = Mock()
+    page.evaluate.side_effect = [
+        _chunk([_card(1)]),
+        _chunk([], next_href="https://www.avito.ru/all?q=x&p=2", total=1),
+        _chunk([_card(2)]),
+    ]
+
+    cards = list(SearchResultsPage(page).iter_results(limit=2))
+
+    assert [c.title for c in cards] == ["Ad 1", "Ad 2"]
+    page.goto.assert_called_once_with(
+        "https://www.avito.ru/all?q=x&p=2", wait_until="domcontentloaded"
+    )
+
+
+def test_iteration_stops_at_max_pages():
+    page = Mock()
+    page.evaluate.side_effect = [
+        _chunk([_card(1)]),
+        _chunk([], next_href="https://www.avito.ru/all?q=x&p=2", total=1),
+    ]
+
+    cards = list(SearchResultsPage(page).iter_results(max_pages=1))
+
+    assert len(cards) == 1
+    page.goto.assert_not_called()
+
+
+def _async_page():
+    page = AsyncMock()
+    page.locator = Mock()
+    page.locator.return_value.first.wait_for = AsyncMock()
+    return page
+
+
+def test_async_twin_pages_the_same_way():
+    page = _async_page()
+    page.evaluate.side_effect = [
+        _chunk([_card(1)]),
+        _chunk([], next_href="https://www.avito.ru/all?q=x&p=2", total=1),
+        _chunk([_card(2)]),
+    ]
+
+    async def _collect():
+        return [c async for c in AsyncResultsPage(page).iter_results(limit=2)]
+
+    cards = asyncio.run(_collect())
+
+    assert [c.title for c in cards] == ["Ad 1", "Ad 2"]
+    page.goto.assert_awaited_once_with(
+        "https://www.avito.ru/all?q=x&p=2", wait_until="domcontentloaded"
+    )
+
+
+def test_async_refine_reopens_with_changed_filters():
+    page = _async_page()
+    page.evaluate.return_value = {
+        "url": "https://www.avito.ru/moskva?q=tv&s=2",
+        "query": None,
+        "priceFrom": "1 000",
+        "priceTo": None,
+        "sort": None,
+        "delivery": None,
+    }
+
+    asyncio.run(AsyncResultsPage(page).refine(price_max=5_000))
+
+    expected = SearchQuery(
+        "tv", region="moskva", price_min=1_000, price_max=5_000, sort=Sort.PRICE_DESC
+    )
+    page.goto.assert_awaited_once_with(expected.url(), wait_until="domcontentloaded")
@@ -0,0 +1,149 @@
+# tests/unit/test_standin_server.py
+import re
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+from utils.standin_server import AvitoStandIn, StandInConfig
+
+
+@pytest.fixture
+def standin():
+    server = AvitoStandIn(StandInConfig(result_count=3)).start()
+    yield server
+    server.stop()
+
+
+def _get(url, cookie=None):
+    request = urllib.request.Request(url, headers={"Cookie": cookie} if cookie else {})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.geturl(), response.read().decode("utf-8")
+
+
+def test_home_and_results_expose_pom_markers(standin):
+    _, home = _get(standin.base_url)
+    assert "data-marker='search-form/suggest/input'" in home
+
+    _, results = _get(f"{standin.base_url}/all?q=iphone")
+    assert results.count("data-marker='item-title'") == 3
+    assert "iphone — объявление 1" in results
+
+
+def test_item_page_has_title_price_and_address(standin):
+    _, item = _get(f"{standin.base_url}/moskva/telefony/iphone_1000001")
+    assert "data-marker='item-view/title-info'" in item
+    assert "class='js-item-view-title-info'" in item
+    assert "data-marker='item-view/item-price'" in item
+    assert "itemprop='address'" in item
+
+
+def test_profile_requires_session_cookie(standin):
+    url, _ = _get(f"{standin.base_url}/profile")
+    assert url.endswith("/profile/login")
+
+    url, body = _get(f"{standin.base_url}/profile", cookie="sessid=standin")
+    assert url.endswith("/profile")
+    assert "Мой профиль" in body
+
+
+def test_latency_and_failures_are_injected():
+    config = StandInConfig(latency={"home": 0.2}, failure_rate={"search": 1.0})
+    server = AvitoStandIn(config).start()
+    try:
+        started = time.perf_counter()
+        _get(server.base_url)
+        assert time.perf_counter() - started >= 0.2
+
+        with pytest.raises(urllib.error.HTTPError) as err:
+            _get(f"{server.base_url}/all?q=x")
+        assert err.value.code == 503
+        assert server.failures["search"] == 1
+    finally:
+        server.stop()
+
+
+def test_results_paginate_until_last_page(standin):
+    _, first = _get(f"{standin.base_url}/all?q=iphone")
+    assert "pagination-button/nextPage" in first
+
+    _, last = _get(f"{standin.base_url}/all?q=iphone&p={standin.config.page_count}")
+    assert "pagination-button/nextPage" not in last
+    assert "объявление 9" in last  # page 3 of 3 results each: items 7..9
+
+
+@pytest.mark.parametrize("p", ["abc", "0", "-2", ""])
+def test_unusable_page_number_falls_back_to_page_one(standin, p):
+    _, page = _get(f"{standin.base_url}/all?q=iphone&p={p}")
+    assert "объявление 1" in page
+
+
+def test_results_apply_price_delivery_and_sort_filters(standin):
+    _, body = _get(f"{standin.base_url}/moskva/telefony?q=tv&pmax=100000&s=2&d=1")
+    prices = [int(p) for p in re.findall(r"itemprop='price' content='(\d+)'", body)]
+    assert len(prices) == 3  # 4 cheap enough with delivery, 3 per page
+    assert prices == sorted(prices, reverse=True) and max(prices) <= 100_000
+    assert "href='/moskva/telefony/" in body
+    assert "data-marker='price/to' value='100 000'" in body
+    assert "<option value='2' selected>" in body
+    assert "data-marker='delivery-filter/checkbox' checked" in body
+
+
+def test_odd_listing_urls_are_served_not_rejected(standin):
+    _, body = _get(f"{standin.base_url}/Moskva/telefony?q=tv&pmin=9000&pmax=10")
+    assert "data-marker='price/from' value='9 000'" in body
+
+
+def test_next_page_link_keeps_the_filters():
+    server = AvitoStandIn(StandInConfig(result_count=2, page_count=3)).start()
+    try:
+        _, body = _get(f"{server.base_url}/all?q=tv&s=104")
+    finally:
+        server.stop()
+    assert "href='?q=tv&amp;s=104&amp;p=2'" in body
+    assert "tv — объявление 6" in body  # newest first
+
+
+def test_post_ad_form_accepts_multipart_photos(standin):
+    _, form = _get(f"{standin.base_url}/additem", cookie="sessid=standin")
+    assert "data-marker='post-ad/photos'" in form
+
+    boundary = "standin-boundary"
+    parts = [
+        (b'name="title"', b"text/plain", "Велосипед".encode()),
+        (b'name="price"', b"text/plain", "15 000".encode()),
+        (b'name="photos"; filename="a.jpg"', b"image/jpeg", b"\xff\xd8jpeg"),
+        (b'name="photos"; filename="b.png"', b"image/png", b"\x89PNGdata!"),
+    ]
+    body = (
+        b"".join(
+            b"--"
+            + boundary.encode()
+            + b"\r\nContent-Disposition: form-data; "
+            + disposition
+            + b"\r\nContent-Type: "
+            + ctype
+            + b"\r\n\r\n"
+            + data
+            + b"\r\n"
+            for disposition, ctype, data in parts
+        )
+        + f"--{boundary}--\r\n".encode()
+    )
+    request = urllib.request.Request(
+        f"{standin.base_url}/additem",
+        data=body,
+        headers={
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+            "Cookie": "sessid=standin",
+        },
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        page = response.read().decode("utf-8")
+
+    assert "data-marker='post-ad/success'" in page
+    (ad,) = standin.posted
+    assert (ad.title, ad.price) == ("Велосипед", 15_000)
+    assert ad.photos == (("a.jpg", "image/jpeg", 6), ("b.png", "image/png", 9))
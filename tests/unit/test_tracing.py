@@ -0,0 +1,114 @@
+# tests/unit/test_tracing.py
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from playwright.sync_api import Error as PWError
+
+from utils.tracing import TracePolicy, TraceSession
+
+
+def test_policy_parsing():
+    assert TracePolicy("On-Failure").mode == "on-failure"
+    assert TracePolicy("sampled:12.5%").percent == 12.5
+    for bad in ("sometimes", "sampled:x", "sampled:150"):
+        with pytest.raises(ValueError):
+            TracePolicy(bad)
+
+
+def test_sampling_is_stable_and_roughly_proportional():
+    policy = TracePolicy("sampled:20")
+    keys = [f"tests/smoke/test_x.py::test_{i}" for i in range(2000)]
+    modes = [policy.mode_for(k) for k in keys]
+
+    assert modes == [policy.mode_for(k) for k in keys]
+    assert set(modes) == {"always", "off"}
+    assert 300 < modes.count("always") < 500
+    assert TracePolicy("sampled:0").mode_for(keys[0]) == "off"
+    assert TracePolicy("sampled:100").mode_for(keys[0]) == "always"
+
+
+def test_tracing_marker_needs_one_valid_policy():
+    from plugins.tracing import marker_policy
+
+    assert marker_policy(pytest.mark.tracing("always").mark).mode == "always"
+    for bad in (pytest.mark.tracing, pytest.mark.tracing("sometimes")):
+        with pytest.raises(pytest.UsageError, match="mark.tracing"):
+            marker_policy(bad.mark)
+
+
+def test_stamp_names_the_file_but_not_the_sample(tmp_path):
+    policy = TracePolicy("sampled:50")
+    first = TraceSession(policy, "profile1", tmp_path, stamp="1700000000")
+    later = TraceSession(policy, "profile1", tmp_path, stamp="1700000600")
+
+    assert first.mode == later.mode == policy.mode_for("profile1")
+    assert first._next_path().name == "trace_profile1_1700000000.zip"
+
+
+def test_on_failure_discards_passing_chunks_without_screenshots(tmp_path):
+    ctx = Mock()
+    session = TraceSession(TracePolicy("on-failure"), "test_ok", tmp_path)
+    session.attach(ctx)
+
+    assert session.detach(ctx) is None
+    ctx.tracing.start.assert_called_once_with(
+        screenshots=False, snapshots=True, sources=False
+    )
+    ctx.tracing.stop_chunk.assert_called_once_with(path=None)
+
+
+def test_pooled_context_is_started_once_and_chunked_per_test(tmp_path):
+    ctx = Mock()
+    for name in ("tests/a.py::test_one", "tests/a.py::test_two"):
+        session = TraceSession(TracePolicy("on-failure"), name, tmp_path)
+        session.attach(ctx)
+        session.failed = name.endswith("two")
+        saved = session.finish()
+
+    ctx.tracing.start.assert_called_once()
+    assert ctx.tracing.start_chunk.call_count == 2
+    assert saved == [tmp_path / "trace_tests_a.py_test_two.zip"]
+    assert ctx.tracing.stop_chunk.call_args.kwargs["path"] == saved[0]
+
+
+def test_always_restarts_a_lightly_traced_context_with_screenshots(tmp_path):
+    ctx = Mock()
+    TraceSession(TracePolicy("on-failure"), "t1", tmp_path).attach(ctx)
+    session = TraceSession(TracePolicy("always"), "t2", tmp_path)
+    session.attach(ctx)
+
+    ctx.tracing.stop.assert_called_once_with()
+    ctx.tracing.start.assert_called_with(screenshots=True, snapshots=True, sources=True)
+    assert session.finish() == [tmp_path / "trace_t2.zip"]
+
+
+def test_off_never_touches_the_context(tmp_path):
+    ctx = Mock()
+    session = TraceSession(TracePolicy("off"), "t", tmp_path)
+    session.attach(ctx)
+
+    assert session.finish() == []
+    ctx.tracing.start.assert_not_called()
+
+
+def test_closed_context_is_skipped(tmp_path):
+    ctx = Mock()
+    ctx.tracing.stop_chunk.side_effect = PWError("Target closed")
+    session = TraceSession(TracePolicy("always"), "t", tmp_path)
+    session.attach(ctx)
+
+    assert session.finish() == []
+
+
+def test_async_failure_keeps_the_trace(tmp_path):
+    ctx = AsyncMock()
+    session = TraceSession(TracePolicy("on-failure"), "t", tmp_path)
+
+    async def run():
+        await session.attach_async(ctx)
+        session.failed = True
+        return await session.detach_async(ctx)
+
+    assert asyncio.run(run()) == tmp_path / "trace_t.zip"
+    ctx.tracing.start_chunk.assert_awaited_once_with(title="t")
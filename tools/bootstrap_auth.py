@@ -2,9 +2,11 @@
 # ruff: noqa: E402
 import os
 import sys
+import json
 import time
 import argparse
 from pathlib import Path
+from urllib.parse import urlsplit
 
 # --- Early path setup (required for local imports) ---
 ROOT = Path(__file__).resolve().parents[1]
@@ -15,25 +17,40 @@ sys.path.append(str(ROOT / "tools"))
 from dotenv import load_dotenv, find_dotenv
 from playwright.sync_api import (
     sync_playwright,
+    Browser,
     Page,
     Playwright,
+    StorageState,
     TimeoutError as PWTimeout,
 )
 from check_state import check as check_state_validity
+from pages.base_page import base_url
 from pages.login_page import LoginPage
+from utils.artifacts import save_failure
+from utils.auth_cache import clear_validation, record_validation
+from utils.login_probe import is_logged_in
+from utils.auth_state import (
+    FIRST_PARTY_DOMAINS,
+    compact_state,
+    load_state,
+    remove_compact,
+    write_compact,
+)
+from utils.resource_policy import ResourceBlocker
 
 # --- Setup -------------------------------------------------------------------
 load_dotenv(find_dotenv())
 
-AUTH_DIR = ROOT / ".auth"
+AUTH_DIR = Path(os.getenv("AVITO_AUTH_DIR", ROOT / ".auth"))
 AUTH_DIR.mkdir(exist_ok=True)
 
-ART_DIR = ROOT / "artifacts"
-ART_DIR.mkdir(exist_ok=True)
-
 BASE_URL = os.getenv("AVITO_BASE_URL", "https://www.avito.ru  ")
 HEADLESS = bool(int(os.getenv("AVITO_HEADLESS", "0")))
 
+# Tried smallest first; the first level that still reaches /profile logged in wins
+COMPACT_LEVELS = ("auth-cookies", "first-party")
+COMPACT_TIMING_ROUNDS = 5
+
 
 # --- Helpers -----------------------------------------------------------------
 def get_last_profile(default="profile1") -> str:
@@ -59,35 +76,76 @@ def resolve_creds(profile: str):
     return user, pwd
 
 
-def is_logged_in(page: Page) -> bool:
-    """Heuristically checks if the page session is authenticated."""
-    url = page.url.lower()
-    if "profile/login" in url:
-        return False
-    if (
-        page.locator("input[name='login']").count()
-        or page.locator("input[type='password']").count()
-    ):
-        return False
-    if page.locator("text=Мой профиль").count():
-        return True
-    return "profile" in url and "login" not in url
-
-
 def save_artifacts(page: Page, profile: str, reason: str):
-    """Save screenshot + HTML for debugging bootstrap failures."""
-    ts = int(time.time())
-    base = f"bootstrap_{profile}_{reason}_{ts}"
+    """Save screenshot + HTML for debugging bootstrap failures (written in the background)."""
     try:
-        png = ART_DIR / f"{base}.png"
-        html = ART_DIR / f"{base}.html"
-        page.screenshot(path=str(png), full_page=True)
-        html.write_text(page.content(), encoding="utf-8")
-        print(f"[bootstrap] Saved artifacts: {png.name}, {html.name}")
+        captured = save_failure(page, f"bootstrap {profile} {reason}", full_page=True)
+        print(f"[bootstrap] Saving artifacts: {', '.join(captured.names)}")
     except Exception as e:
         print(f"[bootstrap] Could not save artifacts: {e}")
 
 
+# --- Compaction --------------------------------------------------------------
+def _state_logs_in(browser: Browser, state: StorageState) -> bool:
+    """Open /profile with `state` and report whether the session is accepted."""
+    ctx = browser.new_context(storage_state=state)
+    ResourceBlocker().apply(ctx)
+    try:
+        page = ctx.new_page()
+        page.goto(f"{base_url()}/profile", timeout=30_000)
+        return is_logged_in(page)
+    finally:
+        ctx.close()
+
+
+def _avg_context_ms(browser: Browser, storage_state, rounds: int) -> float:
+    """Average new_context() + close() time for a path or an in-memory dict."""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        browser.new_context(storage_state=storage_state).close()
+    return (time.perf_counter() - started) * 1000 / rounds
+
+
+def compact_saved_state(p: Playwright, profile: str, state_file: Path) -> bool:
+    """
+    Write a trimmed, gzipped copy of `state_file` that tests load from memory.
+    Each candidate is verified against /profile first; if none logs in, the
+    full state stays the only copy. Returns True if a compact copy was written.
+    """
+    full = json.loads(state_file.read_text(encoding="utf-8"))
+    domains = FIRST_PARTY_DOMAINS + (urlsplit(base_url()).hostname or "",)
+    browser = p.chromium.launch(headless=True)
+    try:
+        for level in COMPACT_LEVELS:
+            candidate = compact_state(full, level, domains)
+            if _state_logs_in(browser, candidate):
+                break
+            print(f"[bootstrap] Compact level '{level}' is not accepted by /profile.")
+        else:
+            remove_compact(state_file)
+            print("[bootstrap] Keeping the full state only; no compact level works.")
+            return False
+
+        compact = write_compact(state_file, candidate)
+        print(
+            f"[bootstrap] Compacted '{profile}' ({level}): "
+            f"{state_file.stat().st_size} B -> {compact.stat().st_size} B, "
+            f"{len(full.get('cookies') or [])} -> {len(candidate['cookies'])} cookies, "
+            f"{len(full.get('origins') or [])} -> {len(candidate['origins'])} origins"
+        )
+        full_ms = _avg_context_ms(browser, str(state_file), COMPACT_TIMING_ROUNDS)
+        compact_ms = _avg_context_ms(
+            browser, load_state(state_file), COMPACT_TIMING_ROUNDS
+        )
+        print(
+            f"[bootstrap] new_context(): {full_ms:.1f} ms from file -> "
+            f"{compact_ms:.1f} ms from memory (avg of {COMPACT_TIMING_ROUNDS})"
+        )
+        return True
+    finally:
+        browser.close()
+
+
 # --- Main Logic --------------------------------------------------------------
 def run_login_flow(p: Playwright, profile: str, state_file: Path):
     """Handles the browser interaction for logging in and saving state."""
@@ -96,6 +154,8 @@ def run_login_flow(p: Playwright, profile: str, state_file: Path):
         headless=HEADLESS, args=["--disable-blink-features=AutomationControlled"]
     )
     ctx = browser.new_context()
+    # AVITO_RESOURCE_POLICY; keep "full" (default) if a CAPTCHA image must be solved
+    ResourceBlocker().apply(ctx)
     page = ctx.new_page()
     page.set_default_timeout(20_000)
 
@@ -126,7 +186,6 @@ def run_login_flow(p: Playwright, profile: str, state_file: Path):
                     page.wait_for_load_state("networkidle", timeout=5_000)
                     # Always navigate to /profile to check state after pressing ENTER
                     page.goto(f"{BASE_URL}/profile", timeout=30_000)
-                    page.wait_for_load_state("networkidle", timeout=10_000)
                 except Exception:
                     pass
                 try:
@@ -153,7 +212,6 @@ def run_login_flow(p: Playwright, profile: str, state_file: Path):
             )
             try:
                 page.wait_for_url("**/profile/**", timeout=600_000)
-                page.wait_for_load_state("networkidle", timeout=15_000)
             except PWTimeout:
                 save_artifacts(page, profile, "timeout")
                 raise TimeoutError(
@@ -166,6 +224,8 @@ def run_login_flow(p: Playwright, profile: str, state_file: Path):
             raise RuntimeError("Login check failed. Refusing to save an invalid state.")
 
         ctx.storage_state(path=str(state_file))
+        # Just verified above: spare the tests and check_state another probe
+        record_validation(state_file, True)
         print(
             f"\n✅ Successfully saved state for profile '{profile}' to: {state_file}\n"
         )
@@ -174,7 +234,7 @@ def run_login_flow(p: Playwright, profile: str, state_file: Path):
         browser.close()
 
 
-def main(profile_arg: str | None, force: bool):
+def main(profile_arg: str | None, force: bool, compact: bool = False):
     """Main entrypoint for the bootstrap script."""
     profile = (profile_arg or get_last_profile()).lower().strip()
     (AUTH_DIR / ".last_profile").write_text(profile, encoding="utf-8")
@@ -187,15 +247,22 @@ def main(profile_arg: str | None, force: bool):
         if is_valid:
             print("[bootstrap] ✅ Existing state is valid. Nothing to do.")
             print("[bootstrap] (Use --force to re-authenticate anyway)")
+            if compact:
+                with sync_playwright() as p:
+                    compact_saved_state(p, profile, state_file)
             return
 
     # Cleanup: Delete any old, potentially invalid state file before creating a new one.
     if state_file.exists():
         print(f"[bootstrap] Deleting old/invalid state file: {state_file.name}")
         state_file.unlink()
+    clear_validation(state_file)
+    remove_compact(state_file)
 
     with sync_playwright() as p:
         run_login_flow(p, profile, state_file)
+        if compact:
+            compact_saved_state(p, profile, state_file)
 
 
 if __name__ == "__main__":
@@ -212,5 +279,10 @@ if __name__ == "__main__":
         action="store_true",
         help="Force re-authentication even if a valid state file exists.",
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Also write a trimmed, gzipped copy of the state (verified before use).",
+    )
     args = parser.parse_args()
-    main(args.profile, args.force)
+    main(args.profile, args.force, args.compact)
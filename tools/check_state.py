@@ -1,91 +1,105 @@
 # tools/check_state.py
+# ruff: noqa: E402
+from contextlib import redirect_stdout
 from pathlib import Path
 import argparse
+import asyncio
+import json
 import os
+import sys
 import time
+
+# --- Early path setup (required for local imports) ---
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
 from dotenv import load_dotenv, find_dotenv
+from playwright.async_api import (
+    async_playwright,
+    Browser as AsyncBrowser,
+    Page as AsyncPage,
+)
 from playwright.sync_api import sync_playwright, Page, Playwright
 from filelock import FileLock, Timeout
+from utils.artifacts import save_failure, save_failure_async
+from utils.auth_cache import read_validation, record_validation
+from utils.auth_state import inspect_state, load_state
+from utils.login_probe import is_logged_in, is_logged_in_async
+from utils.resource_policy import DEFAULT_POLICY, POLICIES, ResourceBlocker
+from utils.tracing import DEFAULT_TRACING, MODES, TracePolicy, TraceSession
 
 # --- Setup -------------------------------------------------------------------
-ROOT = Path(__file__).resolve().parents[1]
 load_dotenv(find_dotenv())
 
-AUTH_DIR = ROOT / ".auth"
-ART_DIR = ROOT / "artifacts"
-ART_DIR.mkdir(exist_ok=True)
-TRACE_DIR = ART_DIR / "traces"
-TRACE_DIR.mkdir(exist_ok=True)
+AUTH_DIR = Path(os.getenv("AVITO_AUTH_DIR", ROOT / ".auth"))
 
 BASE_URL = os.getenv("AVITO_BASE_URL", "https://www.avito.ru").strip()
 ENV_FORCE_HEADLESS = bool(int(os.getenv("AVITO_HEADLESS", "0")))
 
+# Exit code -> status name in the --all / --profiles JSON summary
+STATUS_BY_CODE = {0: "valid", 1: "invalid", 2: "missing", 3: "error"}
+LOCK_TIMEOUT = 60
 
-# --- Helpers -----------------------------------------------------------------
-def is_logged_in(page: Page) -> bool:
-    """
-    Robust, user-centric heuristic for Avito logged-in state.
-    Returns True if any known profile section is visible.
-    """
-    url = page.url.lower()
-    # Explicit logout/login indicators
-    if "profile/login" in url:
-        return False
-    if (
-        page.locator("input[name='login']").count()
-        or page.locator("input[type='password']").count()
-    ):
-        return False
-
-    # Positive signals: use stable data-marker attributes (not text!)
-    profile_indicators = [
-        '[data-marker="header/username-button"]',
-        '[data-marker="header/tooltip-list"]',
-        'a[href="/profile"]:has-text("Мои объявления")',
-    ]
-    for selector in profile_indicators:
-        try:
-            if page.locator(selector).is_visible():
-                return True
-        except Exception:
-            continue
 
-    # Fallback: URL contains /profile/ but not /login
-    return "/profile/" in url and "/profile/login" not in url
+# --- Helpers -----------------------------------------------------------------
+def save_artifacts(page: Page, profile: str, reason: str):
+    """Capture now; compressed and written in the background (utils.artifacts)."""
+    try:
+        captured = save_failure(page, f"state_check {profile} {reason}")
+        print(f"[state] ❌ Saving artifacts: {', '.join(captured.names)}")
+    except Exception as e:
+        print(f"[state] ❌ Could not capture screenshot/HTML artifacts: {e}")
 
 
-def save_artifacts(page: Page, profile: str, reason: str):
-    ts = int(time.time())
-    base_name = f"state_check_{profile}_{reason}_{ts}"
+async def save_artifacts_async(page: AsyncPage, profile: str, reason: str):
     try:
-        png_path = ART_DIR / f"{base_name}.png"
-        page.screenshot(path=str(png_path), full_page=True)
-        html_path = ART_DIR / f"{base_name}.html"
-        html_path.write_text(page.content(), encoding="utf-8")
-        print(f"[state] ❌ Saved artifacts: {png_path.name}, {html_path.name}")
+        captured = await save_failure_async(page, f"state_check {profile} {reason}")
+        print(f"[state] ❌ Saving artifacts: {', '.join(captured.names)}")
     except Exception as e:
-        print(f"[state] ❌ Could not save screenshot/HTML artifacts: {e}")
+        print(f"[state] ❌ Could not capture screenshot/HTML artifacts: {e}")
+
+
+def _finish_trace(trace: TraceSession) -> None:
+    """End the run's trace chunk; the policy decides whether it is kept."""
+    for path in trace.finish():
+        print(f"[state] Saved Playwright Trace: {path.name}")
 
 
 # --- Main Function -----------------------------------------------------------
-def check(profile: str, headed: bool) -> int:
+def check(
+    profile: str,
+    headed: bool,
+    use_cache: bool = True,
+    resource_policy: str = DEFAULT_POLICY,
+    tracing: str = DEFAULT_TRACING,
+) -> int:
     """
     (Process-safe) Checks the validity of a saved auth state.
     Returns exit code: 0=valid, 1=invalid, 2=missing, 3=timeout/lock_error.
+    Expired/just-saved states and a fresh validation record (shared with
+    conftest) are decided without launching a browser.
     """
     state_file = AUTH_DIR / f"{profile}.json"
-    if not state_file.exists():
-        print(f"[state] ❌ Missing state file for profile '{profile}': {state_file}")
-        return 2
+    decided = _precheck(profile, state_file, use_cache)
+    if decided is not None:
+        return decided
 
     lock_file = state_file.with_suffix(".json.lock")
     try:
-        with FileLock(str(lock_file), timeout=60):
+        with FileLock(str(lock_file), timeout=LOCK_TIMEOUT):
+            # Another process may have validated while we waited for the lock
+            if use_cache:
+                cached = _cached_result(profile, state_file)
+                if cached is not None:
+                    return cached
             with sync_playwright() as p:
-                return run_check_with_browser(p, profile, state_file, headed)
+                return run_check_with_browser(
+                    p, profile, state_file, headed, resource_policy, tracing
+                )
     except Timeout:
         print(
-            f"[state] ❌ Timeout: Could not acquire lock '{lock_file.name}' within 60s."
+            f"[state] ❌ Timeout: Could not acquire lock '{lock_file.name}' within {LOCK_TIMEOUT}s."
         )
         return 3
     except Exception as e:
@@ -93,60 +107,358 @@ def check(profile: str, headed: bool) -> int:
         return 3
 
 
+def check_offline(profile: str) -> int:
+    """Report remaining session lifetime without a browser; 1 if plainly dead."""
+    state_file = AUTH_DIR / f"{profile}.json"
+    if not state_file.exists():
+        print(f"[state] ❌ Missing state file for profile '{profile}': {state_file}")
+        return 2
+    report = inspect_state(profile, state_file)
+    print(f"[state] {report.describe()}")
+    return 1 if report.is_dead else 0
+
+
+def _precheck(profile: str, state_file: Path, use_cache: bool) -> int | None:
+    """Exit code if no browser is needed (missing/dead/fresh/cached), else None."""
+    if not state_file.exists():
+        print(f"[state] ❌ Missing state file for profile '{profile}': {state_file}")
+        return 2
+
+    report = inspect_state(profile, state_file)
+    print(f"[state] {report.describe()}")
+    if report.is_dead:
+        print(f"[state] ❌ Dead session for profile '{profile}': {state_file}")
+        return 1
+    if use_cache and report.status == "fresh":
+        print(f"[state] ✅ Valid state for profile '{profile}' (fresh): {state_file}")
+        return 0
+    if use_cache:
+        return _cached_result(profile, state_file)
+    return None
+
+
+def _cached_result(profile: str, state_file: Path) -> int | None:
+    """Exit code from the shared validation record, or None if it must be re-checked."""
+    cached = read_validation(state_file)
+    if cached is None:
+        return None
+    if cached:
+        print(f"[state] ✅ Valid state for profile '{profile}' (cached): {state_file}")
+        return 0
+    print(f"[state] ❌ Invalid state for profile '{profile}' (cached): {state_file}")
+    return 1
+
+
 def run_check_with_browser(
-    p: Playwright, profile: str, state_file: Path, headed: bool
+    p: Playwright,
+    profile: str,
+    state_file: Path,
+    headed: bool,
+    resource_policy: str = DEFAULT_POLICY,
+    tracing: str = DEFAULT_TRACING,
 ) -> int:
     """The core logic for browser interaction and validation."""
     # If env forces headless, obey it even if headed=True was passed.
     headless_launch = ENV_FORCE_HEADLESS or (not headed)
 
     browser = p.chromium.launch(headless=headless_launch)
-    context = browser.new_context(storage_state=str(state_file))
-    trace_path = TRACE_DIR / f"trace_{profile}_{int(time.time())}.zip"
-    context.tracing.start(screenshots=True, snapshots=True, sources=True)
+    context = browser.new_context(storage_state=load_state(state_file))
+    blocker = ResourceBlocker(resource_policy)
+    blocker.apply(context)
+    trace = TraceSession(TracePolicy(tracing), profile, stamp=str(int(time.time())))
+    trace.attach(context)
     page = context.new_page()
     page.set_default_timeout(20_000)
 
     try:
         page.goto(f"{BASE_URL}/profile")
-        # Increased timeout to handle Avito's slow redirects
-        page.wait_for_load_state("networkidle", timeout=15_000)
+        # Resolves on the first login/logout signal instead of network idle
+        logged_in = is_logged_in(page)
 
         # Debug: log final URL
         print(f"[state] Final URL after navigation: {page.url}")
 
-        if is_logged_in(page):
+        if logged_in:
             print(f"[state] ✅ Valid state for profile '{profile}': {state_file}")
-            context.tracing.stop()  # No need to save trace on success
+            _finish_trace(trace)
+            record_validation(state_file, True)
             return 0
         else:
-            context.tracing.stop(path=str(trace_path))
-            print(
-                f"[state] ❌ Invalid state. Saved Playwright Trace: {trace_path.name}"
-            )
+            trace.failed = True
+            _finish_trace(trace)
             save_artifacts(page, profile, "invalid")
+            record_validation(state_file, False)
             return 1
 
     except Exception as e:
         print(f"[state] ❌ Check failed with an exception: {e}")
-        context.tracing.stop(path=str(trace_path))
-        print(f"[state] ❌ Saved Playwright Trace due to error: {trace_path.name}")
+        trace.failed = True
+        _finish_trace(trace)
         save_artifacts(page, profile, "error")
         return 3
     finally:
+        if blocker.stats.blocked:
+            print(
+                f"[state] Blocked {blocker.stats.blocked} requests "
+                f"(policy '{blocker.policy}')"
+            )
         context.close()
         browser.close()
 
 
+# --- Batch Check (--all / --profiles) ----------------------------------------
+def discover_profiles() -> list[str]:
+    """Profiles with a saved state in AUTH_DIR (sidecar files are skipped)."""
+    return sorted(path.stem for path in AUTH_DIR.glob("*.json"))
+
+
+def check_all(
+    profiles: list[str],
+    headed: bool = False,
+    use_cache: bool = True,
+    resource_policy: str = DEFAULT_POLICY,
+    concurrency: int = 4,
+    offline: bool = False,
+    tracing: str = DEFAULT_TRACING,
+) -> int:
+    """
+    Check several profiles with at most one browser, probing up to
+    `concurrency` of them at once in separate contexts. Progress goes to
+    stderr; stdout gets a JSON summary. Returns the worst per-profile exit code.
+    """
+    started = time.perf_counter()
+    with redirect_stdout(sys.stderr):
+        results = asyncio.run(
+            _check_all_async(
+                profiles,
+                headed,
+                use_cache,
+                resource_policy,
+                concurrency,
+                offline,
+                tracing,
+            )
+        )
+    exit_code = max((r["exit_code"] for r in results), default=2)
+    summary = {
+        "exit_code": exit_code,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000),
+        "profiles": results,
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return exit_code
+
+
+def _result(profile: str, code: int, source: str, started: float) -> dict:
+    return {
+        "profile": profile,
+        "status": STATUS_BY_CODE[code],
+        "exit_code": code,
+        "source": source,  # "offline" (no browser needed) or "browser"
+        "latency_ms": round((time.perf_counter() - started) * 1000),
+    }
+
+
+async def _check_all_async(
+    profiles: list[str],
+    headed: bool,
+    use_cache: bool,
+    resource_policy: str,
+    concurrency: int,
+    offline: bool,
+    tracing: str = DEFAULT_TRACING,
+) -> list[dict]:
+    results: dict[str, dict] = {}
+    pending: list[str] = []
+    for profile in profiles:
+        started = time.perf_counter()
+        if offline:
+            code: int | None = check_offline(profile)
+        else:
+            code = _precheck(profile, AUTH_DIR / f"{profile}.json", use_cache)
+        if code is None:
+            pending.append(profile)
+        else:
+            results[profile] = _result(profile, code, "offline", started)
+
+    if pending:
+        # Everything else was decided from the files: launch the one browser lazily
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def _limited(browser: AsyncBrowser, profile: str) -> dict:
+            async with semaphore:
+                started = time.perf_counter()
+                code = await _probe_async(
+                    browser, profile, use_cache, resource_policy, tracing
+                )
+                return _result(profile, code, "browser", started)
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(
+                headless=ENV_FORCE_HEADLESS or (not headed)
+            )
+            try:
+                probed = await asyncio.gather(
+                    *(_limited(browser, profile) for profile in pending)
+                )
+            finally:
+                await browser.close()
+        results.update((r["profile"], r) for r in probed)
+    return [results[profile] for profile in profiles]
+
+
+async def _acquire(lock: FileLock, timeout: float) -> bool:
+    """Poll a FileLock without blocking the event loop."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            lock.acquire(timeout=0)
+            return True
+        except Timeout:
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.25)
+
+
+async def _probe_async(
+    browser: AsyncBrowser,
+    profile: str,
+    use_cache: bool,
+    resource_policy: str,
+    tracing: str = DEFAULT_TRACING,
+) -> int:
+    """`run_check_with_browser` in a context of the shared async browser."""
+    state_file = AUTH_DIR / f"{profile}.json"
+    lock = FileLock(str(state_file.with_suffix(".json.lock")))
+    if not await _acquire(lock, LOCK_TIMEOUT):
+        print(f"[state] ❌ Timeout: Could not acquire lock for profile '{profile}'.")
+        return 3
+    try:
+        # Another process may have validated while we waited for the lock
+        if use_cache:
+            cached = _cached_result(profile, state_file)
+            if cached is not None:
+                return cached
+        context = None
+        try:
+            context = await browser.new_context(storage_state=load_state(state_file))
+            blocker = ResourceBlocker(resource_policy)
+            await blocker.apply_async(context)
+            trace = TraceSession(
+                TracePolicy(tracing), profile, stamp=str(int(time.time()))
+            )
+            await trace.attach_async(context)
+            page = await context.new_page()
+            page.set_default_timeout(20_000)
+        except Exception as e:
+            # One unusable state must not abort the batch (and its JSON summary)
+            print(f"[state] ❌ Could not open a context for profile '{profile}': {e}")
+            if context is not None:
+                await context.close()
+            return 3
+        try:
+            await page.goto(f"{BASE_URL}/profile")
+            if await is_logged_in_async(page):
+                print(f"[state] ✅ Valid state for profile '{profile}': {state_file}")
+                record_validation(state_file, True)
+                return 0
+            trace.failed = True
+            print(f"[state] ❌ Invalid state for profile '{profile}': {page.url}")
+            await save_artifacts_async(page, profile, "invalid")
+            record_validation(state_file, False)
+            return 1
+        except Exception as e:
+            trace.failed = True
+            print(f"[state] ❌ Check of profile '{profile}' failed: {e}")
+            await save_artifacts_async(page, profile, "error")
+            return 3
+        finally:
+            saved = await trace.detach_async(context)
+            if saved is not None:
+                print(f"[state] Saved Playwright Trace: {saved.name}")
+            await context.close()
+    finally:
+        lock.release()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Validate a saved Avito auth state.")
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument(
         "--profile", default="profile1", help="The profile to check (e.g., 'profile1')."
     )
+    target.add_argument(
+        "--all",
+        action="store_true",
+        help="Check every profile saved in the auth dir; prints a JSON summary.",
+    )
+    target.add_argument(
+        "--profiles",
+        nargs="+",
+        metavar="PROFILE",
+        help="Check these profiles in one browser; prints a JSON summary.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Parallel browser contexts for --all / --profiles. Default: %(default)s",
+    )
     parser.add_argument(
         "--headed",
         action="store_true",
         help="Run the browser in headed mode to observe.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the validation record / freshness window and always open a browser.",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Only inspect the saved cookies (remaining lifetime); never open a browser.",
+    )
+    parser.add_argument(
+        "--resource-policy",
+        choices=POLICIES,
+        default=DEFAULT_POLICY,
+        help="Resource-blocking policy for the probe context. Default: %(default)s",
+    )
+    parser.add_argument(
+        "--trace-policy",
+        default=DEFAULT_TRACING,
+        help=f"Tracing policy for the probe: {' | '.join(MODES)} (AVITO_TRACING). "
+        "Default: %(default)s",
+    )
     args = parser.parse_args()
-    raise SystemExit(check(args.profile.lower().strip(), args.headed))
+    try:
+        TracePolicy(args.trace_policy)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.all or args.profiles:
+        raise SystemExit(
+            check_all(
+                discover_profiles()
+                if args.all
+                else [name.lower().strip() for name in args.profiles],
+                args.headed,
+                use_cache=not args.no_cache,
+                resource_policy=args.resource_policy,
+                concurrency=args.concurrency,
+                offline=args.offline,
+                tracing=args.trace_policy,
+            )
+        )
+    profile = args.profile.lower().strip()
+    if args.offline:
+        raise SystemExit(check_offline(profile))
+    raise SystemExit(
+        check(
+            profile,
+            args.headed,
+            use_cache=not args.no_cache,
+            resource_policy=args.resource_policy,
+            tracing=args.trace_policy,
+        )
+    )
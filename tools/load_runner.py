@@ -0,0 +1,533 @@
+# tools/load_runner.py
+# ruff: noqa: E402
+# Replays the search → open-ad journey with the async POMs at a target
+# concurrency (browsers × contexts × pages), ramping users up over time, and
+# reports throughput, per-step latency percentiles and error rates.
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, Optional, TextIO
+
+# --- Early path setup (required for local imports) ---
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from dotenv import load_dotenv, find_dotenv
+from playwright.async_api import (
+    async_playwright,
+    Browser as AsyncBrowser,
+    BrowserContext as AsyncBrowserContext,
+    Page as AsyncPage,
+)
+from playwright.sync_api import StorageState
+from pages.aio.ad_detail_page import AdDetailPage
+from pages.aio.home_page import HomePage
+from pages.base_page import base_url
+from utils.auth_state import load_state
+from utils.resource_policy import DEFAULT_POLICY, POLICIES, ResourceBlocker
+from utils.standin_server import AvitoStandIn, StandInConfig
+
+# --- Setup -------------------------------------------------------------------
+load_dotenv(find_dotenv())
+
+AUTH_DIR = Path(os.getenv("AVITO_AUTH_DIR", ROOT / ".auth"))
+ENV_FORCE_HEADLESS = bool(int(os.getenv("AVITO_HEADLESS", "0")))
+
+PERCENTILES = (50, 90, 95, 99)
+STEPS = ("home.navigate", "home.search", "ad.open")
+
+
+# --- Measurements ------------------------------------------------------------
+@dataclass(slots=True)
+class JourneyResult:
+    """One pass of the journey by one virtual user."""
+
+    user: int
+    started: float  # seconds since the run started
+    steps: dict[str, float] = field(default_factory=dict)  # step -> ms (passed steps)
+    failed_step: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def ms(self) -> float:
+        return sum(self.steps.values())
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as `name`; a failure is charged to this step."""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.failed_step, self.error = name, _short(e)
+            raise
+        self.steps[name] = (time.perf_counter() - started) * 1000
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "type": "journey",
+            "user": self.user,
+            "t": round(self.started, 3),
+            "ok": self.ok,
+            "ms": round(self.ms, 1),
+            "steps": {k: round(v, 1) for k, v in self.steps.items()},
+            "failed_step": self.failed_step,
+            "error": self.error,
+        }
+
+
+def percentile(values: list[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of `values` (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+
+@dataclass(slots=True)
+class Tally:
+    """Journeys and step latencies over a period (the whole run or one interval)."""
+
+    ok: int = 0
+    failed: int = 0
+    journey_ms: list[float] = field(default_factory=list)
+    step_ms: dict[str, list[float]] = field(default_factory=dict)
+    step_errors: Counter[str] = field(default_factory=Counter)
+    errors: Counter[str] = field(default_factory=Counter)
+
+    def add(self, result: JourneyResult) -> None:
+        for name, ms in result.steps.items():
+            self.step_ms.setdefault(name, []).append(ms)
+        if result.ok:
+            self.ok += 1
+            self.journey_ms.append(result.ms)
+            return
+        self.failed += 1
+        self.step_errors[result.failed_step or "?"] += 1
+        self.errors[result.error or "?"] += 1
+
+    def summary(self, seconds: float) -> dict[str, Any]:
+        total = self.ok + self.failed
+        names = [
+            *STEPS,
+            *sorted((set(self.step_ms) | set(self.step_errors)) - set(STEPS)),
+        ]
+        return {
+            "journeys": total,
+            "ok": self.ok,
+            "failed": self.failed,
+            "error_rate": round(self.failed / total, 4) if total else 0.0,
+            "journeys_per_min": round(self.ok / seconds * 60, 1)
+            if seconds > 0
+            else 0.0,
+            "journey": _latency(self.journey_ms),
+            "steps": {
+                name: {
+                    **_latency(self.step_ms.get(name, [])),
+                    "errors": self.step_errors[name],
+                }
+                for name in names
+                if name in self.step_ms or name in self.step_errors
+            },
+            "errors": dict(self.errors.most_common()),
+        }
+
+
+def _latency(values: list[float]) -> dict[str, Any]:
+    row: dict[str, Any] = {"count": len(values)}
+    for p in PERCENTILES:
+        value = percentile(values, p)
+        row[f"p{p}"] = None if value is None else round(value, 1)
+    row["max"] = round(max(values), 1) if values else None
+    return row
+
+
+def _short(error: BaseException) -> str:
+    """Error key for grouping: type plus the first line of the message."""
+    first = str(error).splitlines()[0][:120] if str(error) else ""
+    return f"{type(error).__name__}: {first}" if first else type(error).__name__
+
+
+def start_offsets(users: int, ramp: float, steps: int = 0) -> list[float]:
+    """
+    When each user starts, in seconds: spread evenly over `ramp` (the last
+    user starts at `ramp`), or in `steps` equal batches when steps > 0.
+    """
+    if users <= 1 or ramp <= 0:
+        return [0.0] * users
+    if steps > 0:
+        batches = min(steps, users)
+        return [
+            (i * batches // users) * ramp / max(batches - 1, 1) for i in range(users)
+        ]
+    return [i * ramp / (users - 1) for i in range(users)]
+
+
+# --- Load --------------------------------------------------------------------
+class LoadRun:
+    """
+    Runs users until `duration` seconds after the start: each opens its page at
+    its ramp offset and repeats the journey; a journey in flight at the end is
+    finished and counted. Results stream to `sink` (NDJSON) as they happen; the
+    interval left over at the end is reported before the summary.
+    """
+
+    def __init__(
+        self,
+        open_page: Callable[[int], Awaitable[Any]],
+        journey: Callable[[Any, JourneyResult], Awaitable[None]],
+        offsets: list[float],
+        duration: float,
+        report_every: float = 10.0,
+        sink: Optional[TextIO] = None,
+    ) -> None:
+        self.open_page = open_page
+        self.journey = journey
+        self.offsets = offsets
+        self.duration = duration
+        self.report_every = report_every
+        self.sink = sink
+        self.out = _progress_stream(sink)
+        self.total = Tally()
+        self.window = Tally()
+        self.active = 0
+        self._started = 0.0
+        self._window_started = 0.0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    async def run(self) -> dict[str, Any]:
+        self._started = time.perf_counter()
+        reporter = asyncio.create_task(self._report())
+        try:
+            await asyncio.gather(
+                *(self._user(user, offset) for user, offset in enumerate(self.offsets))
+            )
+        finally:
+            reporter.cancel()
+        if self.window.ok or self.window.failed:
+            self._close_window()
+        elapsed = self.elapsed()
+        summary = {
+            "type": "summary",
+            "t": round(elapsed, 3),
+            "users": len(self.offsets),
+            **self.total.summary(elapsed),
+        }
+        self._emit(summary)
+        return summary
+
+    async def _user(self, user: int, offset: float) -> None:
+        if offset >= self.duration:
+            return
+        await asyncio.sleep(offset)
+        try:
+            page = await self.open_page(user)
+        except Exception as e:
+            result = JourneyResult(user, self.elapsed(), failed_step="open_page")
+            result.error = _short(e)
+            self._record(result)
+            return
+        self.active += 1
+        try:
+            while self.elapsed() < self.duration:
+                result = JourneyResult(user, self.elapsed())
+                try:
+                    await self.journey(page, result)
+                except Exception as e:
+                    if result.ok:  # raised outside a step
+                        result.error = _short(e)
+                self._record(result)
+        finally:
+            self.active -= 1
+
+    def _record(self, result: JourneyResult) -> None:
+        self.total.add(result)
+        self.window.add(result)
+        self._emit(result.as_dict())
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_every)
+            self._close_window()
+
+    def _close_window(self) -> None:
+        now = self.elapsed()
+        window, self.window = self.window, Tally()
+        seconds, self._window_started = now - self._window_started, now
+        interval = {
+            "type": "interval",
+            "t": round(now, 3),
+            "active_users": self.active,
+            **window.summary(seconds),
+        }
+        self._emit(interval)
+        print(f"[load] {_progress(interval)}", file=self.out)
+
+    def _emit(self, row: dict[str, Any]) -> None:
+        if self.sink is not None:
+            self.sink.write(json.dumps(row, ensure_ascii=False) + "\n")
+            self.sink.flush()
+
+
+def _progress_stream(sink: Optional[TextIO]) -> TextIO:
+    """Where progress lines go: stderr when stdout carries the NDJSON stream."""
+    return sys.stderr if sink is sys.stdout else sys.stdout
+
+
+def _progress(row: dict[str, Any]) -> str:
+    p95 = {name: step["p95"] for name, step in row["steps"].items()}
+    return (
+        f"t={row['t']:.0f}s users={row.get('active_users', row.get('users'))} "
+        f"{row['journeys_per_min']} journeys/min, errors {row['error_rate']:.1%}, "
+        f"p95 ms {p95}"
+    )
+
+
+# --- Journey -----------------------------------------------------------------
+async def search_and_open(
+    page: AsyncPage, result: JourneyResult, query: str, timeout: float
+) -> None:
+    """Home → search → first result → ad details, with the async POMs."""
+    home = HomePage(page)
+    with result.step("home.navigate"):
+        await home.navigate()
+    with result.step("home.search"):
+        await home.search(query)
+        await home.wait_for_results(timeout=timeout)
+        hrefs = await home.get_visible_ad_hrefs(max_count=1)
+        if not hrefs:
+            raise LookupError(f"No results for '{query}'")
+    with result.step("ad.open"):
+        await page.goto(hrefs[0], wait_until="domcontentloaded")
+        await AdDetailPage(page).extract(timeout=timeout)
+
+
+async def run_load(
+    args: argparse.Namespace,
+    state: Optional[StorageState],
+    sink: Optional[TextIO] = None,
+) -> dict:
+    users = args.browsers * args.contexts * args.pages
+    blocker = ResourceBlocker(args.resource_policy)
+    async with async_playwright() as p:
+        browsers: list[AsyncBrowser] = []
+        contexts: list[AsyncBrowserContext] = []
+        try:
+            for _ in range(args.browsers):
+                browsers.append(
+                    await p.chromium.launch(
+                        headless=ENV_FORCE_HEADLESS or (not args.headed)
+                    )
+                )
+            # Round-robin, so the first users of the ramp land on different browsers
+            for _ in range(args.contexts):
+                for browser in browsers:
+                    context = await browser.new_context(storage_state=state)
+                    await blocker.apply_async(context)
+                    contexts.append(context)
+
+            async def open_page(user: int) -> AsyncPage:
+                page = await contexts[user % len(contexts)].new_page()
+                page.set_default_timeout(args.timeout)
+                return page
+
+            run = LoadRun(
+                open_page,
+                lambda page, result: search_and_open(
+                    page, result, args.query, args.timeout
+                ),
+                start_offsets(users, args.ramp, args.ramp_steps),
+                args.duration,
+                report_every=args.report_every,
+                sink=sink,
+            )
+            return await run.run()
+        finally:
+            for browser in browsers:
+                await browser.close()
+
+
+def _open_sink(path: Optional[str]) -> Optional[TextIO]:
+    if path is None:
+        return None
+    if path == "-":
+        return sys.stdout
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    return open(path, "w", encoding="utf-8")
+
+
+def main(args: argparse.Namespace) -> int:
+    """Exit code: 0 = done, 1 = error rate above --max-error-rate, 2 = missing state."""
+    sink = _open_sink(args.ndjson)
+    try:
+        return _run(args, sink)
+    finally:
+        if sink is not None and sink is not sys.stdout:
+            sink.close()
+
+
+def _run(args: argparse.Namespace, sink: Optional[TextIO]) -> int:
+    out = _progress_stream(sink)
+    standin = None
+    if args.standin:
+        standin = AvitoStandIn(StandInConfig()).start()
+        os.environ["AVITO_BASE_URL"] = standin.base_url
+    elif args.base_url:
+        os.environ["AVITO_BASE_URL"] = args.base_url
+    try:
+        state: Optional[StorageState] = None
+        if standin is not None and args.profile:
+            state = standin.storage_state(args.profile)
+        elif standin is None and args.profile:
+            state_file = AUTH_DIR / f"{args.profile}.json"
+            try:
+                state = load_state(state_file)
+            except FileNotFoundError:
+                print(
+                    f"[load] ❌ No saved state for profile '{args.profile}': {state_file}",
+                    file=out,
+                )
+                return 2
+        users = args.browsers * args.contexts * args.pages
+        print(
+            f"[load] {users} users ({args.browsers} browser(s) × {args.contexts} "
+            f"context(s) × {args.pages} page(s)) on {base_url()}, ramp {args.ramp:g}s, "
+            f"duration {args.duration:g}s",
+            file=out,
+        )
+        summary = asyncio.run(run_load(args, state, sink))
+    finally:
+        if standin is not None:
+            standin.stop()
+
+    print(f"[load] {_progress(summary)}", file=out)
+    for name, step in summary["steps"].items():
+        cells = ", ".join(f"p{p} {step[f'p{p}']}" for p in PERCENTILES)
+        print(
+            f"[load]   {name}: {step['count']} ok, {step['errors']} errors, {cells} ms",
+            file=out,
+        )
+    for error, count in summary["errors"].items():
+        print(f"[load]   ❌ {count}× {error}", file=out)
+    return 1 if summary["error_rate"] > args.max_error_rate else 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Replay the search → open-ad journey at a target concurrency."
+    )
+    topology = parser.add_argument_group(
+        "concurrency (users = browsers × contexts × pages)"
+    )
+    topology.add_argument(
+        "--browsers", type=int, default=1, help="Default: %(default)s"
+    )
+    topology.add_argument(
+        "--contexts",
+        type=int,
+        default=2,
+        help="Contexts per browser. Default: %(default)s",
+    )
+    topology.add_argument(
+        "--pages",
+        type=int,
+        default=2,
+        help="Pages (users) per context. Default: %(default)s",
+    )
+    schedule = parser.add_argument_group("schedule")
+    schedule.add_argument(
+        "--ramp",
+        type=float,
+        default=0.0,
+        help="Seconds over which users start (0 = all at once). Default: %(default)s",
+    )
+    schedule.add_argument(
+        "--ramp-steps",
+        type=int,
+        default=0,
+        help="Start users in this many equal batches over --ramp (0 = one by one).",
+    )
+    schedule.add_argument(
+        "--duration",
+        type=float,
+        default=60.0,
+        help="Seconds after the start at which users stop starting journeys. "
+        "Default: %(default)s",
+    )
+    target = parser.add_argument_group("target")
+    target.add_argument(
+        "--base-url", help="Point at this site instead of AVITO_BASE_URL."
+    )
+    target.add_argument(
+        "--standin",
+        action="store_true",
+        help="Start a local Avito stand-in and run against it (no .auth needed).",
+    )
+    target.add_argument(
+        "--profile",
+        default="profile1",
+        help="Saved auth state to load into every context ('' = logged out). "
+        "Default: %(default)s",
+    )
+    target.add_argument("--query", default="iphone", help="Default: %(default)s")
+    target.add_argument(
+        "--timeout",
+        type=float,
+        default=15_000,
+        help="Per-step timeout in ms. Default: %(default)s",
+    )
+    target.add_argument(
+        "--resource-policy",
+        choices=POLICIES,
+        default=DEFAULT_POLICY,
+        help="Resource-blocking policy for every context. Default: %(default)s",
+    )
+    target.add_argument("--headed", action="store_true", help="Show the browsers.")
+    output = parser.add_argument_group("output")
+    output.add_argument(
+        "--ndjson",
+        metavar="PATH",
+        help="Stream every journey, interval and the summary as NDJSON "
+        "('-' = stdout; progress lines then go to stderr).",
+    )
+    output.add_argument(
+        "--report-every",
+        type=float,
+        default=10.0,
+        help="Seconds between interval reports. Default: %(default)s",
+    )
+    output.add_argument(
+        "--max-error-rate",
+        type=float,
+        default=1.0,
+        help="Exit 1 when the run's error rate is above this (0..1). Default: %(default)s",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    parser = _parser()
+    args = parser.parse_args()
+    if min(args.browsers, args.contexts, args.pages) < 1:
+        parser.error("--browsers, --contexts and --pages must be at least 1")
+    if args.duration <= 0 or args.report_every <= 0:
+        parser.error("--duration and --report-every must be positive")
+    args.profile = args.profile.lower().strip()
+    raise SystemExit(main(args))
@@ -0,0 +1,79 @@
+# utils/ad_crawler.py
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from playwright.async_api import BrowserContext, Error as PWError, Page
+
+from pages.ad_detail_page import AdDetails
+from pages.aio.ad_detail_page import AdDetailPage
+
+
+@dataclass(slots=True)
+class CrawlReport:
+    """Outcome of `crawl_ads`: extracted ads in input order plus per-URL failures."""
+
+    ads: list[AdDetails] = field(default_factory=list)
+    failures: dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return not self.failures
+
+
+async def crawl_ads(
+    context: BrowserContext,
+    hrefs: Iterable[str],
+    concurrency: int = 4,
+    timeout: float = 15_000,
+) -> CrawlReport:
+    """
+    Open ad URLs directly (no click-to-popup) in up to `concurrency` pages of
+    `context` at once and extract them. Navigations and extractions overlap
+    on the event loop, so the total is roughly the slowest ad per batch of
+    `concurrency`, not the sum. A failing or slow ad (over `timeout` ms for
+    navigation plus extraction) is reported, not raised.
+    """
+    order = list(dict.fromkeys(hrefs))  # de-duplicated, order kept
+    results: dict[str, AdDetails] = {}
+    errors: dict[str, str] = {}
+    slots = asyncio.Semaphore(concurrency)
+    idle: list[Page] = []
+    opened: list[Page] = []
+    started = time.perf_counter()
+
+    async def _crawl(href: str) -> None:
+        async with slots:
+            if idle:
+                page = idle.pop()
+            else:
+                page = await context.new_page()
+                opened.append(page)
+            deadline = time.perf_counter() + timeout / 1000
+            try:
+                await page.goto(href, wait_until="domcontentloaded", timeout=timeout)
+                remaining_ms = max((deadline - time.perf_counter()) * 1000, 1)
+                results[href] = await AdDetailPage(page).extract(timeout=remaining_ms)
+            except PWError as e:
+                errors[href] = _short(e)
+            finally:
+                idle.append(page)
+
+    try:
+        await asyncio.gather(*(_crawl(href) for href in order))
+    finally:
+        await asyncio.gather(*(page.close() for page in opened), return_exceptions=True)
+
+    return CrawlReport(
+        ads=[results[href] for href in order if href in results],
+        failures={href: errors[href] for href in order if href in errors},
+        elapsed=time.perf_counter() - started,
+    )
+
+
+def _short(error: Exception) -> str:
+    return str(error).splitlines()[0] if str(error) else type(error).__name__
@@ -0,0 +1,233 @@
+# utils/artifacts.py
+# Failure artifacts (screenshot + HTML): captured once on the failing path,
+# compressed and written by a background thread into a content-addressed,
+# size-capped store shared by the pytest hook and tools/.
+from __future__ import annotations
+
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from filelock import FileLock
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import Page
+
+ROOT = Path(__file__).resolve().parents[1]
+ARTIFACT_DIR = Path(os.getenv("AVITO_ARTIFACT_DIR", ROOT / "artifacts" / "failures"))
+# Blobs are evicted oldest-first once the store grows past this
+MAX_BYTES = int(float(os.getenv("AVITO_ARTIFACT_MAX_MB", "200")) * 1024 * 1024)
+INDEX_NAME = "index.jsonl"
+SCREENSHOT_QUALITY = 70
+
+
+@dataclass(frozen=True)
+class Capture:
+    """What was grabbed from a page; blob names are known before anything is written."""
+
+    label: str
+    url: str | None
+    html: bytes | None
+    screenshot: bytes | None
+    ts: float
+
+    @property
+    def html_name(self) -> str | None:
+        return _blob_name(self.html, ".html.gz")
+
+    @property
+    def screenshot_name(self) -> str | None:
+        return _blob_name(self.screenshot, ".jpg")
+
+    @property
+    def names(self) -> list[str]:
+        return [n for n in (self.screenshot_name, self.html_name) if n]
+
+
+def _blob_name(data: bytes | None, suffix: str) -> str | None:
+    if data is None:
+        return None
+    return hashlib.sha256(data).hexdigest()[:20] + suffix
+
+
+def _screenshot_options(full_page: bool) -> dict[str, Any]:
+    # JPEG encodes faster and smaller than PNG; enough to see what went wrong
+    return {"full_page": full_page, "type": "jpeg", "quality": SCREENSHOT_QUALITY}
+
+
+def capture(page: Page, label: str, full_page: bool = False) -> Capture:
+    """Grab screenshot bytes and HTML from `page`; each part is best effort."""
+    try:
+        screenshot: bytes | None = page.screenshot(**_screenshot_options(full_page))
+    except Exception:
+        screenshot = None
+    try:
+        html: bytes | None = page.content().encode("utf-8")
+    except Exception:
+        html = None
+    return Capture(label, page.url, html, screenshot, time.time())
+
+
+async def capture_async(
+    page: AsyncPage, label: str, full_page: bool = False
+) -> Capture:
+    try:
+        screenshot: bytes | None = await page.screenshot(
+            **_screenshot_options(full_page)
+        )
+    except Exception:
+        screenshot = None
+    try:
+        html: bytes | None = (await page.content()).encode("utf-8")
+    except Exception:
+        html = None
+    return Capture(label, page.url, html, screenshot, time.time())
+
+
+class ArtifactWriter:
+    """
+    Writes submitted captures on a daemon thread. Blobs are named by content
+    hash, so identical HTML or screenshots are stored once (a repeat only
+    refreshes the blob's mtime); `index.jsonl` records which label got which
+    blobs. After each write the oldest blobs are evicted to stay under `max_bytes`,
+    and index entries left without any blob are pruned.
+    """
+
+    def __init__(self, root: Path = ARTIFACT_DIR, max_bytes: int = MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.errors: list[str] = []
+        self._queue: queue.Queue[Capture] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, item: Capture) -> Capture:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="artifact-writer", daemon=True
+                )
+                self._thread.start()
+        self._queue.put(item)
+        return item
+
+    def flush(self) -> None:
+        """Block until everything submitted so far is on disk."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                self.write(item)
+            except Exception as e:  # keep the worker alive for later captures
+                self.errors.append(f"{item.label}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def write(self, item: Capture) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        if item.screenshot is not None and item.screenshot_name:
+            self._store(item.screenshot_name, item.screenshot)
+        if item.html is not None and item.html_name:
+            self._store(item.html_name, item.html, compress=True)
+        entry = {
+            "ts": round(item.ts, 3),
+            "label": item.label,
+            "url": item.url,
+            "screenshot": item.screenshot_name,
+            "html": item.html_name,
+        }
+        with (
+            self._index_lock(),
+            (self.root / INDEX_NAME).open("a", encoding="utf-8") as f,
+        ):
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.evict()
+
+    def _index_lock(self) -> FileLock:
+        # Workers append to one index; a prune must not drop a line written meanwhile
+        return FileLock(str(self.root / f"{INDEX_NAME}.lock"))
+
+    def _store(self, name: str, data: bytes, compress: bool = False) -> None:
+        path = self.root / name
+        if path.exists():
+            os.utime(path)  # dedupe hit: now the most recently used copy
+            return
+        tmp = path.with_name(f"{name}.{os.getpid()}.tmp")
+        tmp.write_bytes(gzip.compress(data, compresslevel=6) if compress else data)
+        os.replace(tmp, path)
+
+    def evict(self) -> list[str]:
+        """Delete the oldest blobs until the store fits `max_bytes`; returns their names."""
+        blobs = []
+        for path in self.root.iterdir():
+            if path.name.startswith(INDEX_NAME) or path.suffix == ".tmp":
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # evicted by another process meanwhile
+                continue
+            blobs.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in blobs)
+        evicted = []
+        for _, size, path in sorted(blobs, key=lambda b: b[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted.append(path.name)
+        if evicted:
+            self._prune_index()
+        return evicted
+
+    def _prune_index(self) -> None:
+        """Rewrite the index without entries whose blobs are all gone."""
+        index = self.root / INDEX_NAME
+        with self._index_lock():
+            try:
+                lines = index.read_text("utf-8").splitlines()
+            except FileNotFoundError:
+                return
+            kept = []
+            for line in lines:
+                entry = json.loads(line)
+                names = [entry[k] for k in ("screenshot", "html") if entry.get(k)]
+                if not names or any((self.root / n).exists() for n in names):
+                    kept.append(line)
+            if len(kept) == len(lines):
+                return
+            tmp = index.with_name(f"{INDEX_NAME}.{os.getpid()}.tmp")
+            tmp.write_text("".join(f"{line}\n" for line in kept), "utf-8")
+            os.replace(tmp, index)
+
+
+_WRITER: ArtifactWriter | None = None
+
+
+def writer() -> ArtifactWriter:
+    """The process-wide writer, flushed at interpreter exit."""
+    global _WRITER
+    if _WRITER is None:
+        _WRITER = ArtifactWriter()
+        atexit.register(_WRITER.flush)
+    return _WRITER
+
+
+def save_failure(page: Page, label: str, full_page: bool = False) -> Capture:
+    """Capture `page` now, write it in the background."""
+    return writer().submit(capture(page, label, full_page))
+
+
+async def save_failure_async(
+    page: AsyncPage, label: str, full_page: bool = False
+) -> Capture:
+    return writer().submit(await capture_async(page, label, full_page))
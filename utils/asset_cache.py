@@ -0,0 +1,403 @@
+# utils/asset_cache.py
+# Route-level cache for static assets (scripts, styles, images, fonts): bodies
+# are stored by content hash on disk, shared by every context and xdist
+# worker, and served with route.fulfill instead of a network round-trip.
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+from filelock import FileLock, Timeout
+from playwright.async_api import BrowserContext as AsyncBrowserContext
+from playwright.async_api import Route as AsyncRoute
+from playwright.sync_api import BrowserContext, Error as PWError, Route
+
+ROOT = Path(__file__).resolve().parents[1]
+ASSET_CACHE_DIR = Path(
+    os.getenv("AVITO_ASSET_CACHE_DIR", ROOT / "artifacts" / "asset-cache")
+)
+# Least recently used blobs are evicted once the store grows past this
+MAX_BYTES = int(float(os.getenv("AVITO_ASSET_CACHE_MAX_MB", "500")) * 1024 * 1024)
+DEFAULT_ASSET_CACHE = os.getenv("AVITO_ASSET_CACHE", "off").strip()
+
+# Only these request types are looked up; documents, xhr/fetch and everything
+# else always go to the network
+STATIC_TYPES = frozenset({"script", "stylesheet", "image", "font"})
+# Never stored even when a static request answers with them (error pages, API payloads)
+_DYNAMIC_CONTENT = ("text/html", "application/json", "application/xhtml")
+# Response headers replayed from the cache; cookies and transfer framing are not
+_KEPT_HEADERS = (
+    "content-type",
+    "cache-control",
+    "etag",
+    "last-modified",
+    "expires",
+    "access-control-allow-origin",
+    "access-control-allow-credentials",
+    "timing-allow-origin",
+    "x-content-type-options",
+)
+# Vary values that do not change the body a test gets back
+_HARMLESS_VARY = frozenset({"accept-encoding", "origin"})
+# Heuristic lifetime for responses with Last-Modified but no explicit expiry (RFC 9111 4.2.2)
+_HEURISTIC_FRACTION = 0.1
+
+
+@dataclass(frozen=True)
+class AssetEntry:
+    """What the cache knows about one URL: its validators and which blob holds the body."""
+
+    url: str
+    blob: str
+    size: int
+    content_type: str
+    headers: dict[str, str]
+    expires: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def fresh(self, now: float | None = None) -> bool:
+        return (time.time() if now is None else now) < self.expires
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers that let the server answer 304."""
+        found = {}
+        if self.etag:
+            found["if-none-match"] = self.etag
+        if self.last_modified:
+            found["if-modified-since"] = self.last_modified
+        return found
+
+
+@dataclass
+class CacheStats:
+    """Per-test counters; `bytes_saved` counts bodies not downloaded again."""
+
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    stored: int = 0
+    bytes_saved: int = 0
+
+
+def _directives(cache_control: str) -> dict[str, str]:
+    found = {}
+    for part in cache_control.split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            found[name.lower()] = value.strip('"')
+    return found
+
+
+def _http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def expires_at(headers: dict[str, str], now: float | None = None) -> float:
+    """When a response stops being fresh: max-age, then Expires, then Last-Modified age."""
+    now = time.time() if now is None else now
+    cc = _directives(headers.get("cache-control", ""))
+    if "no-cache" in cc:
+        return now
+    try:
+        age = float(headers.get("age", 0))
+    except ValueError:
+        age = 0.0
+    if "max-age" in cc:
+        try:
+            return now + float(cc["max-age"]) - age
+        except ValueError:
+            return now
+    expires = _http_date(headers.get("expires"))
+    if expires is not None:
+        date = _http_date(headers.get("date")) or now
+        return now + (expires - date)
+    modified = _http_date(headers.get("last-modified"))
+    if modified is not None:
+        date = _http_date(headers.get("date")) or now
+        return now + max(date - modified, 0) * _HEURISTIC_FRACTION
+    return now
+
+
+def cacheable_request(method: str, resource_type: str) -> bool:
+    return method == "GET" and resource_type in STATIC_TYPES
+
+
+def storable(status: int, headers: dict[str, str], now: float | None = None) -> bool:
+    """
+    Worth storing: a plain 200 for a non-HTML, non-JSON body that the server
+    lets shared caches keep, and that is either fresh for a while or can be
+    revalidated with a validator.
+    """
+    if status != 200:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    if any(content_type.startswith(t) for t in _DYNAMIC_CONTENT):
+        return False
+    cc = _directives(headers.get("cache-control", ""))
+    if "no-store" in cc or "private" in cc:
+        return False
+    vary = {v.strip().lower() for v in headers.get("vary", "").split(",") if v.strip()}
+    if not vary <= _HARMLESS_VARY:
+        return False
+    has_validator = bool(headers.get("etag") or headers.get("last-modified"))
+    return has_validator or expires_at(headers, now) > (
+        time.time() if now is None else now
+    )
+
+
+def _entry_name(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32] + ".json"
+
+
+class AssetStore:
+    """
+    On-disk store shared by every worker: `blobs/<sha256>` holds bodies (one
+    copy per distinct content), `entries/<url hash>.json` maps a URL to its
+    blob and validators. Every write is a temp file plus `os.replace`, so
+    concurrent writers never expose a partial file; the last one wins. A
+    blob's mtime is its last use, and eviction drops the least recently used
+    blobs (under a lock that other processes skip rather than wait for).
+    """
+
+    def __init__(
+        self, root: Path = ASSET_CACHE_DIR, max_bytes: int = MAX_BYTES
+    ) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        # Bytes written since the last eviction; the store is trimmed every tenth of the cap
+        self._added = 0
+
+    @property
+    def dirty(self) -> bool:
+        """Something was written since the last eviction."""
+        return self._added > 0
+
+    @property
+    def blobs(self) -> Path:
+        return self.root / "blobs"
+
+    @property
+    def entries(self) -> Path:
+        return self.root / "entries"
+
+    def lookup(self, url: str) -> AssetEntry | None:
+        try:
+            data = json.loads((self.entries / _entry_name(url)).read_text("utf-8"))
+            entry = AssetEntry(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+        return entry if entry.url == url else None
+
+    def read(self, entry: AssetEntry) -> bytes | None:
+        """The entry's body, marked as just used; None if it was evicted."""
+        path = self.blobs / entry.blob
+        try:
+            body = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            (self.entries / _entry_name(entry.url)).unlink(missing_ok=True)
+            return None
+        return body
+
+    def put(
+        self,
+        url: str,
+        headers: dict[str, str],
+        body: bytes,
+        now: float | None = None,
+    ) -> AssetEntry | None:
+        """Store a response body and point `url` at it; None if it is too big to keep."""
+        if len(body) > self.max_bytes // 10:
+            return None
+        digest = hashlib.sha256(body).hexdigest()
+        blob = self.blobs / digest
+        if blob.exists():
+            os.utime(blob)
+        else:
+            self._write(blob, body)
+            self._added += len(body)
+        entry = AssetEntry(
+            url=url,
+            blob=digest,
+            size=len(body),
+            content_type=headers.get("content-type", ""),
+            headers={k: v for k, v in headers.items() if k in _KEPT_HEADERS},
+            expires=expires_at(headers, now),
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+        )
+        self.save(entry)
+        if self._added > self.max_bytes // 10:
+            self.evict()
+        return entry
+
+    def save(self, entry: AssetEntry) -> None:
+        self._write(
+            self.entries / _entry_name(entry.url), json.dumps(asdict(entry)).encode()
+        )
+
+    def revalidated(self, entry: AssetEntry, headers: dict[str, str]) -> AssetEntry:
+        """Record a 304: the body stays, the expiry (and any new validators) are refreshed."""
+        merged = {
+            **entry.headers,
+            **{k: v for k, v in headers.items() if k in _KEPT_HEADERS},
+        }
+        updated = AssetEntry(
+            url=entry.url,
+            blob=entry.blob,
+            size=entry.size,
+            content_type=entry.content_type,
+            headers=merged,
+            expires=expires_at(headers),
+            etag=headers.get("etag", entry.etag),
+            last_modified=headers.get("last-modified", entry.last_modified),
+        )
+        self.save(updated)
+        return updated
+
+    def evict(self) -> list[str]:
+        """Delete least recently used blobs until the store fits `max_bytes`."""
+        self._added = 0
+        if not self.blobs.is_dir():
+            return []
+        try:
+            with FileLock(str(self.root / ".evict.lock"), timeout=0):
+                return self._evict()
+        except Timeout:  # another worker is already trimming the store
+            return []
+
+    def _evict(self) -> list[str]:
+        blobs = []
+        for path in self.blobs.iterdir():
+            if path.suffix == ".tmp":
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            blobs.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in blobs)
+        evicted = []
+        for _, size, path in sorted(blobs, key=lambda b: b[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted.append(path.name)
+        return evicted
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+
+_STORE: AssetStore | None = None
+
+
+def shared_store() -> AssetStore:
+    """The process-wide store (configured by plugins/asset_cache.py)."""
+    global _STORE
+    if _STORE is None:
+        _STORE = AssetStore()
+    return _STORE
+
+
+class AssetCache:
+    """Serves one test's static requests from the shared store and counts what it saved."""
+
+    def __init__(self, store: AssetStore | None = None) -> None:
+        self.store = store if store is not None else shared_store()
+        self.stats = CacheStats()
+
+    def apply(self, context: BrowserContext) -> None:
+        """
+        Install the cache on `context`. Register it before other routes: routes
+        run newest first, so blocking policies decide before the cache answers.
+        """
+        context.route("**/*", self._handle)
+
+    async def apply_async(self, context: AsyncBrowserContext) -> None:
+        await context.route("**/*", self._handle_async)
+
+    def _lookup(self, url: str) -> tuple[AssetEntry, bytes] | None:
+        entry = self.store.lookup(url)
+        body = self.store.read(entry) if entry is not None else None
+        return (entry, body) if entry is not None and body is not None else None
+
+    def _hit(self, entry: AssetEntry, revalidated: bool = False) -> None:
+        self.stats.hits += 1
+        self.stats.revalidated += revalidated
+        self.stats.bytes_saved += entry.size
+
+    def _fetched(
+        self, url: str, status: int, headers: dict[str, str], body: bytes
+    ) -> None:
+        self.stats.misses += 1
+        if storable(status, headers) and self.store.put(url, headers, body) is not None:
+            self.stats.stored += 1
+
+    def _handle(self, route: Route) -> None:
+        request = route.request
+        if not cacheable_request(request.method, request.resource_type):
+            route.fallback()
+            return
+        cached = self._lookup(request.url)
+        if cached is not None and cached[0].fresh():
+            self._hit(cached[0])
+            route.fulfill(status=200, headers=cached[0].headers, body=cached[1])
+            return
+        headers = {**request.headers, **cached[0].validators} if cached else None
+        try:
+            response = route.fetch(headers=headers)
+        except PWError:
+            route.fallback()
+            return
+        if response.status == 304 and cached is not None:
+            entry = self.store.revalidated(cached[0], response.headers)
+            self._hit(entry, revalidated=True)
+            route.fulfill(status=200, headers=entry.headers, body=cached[1])
+            return
+        body = response.body()
+        self._fetched(request.url, response.status, response.headers, body)
+        route.fulfill(response=response, body=body)
+
+    async def _handle_async(self, route: AsyncRoute) -> None:
+        request = route.request
+        if not cacheable_request(request.method, request.resource_type):
+            await route.fallback()
+            return
+        cached = self._lookup(request.url)
+        if cached is not None and cached[0].fresh():
+            self._hit(cached[0])
+            await route.fulfill(status=200, headers=cached[0].headers, body=cached[1])
+            return
+        headers = {**request.headers, **cached[0].validators} if cached else None
+        try:
+            response = await route.fetch(headers=headers)
+        except PWError:
+            await route.fallback()
+            return
+        if response.status == 304 and cached is not None:
+            entry = self.store.revalidated(cached[0], response.headers)
+            self._hit(entry, revalidated=True)
+            await route.fulfill(status=200, headers=entry.headers, body=cached[1])
+            return
+        body = await response.body()
+        self._fetched(request.url, response.status, response.headers, body)
+        await route.fulfill(response=response, body=body)
@@ -0,0 +1,56 @@
+# utils/auth_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+# How long a validation result stays trustworthy (seconds)
+DEFAULT_TTL = float(os.getenv("AVITO_AUTH_CACHE_TTL", "900"))
+
+
+def sidecar_for(state_file: Path) -> Path:
+    """Path of the validation record kept next to a state file."""
+    return state_file.with_suffix(".json.validated")
+
+
+def state_digest(state_file: Path) -> str:
+    """Content hash of the state file; a re-bootstrapped file never matches an old record."""
+    return hashlib.sha256(state_file.read_bytes()).hexdigest()
+
+
+def read_validation(state_file: Path) -> bool | None:
+    """
+    Return the cached validation result for `state_file`, without locking.
+    None means "no usable record": missing, expired, corrupt or for other file content.
+    """
+    try:
+        record = json.loads(sidecar_for(state_file).read_text(encoding="utf-8"))
+        if time.time() - record["validated_at"] > record["ttl"]:
+            return None
+        if record["sha256"] != state_digest(state_file):
+            return None
+        return bool(record["valid"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def record_validation(state_file: Path, valid: bool, ttl: float = DEFAULT_TTL) -> None:
+    """Atomically write the validation result so readers never see a partial record."""
+    record = {
+        "sha256": state_digest(state_file),
+        "valid": valid,
+        "validated_at": time.time(),
+        "ttl": ttl,
+    }
+    sidecar = sidecar_for(state_file)
+    tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(record), encoding="utf-8")
+    os.replace(tmp, sidecar)
+
+
+def clear_validation(state_file: Path) -> None:
+    """Drop the validation record (e.g. when the state file is deleted)."""
+    sidecar_for(state_file).unlink(missing_ok=True)
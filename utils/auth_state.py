@@ -0,0 +1,196 @@
+# utils/auth_state.py
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import cast
+
+from playwright.sync_api import StorageState
+
+# Cookies that carry the Avito session; all must be present and unexpired
+AUTH_COOKIES = tuple(
+    name.strip()
+    for name in os.getenv("AVITO_AUTH_COOKIES", "sessid").split(",")
+    if name.strip()
+)
+# A state file younger than this (seconds) is trusted without a /profile probe
+FRESH_WINDOW = float(os.getenv("AVITO_AUTH_FRESH_WINDOW", "600"))
+# Cookie domains / localStorage origins kept by `compact_state(..., "first-party")`
+FIRST_PARTY_DOMAINS = ("avito.ru",)
+
+# state file path -> (mtime_ns of the file actually read, parsed state)
+_LOADED: dict[Path, tuple[tuple[Path, int], StorageState]] = {}
+
+
+@dataclass(frozen=True)
+class StateReport:
+    """Offline verdict on a saved storage_state — no browser involved."""
+
+    profile: str
+    status: str  # "unreadable" | "missing" | "expired" | "fresh" | "unverified"
+    remaining: float | None  # seconds until the first auth cookie expires
+    age: float | None  # seconds since the state file was written
+    detail: str
+
+    @property
+    def is_dead(self) -> bool:
+        """True if a browser probe could not possibly succeed."""
+        return self.status in ("unreadable", "missing", "expired")
+
+    def describe(self) -> str:
+        """One-line human summary, e.g. for check_state output."""
+        if self.remaining is None:
+            lifetime = "session cookie"
+        elif self.remaining <= 0:
+            lifetime = "expired"
+        else:
+            lifetime = f"{self.remaining / 3600:.1f} h left"
+        return f"{self.profile}: {self.status} ({lifetime}) — {self.detail}"
+
+
+def inspect_state(
+    profile: str,
+    state_file: Path,
+    *,
+    fresh_window: float = FRESH_WINDOW,
+    now: float | None = None,
+) -> StateReport:
+    """Classify a state file from its auth cookies' expiry and the file's age."""
+    now = time.time() if now is None else now
+    try:
+        age = now - state_file.stat().st_mtime
+        state = load_state(state_file)
+    except (OSError, ValueError):
+        return StateReport(
+            profile, "unreadable", None, None, "state file is unreadable"
+        )
+    return classify_state(profile, state, age=age, fresh_window=fresh_window, now=now)
+
+
+def classify_state(
+    profile: str,
+    state: StorageState,
+    *,
+    age: float | None,
+    fresh_window: float = FRESH_WINDOW,
+    now: float | None = None,
+) -> StateReport:
+    """Classify an already-parsed storage_state (see `inspect_state`)."""
+    now = time.time() if now is None else now
+    cookies = {c.get("name"): c for c in state.get("cookies") or []}
+
+    absent = [name for name in AUTH_COOKIES if name not in cookies]
+    if absent:
+        return StateReport(
+            profile, "missing", None, age, f"no auth cookie(s): {', '.join(absent)}"
+        )
+
+    # expires == -1 marks a session cookie: no client-side expiry to check
+    expiries = [
+        float(cookies[name]["expires"])
+        for name in AUTH_COOKIES
+        if float(cookies[name].get("expires", -1)) > 0
+    ]
+    remaining = min(expiries) - now if expiries else None
+    if remaining is not None and remaining <= 0:
+        return StateReport(
+            profile, "expired", remaining, age, "auth cookie expiry is in the past"
+        )
+    if age is not None and age <= fresh_window:
+        return StateReport(
+            profile, "fresh", remaining, age, f"saved {age:.0f}s ago, probe skipped"
+        )
+    return StateReport(profile, "unverified", remaining, age, "needs a /profile probe")
+
+
+# --- Compact state (see tools/bootstrap_auth.py --compact) --------------------
+def compact_path_for(state_file: Path) -> Path:
+    """Gzipped, trimmed copy kept next to the full state file."""
+    return state_file.with_suffix(".json.gz")
+
+
+def state_source(state_file: Path) -> tuple[Path, int]:
+    """
+    The file `load_state` reads for `state_file` (its compact copy when that is
+    at least as new) and that file's mtime_ns: a cache key that changes when
+    either copy is rewritten.
+    """
+    compact = compact_path_for(state_file)
+    try:
+        if compact.stat().st_mtime_ns >= state_file.stat().st_mtime_ns:
+            return compact, compact.stat().st_mtime_ns
+    except OSError:
+        pass
+    return state_file, state_file.stat().st_mtime_ns
+
+
+def load_state(state_file: Path) -> StorageState:
+    """
+    Parsed storage_state for `state_file`, preferring its compact copy when that
+    is at least as new. Parsed once per process and served from memory after.
+    """
+    source = state_source(state_file)
+    cached = _LOADED.get(state_file)
+    if cached is not None and cached[0] == source:
+        return cached[1]
+    path = source[0]
+    if path != state_file:
+        raw = json.loads(gzip.decompress(path.read_bytes()).decode("utf-8"))
+    else:
+        raw = json.loads(state_file.read_text(encoding="utf-8"))
+    # Written by Playwright's storage_state() (or compact_state below)
+    state = cast(StorageState, raw)
+    _LOADED[state_file] = (source, state)
+    return state
+
+
+def _domain_matches(domain: str, domains: tuple[str, ...]) -> bool:
+    domain = domain.lstrip(".").lower()
+    return any(domain == d or domain.endswith(f".{d}") for d in domains)
+
+
+def compact_state(
+    state: StorageState,
+    level: str = "first-party",
+    domains: tuple[str, ...] = FIRST_PARTY_DOMAINS,
+) -> StorageState:
+    """
+    Trim a storage_state to what authentication needs:
+    "auth-cookies" keeps only AUTH_COOKIES and no localStorage;
+    "first-party" keeps every cookie and origin of `domains`.
+    """
+    cookies = state.get("cookies") or []
+    if level == "auth-cookies":
+        return {
+            "cookies": [c for c in cookies if c.get("name") in AUTH_COOKIES],
+            "origins": [],
+        }
+    if level != "first-party":
+        raise ValueError(f"Unknown compaction level '{level}'")
+    return {
+        "cookies": [
+            c for c in cookies if _domain_matches(c.get("domain", ""), domains)
+        ],
+        "origins": [
+            o
+            for o in state.get("origins") or []
+            if _domain_matches(o.get("origin", "").split("://")[-1], domains)
+        ],
+    }
+
+
+def write_compact(state_file: Path, state: StorageState) -> Path:
+    """Write the gzipped compact copy atomically; returns its path."""
+    compact = compact_path_for(state_file)
+    tmp = compact.with_name(f"{compact.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(gzip.compress(json.dumps(state, separators=(",", ":")).encode()))
+    os.replace(tmp, compact)
+    return compact
+
+
+def remove_compact(state_file: Path) -> None:
+    compact_path_for(state_file).unlink(missing_ok=True)
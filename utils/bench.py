@@ -0,0 +1,86 @@
+# utils/bench.py
+# Timing, history and regression checks behind the `bench` fixture (plugins/bench.py).
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import median
+from typing import Any, Callable
+
+from filelock import FileLock
+
+# Differences below this are timer noise, whatever the relative change
+MIN_DELTA_MS = 0.05
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    name: str
+    median_ms: float
+    min_ms: float
+    rounds: int
+
+
+def measure(
+    name: str, fn: Callable[[], Any], rounds: int = 20, warmup: int = 1
+) -> BenchResult:
+    """Call `fn` `warmup` + `rounds` times; the median of the timed rounds is the metric."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return BenchResult(name, median(samples), min(samples), rounds)
+
+
+def load_history(path: Path) -> list[dict[str, Any]]:
+    """Runs recorded so far, oldest first (one JSON object per line)."""
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text("utf-8").splitlines() if line]
+
+
+def baseline(history: list[dict[str, Any]], name: str, window: int = 5) -> float | None:
+    """
+    Median of `name` over the last `window` runs that measured it, leaving out
+    runs where it was flagged as regressed so one slow run can't become the norm.
+    """
+    values = [
+        run["results"][name]
+        for run in history
+        if name in run["results"] and name not in run.get("regressed", ())
+    ]
+    return median(values[-window:]) if values else None
+
+
+def regressed(value: float, base: float | None, threshold: float) -> bool:
+    """True if `value` is more than `threshold` (0.25 = 25%) slower than `base`."""
+    if base is None or value - base < MIN_DELTA_MS:
+        return False
+    return value > base * (1 + threshold)
+
+
+def append_run(path: Path, results: dict[str, float], **meta: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    record = {"ts": round(time.time()), **meta, "results": results}
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+def contend_lock(lock_path: str, iterations: int) -> float:
+    """
+    Take and release `lock_path` `iterations` times, as every xdist worker
+    does for state validation; returns ms per acquisition. Top-level so a
+    process pool can run it.
+    """
+    lock = FileLock(lock_path)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        with lock:
+            os.getpid()  # trivial critical section
+    return (time.perf_counter() - started) * 1000 / iterations
@@ -0,0 +1,335 @@
+# utils/browser_server.py
+from __future__ import annotations
+
+import json
+import os
+import queue
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+import psutil  # type: ignore[import-untyped]
+from playwright.sync_api import Browser, BrowserType, Error as PWError
+
+# Env var naming the endpoints file; set by the controller, inherited by workers
+ENDPOINTS_ENV = "AVITO_BROWSER_ENDPOINTS"
+# Seconds to wait for `playwright launch-server` to print its endpoint
+LAUNCH_TIMEOUT = 60.0
+# Seconds a worker keeps retrying while the controller relaunches a dead server
+CONNECT_TIMEOUT = 30.0
+
+
+def launch_options_for_server(launch_args: dict[str, Any]) -> dict[str, Any]:
+    """Python launch kwargs (slow_mo, executable_path, ...) -> launchServer JSON options."""
+    options = {}
+    for key, value in launch_args.items():
+        if value is None:
+            continue
+        head, *rest = key.split("_")
+        options[head + "".join(part.title() for part in rest)] = value
+    return options
+
+
+@dataclass
+class BrowserServer:
+    """One `playwright launch-server` process and the websocket endpoint it serves."""
+
+    browser_name: str = "chromium"
+    options: dict[str, Any] = field(default_factory=dict)
+    ws_endpoint: str | None = None
+    launches: int = 0
+    launch_seconds: float = 0.0  # summed over all (re)launches
+    _process: subprocess.Popen[str] | None = None
+    _workdir: Path | None = None
+
+    def start(self) -> BrowserServer:
+        started = time.perf_counter()
+        self._workdir = Path(tempfile.mkdtemp(prefix="avito-browser-server-"))
+        config = self._workdir / "launch.json"
+        config.write_text(json.dumps(self.options), encoding="utf-8")
+        with (self._workdir / "server.log").open("w", encoding="utf-8") as log:
+            self._process = subprocess.Popen(
+                [sys.executable, "-m", "playwright", "launch-server"]
+                + ["--browser", self.browser_name, "--config", str(config)],
+                stdout=subprocess.PIPE,
+                stderr=log,
+                text=True,
+            )
+        self.ws_endpoint = self._read_endpoint()
+        self.launches += 1
+        self.launch_seconds += time.perf_counter() - started
+        return self
+
+    def alive(self) -> bool:
+        """The process is running and its port accepts connections."""
+        if self._process is None or self._process.poll() is not None:
+            return False
+        url = urlsplit(self.ws_endpoint or "")
+        if url.port is None:
+            return False
+        try:
+            with socket.create_connection((url.hostname, url.port), timeout=1):
+                return True
+        except OSError:
+            return False
+
+    def restart(self) -> None:
+        self.stop()
+        self.start()
+
+    def stop(self) -> None:
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._process = None
+        self.ws_endpoint = None
+
+    def _read_endpoint(self) -> str:
+        assert self._process is not None and self._process.stdout is not None
+        lines: queue.Queue[str] = queue.Queue()
+        stdout = self._process.stdout
+        threading.Thread(
+            target=lambda: lines.put(stdout.readline()), daemon=True
+        ).start()
+        try:
+            line = lines.get(timeout=LAUNCH_TIMEOUT).strip()
+        except queue.Empty:
+            line = ""
+        if not line.startswith("ws://"):
+            self.stop()
+            log = self._workdir / "server.log" if self._workdir else None
+            tail = log.read_text(encoding="utf-8")[-2000:] if log else ""
+            raise RuntimeError(f"Browser server did not start:\n{tail}")
+        return line
+
+
+class BrowserFarm:
+    """
+    Controller-side set of browser servers. Endpoints are published in a JSON
+    file that workers re-read on (re)connect; a watchdog thread relaunches any
+    server whose process died or stopped accepting connections.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        browser_name: str,
+        options: dict[str, Any],
+        endpoints_file: Path,
+        check_interval: float = 2.0,
+    ) -> None:
+        self.servers = [BrowserServer(browser_name, options) for _ in range(count)]
+        self.endpoints_file = endpoints_file
+        self.relaunches = 0
+        self.startup_seconds = 0.0  # wall time of the initial parallel launch
+        self._interval = check_interval
+        self._stopped = threading.Event()
+        self._watchdog: threading.Thread | None = None
+
+    def start(self) -> BrowserFarm:
+        started = time.perf_counter()
+        errors: list[Exception] = []
+
+        def _start(server: BrowserServer) -> None:
+            try:
+                server.start()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=_start, args=(s,)) for s in self.servers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if errors:
+            self.stop()
+            raise errors[0]
+        self.startup_seconds = time.perf_counter() - started
+        self._publish()
+        self._watchdog = threading.Thread(
+            target=self._watch, name="browser-farm-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        return self
+
+    def check(self) -> int:
+        """Relaunch dead servers now; returns how many were relaunched."""
+        relaunched = 0
+        for server in self.servers:
+            if self._stopped.is_set():
+                break
+            if not server.alive():
+                try:
+                    server.restart()
+                except RuntimeError:
+                    continue  # retried on the next check
+                relaunched += 1
+        if relaunched:
+            self.relaunches += relaunched
+            self._publish()
+        return relaunched
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self._interval + 1)
+        for server in self.servers:
+            server.stop()
+        self.endpoints_file.unlink(missing_ok=True)
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self._interval):
+            self.check()
+
+    def _publish(self) -> None:
+        tmp = self.endpoints_file.with_name(f"{self.endpoints_file.name}.tmp")
+        tmp.write_text(
+            json.dumps([s.ws_endpoint for s in self.servers]), encoding="utf-8"
+        )
+        os.replace(tmp, self.endpoints_file)
+
+
+def read_endpoints(endpoints_file: Path) -> list[str]:
+    try:
+        endpoints = json.loads(endpoints_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    return [e for e in endpoints if e]
+
+
+class BrowserProxy(ABC):
+    """
+    Stable handle to a Browser that can be replaced underneath. Attribute
+    access is delegated to the current Browser; after it was closed (see
+    `recycle`) or lost its connection, the next access opens a new one, so
+    session fixtures holding the handle (context_pool, ...) keep working.
+    """
+
+    def __init__(self) -> None:
+        self._browser: Browser | None = None
+        self.contexts_served = 0  # new_context() calls over all generations
+        self.recycles = 0
+        # Top processes of the current browser, when this worker started them
+        self.root_pids: list[int] = []
+
+    @property
+    def browser(self) -> Browser:
+        if self._browser is None or not self._browser.is_connected():
+            self._browser = self._open()
+        return self._browser
+
+    @property
+    def current(self) -> Browser | None:
+        """The open Browser, without opening one."""
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+        return None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.browser, name)
+
+    def new_context(self, **kwargs: Any) -> Any:
+        self.contexts_served += 1
+        return self.browser.new_context(**kwargs)
+
+    def recycle(self) -> None:
+        """Close the current Browser (and its contexts); the next access opens a fresh one."""
+        self.close()
+        self.recycles += 1
+
+    def close(self) -> None:
+        if self._browser is not None and self._browser.is_connected():
+            self._browser.close()
+        self._browser = None
+        self.root_pids = []
+
+    @abstractmethod
+    def _open(self) -> Browser:
+        """Launch or connect a new Browser generation."""
+
+
+def _process_tree() -> dict[int, int]:
+    """pid -> parent pid of every process below this one."""
+    tree = {}
+    for proc in psutil.Process().children(recursive=True):
+        try:
+            tree[proc.pid] = proc.ppid()
+        except psutil.NoSuchProcess:
+            continue
+    return tree
+
+
+class LaunchedBrowser(BrowserProxy):
+    """
+    A browser this worker launches itself (`launch` is called once per
+    generation). The processes that appear during the launch are its
+    `root_pids`, told apart from the async browser or any other child.
+    """
+
+    def __init__(self, launch: Callable[[], Browser]) -> None:
+        super().__init__()
+        self._launch = launch
+        self.launches = 0
+
+    def _open(self) -> Browser:
+        self.launches += 1
+        before = _process_tree()
+        browser = self._launch()
+        spawned = {
+            pid: ppid for pid, ppid in _process_tree().items() if pid not in before
+        }
+        self.root_pids = [pid for pid, ppid in spawned.items() if ppid not in spawned]
+        return browser
+
+
+class SharedBrowser(BrowserProxy):
+    """
+    Worker-side handle to one farm server. If the connection dropped (server
+    died), the next access reconnects to whatever endpoint the controller
+    published since. Closing only disconnects: the server closes the contexts
+    this worker created.
+    """
+
+    def __init__(
+        self, browser_type: BrowserType, endpoints_file: Path, slot: int
+    ) -> None:
+        super().__init__()
+        self._browser_type = browser_type
+        self._endpoints_file = endpoints_file
+        self._slot = slot
+        self.connects = 0
+        self.connect_seconds = 0.0
+
+    def _open(self) -> Browser:
+        return self._connect()
+
+    def _connect(self) -> Browser:
+        started = time.perf_counter()
+        deadline = time.monotonic() + CONNECT_TIMEOUT
+        while True:
+            endpoints = read_endpoints(self._endpoints_file)
+            try:
+                if endpoints:
+                    endpoint = endpoints[self._slot % len(endpoints)]
+                    browser = self._browser_type.connect(endpoint, timeout=10_000)
+                    self.connects += 1
+                    self.connect_seconds += time.perf_counter() - started
+                    return browser
+            except PWError:
+                pass
+            if time.monotonic() >= deadline:
+                raise RuntimeError(
+                    f"No shared browser server reachable via {self._endpoints_file}"
+                )
+            time.sleep(0.5)
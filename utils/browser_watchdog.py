@@ -0,0 +1,147 @@
+# utils/browser_watchdog.py
+# Per-worker browser memory watchdog: samples the RSS of the `browser` fixture's
+# processes, counts contexts served, and decides when to recycle.
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+import psutil  # type: ignore[import-untyped]
+
+from utils.browser_server import BrowserProxy
+
+MB = 1024 * 1024
+# Recycle once the worker's browser processes use more than this (0 = never)
+MAX_RSS_MB = float(os.getenv("AVITO_BROWSER_MAX_RSS_MB", "2048"))
+# ... or once this many contexts were created in one browser (0 = never)
+MAX_CONTEXTS = int(os.getenv("AVITO_BROWSER_MAX_CONTEXTS", "300"))
+
+
+@dataclass(frozen=True)
+class MemorySample:
+    """RSS in bytes: renderer (tab content) processes vs everything else."""
+
+    browser_rss: int = 0
+    renderer_rss: int = 0
+    renderers: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.browser_rss + self.renderer_rss
+
+
+def _is_renderer(cmdline: list[str]) -> bool:
+    # Chromium: --type=renderer; Firefox: "-contentproc ... tab"; WebKit: WebKitWebProcess
+    return (
+        "--type=renderer" in cmdline
+        or ("-contentproc" in cmdline and "tab" in cmdline)
+        or any("WebKitWebProcess" in arg for arg in cmdline[:1])
+    )
+
+
+def sample(roots: Iterable[int] | None = None) -> MemorySample:
+    """
+    RSS of the `roots` processes and everything below them, or with no
+    roots, of every process below this worker. The watchdog passes the
+    BrowserProxy's `root_pids`: the browser and its helpers and renderers,
+    not the Playwright driver or the async browser. A --shared-browser
+    server is not a child, so it has no roots here and samples as zero.
+    """
+    procs = []
+    for pid in [os.getpid()] if roots is None else roots:
+        try:
+            root = psutil.Process(pid)
+            procs += root.children(recursive=True)
+        except psutil.NoSuchProcess:  # exited (browser closed) since it was listed
+            continue
+        if roots is not None:
+            procs.append(root)
+    browser = renderer = renderers = 0
+    for proc in procs:
+        try:
+            rss = proc.memory_info().rss
+            cmdline = proc.cmdline()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue  # exited between listing and reading
+        if _is_renderer(cmdline):
+            renderer += rss
+            renderers += 1
+        else:
+            browser += rss
+    return MemorySample(browser, renderer, renderers)
+
+
+def close_leaked_pages(browser: Any) -> int:
+    """
+    Close pages still open in `browser` after a test's fixtures were torn
+    down (popups, pages of contexts the test never closed); returns the count.
+    Pooled contexts are parked without pages, so anything left is a leak.
+    """
+    closed = 0
+    for context in list(browser.contexts):
+        for page in list(context.pages):
+            try:
+                page.close()
+            except Exception:  # context or page already gone
+                continue
+            closed += 1
+    return closed
+
+
+class BrowserWatchdog:
+    """
+    Checked between tests: keeps the peak sample and, once the RSS or the
+    number of contexts since the last recycle crosses its threshold,
+    recycles the BrowserProxy (the next test gets a fresh browser).
+    """
+
+    def __init__(
+        self,
+        max_rss_mb: float = MAX_RSS_MB,
+        max_contexts: int = MAX_CONTEXTS,
+        sampler: Callable[[Iterable[int]], MemorySample] = sample,
+    ) -> None:
+        self.max_rss_mb = max_rss_mb
+        self.max_contexts = max_contexts
+        self.peak = MemorySample()
+        self.leaked_pages = 0
+        self.reasons: list[str] = []
+        self._sampler = sampler
+        self._served_at_recycle = 0
+
+    def reason(self, proxy: BrowserProxy) -> str | None:
+        """Sample now; why the browser should be recycled, or None."""
+        current = self._sampler(proxy.root_pids)
+        if current.total > self.peak.total:
+            self.peak = current
+        if self.max_rss_mb and current.total > self.max_rss_mb * MB:
+            return f"RSS {current.total / MB:.0f} MB > {self.max_rss_mb:.0f} MB"
+        served = proxy.contexts_served - self._served_at_recycle
+        if self.max_contexts and served >= self.max_contexts:
+            return f"{served} contexts served"
+        return None
+
+    def check(self, proxy: BrowserProxy) -> str | None:
+        """Close leaked pages, then recycle if a threshold is crossed; returns the reason."""
+        browser = proxy.current
+        if browser is None:
+            return None
+        self.leaked_pages += close_leaked_pages(browser)
+        reason = self.reason(proxy)
+        if reason is not None:
+            proxy.recycle()
+            self._served_at_recycle = proxy.contexts_served
+            self.reasons.append(reason)
+        return reason
+
+    def report(self, proxy: BrowserProxy) -> dict[str, Any]:
+        """Plain-data summary for workeroutput / the run summary."""
+        return {
+            "peak_mb": round(self.peak.total / MB, 1),
+            "renderer_peak_mb": round(self.peak.renderer_rss / MB, 1),
+            "renderers": self.peak.renderers,
+            "recycles": proxy.recycles,
+            "contexts": proxy.contexts_served,
+            "leaked_pages": self.leaked_pages,
+        }
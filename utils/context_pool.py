@@ -0,0 +1,186 @@
+# utils/context_pool.py
+from __future__ import annotations
+
+from collections import deque
+from pathlib import Path
+from typing import Any, cast
+
+from playwright.sync_api import (
+    Browser,
+    BrowserContext,
+    Error as PWError,
+    Route,
+    StorageState,
+)
+
+from utils.auth_state import load_state, state_source
+
+# Blank document served while restoring localStorage, so no real request leaves the context
+_BLANK_HTML = "<!doctype html><html><head></head><body></body></html>"
+
+_RESTORE_STORAGE_JS = """
+(items) => {
+    localStorage.clear();
+    sessionStorage.clear();
+    for (const { name, value } of items) localStorage.setItem(name, value);
+}
+"""
+
+
+class ContextPool:
+    """
+    Per-worker pool of logged-in browser contexts, reset in place between tests.
+
+    The sync Playwright API cannot create a context while a test is driving the
+    browser, so warming happens between tests: a context handed back by a
+    finished test is reset immediately and parked, and `prewarm` parks one for
+    the next test's profile if none is idle, making the next `acquire` a pop
+    instead of a `new_context(storage_state=...)` round-trip.
+    """
+
+    def __init__(
+        self, browser: Browser, *, max_idle: int = 2, max_uses: int = 50
+    ) -> None:
+        self._browser = browser
+        self._max_idle = max_idle
+        self._max_uses = max_uses
+        # profile -> ((file read, its mtime), storage_state); see auth_state.state_source
+        self._states: dict[str, tuple[tuple[Path, int], StorageState]] = {}
+        # Idle contexts in release order (oldest first) — the eviction order
+        self._idle: deque[tuple[str, BrowserContext]] = deque()
+        self._profile_of: dict[BrowserContext, str] = {}
+        self._uses: dict[BrowserContext, int] = {}
+
+    # -------- public API --------
+    def acquire(self, profile: str, state_file: Path) -> BrowserContext:
+        """Return a clean context for `profile`, reusing a parked one when possible."""
+        state = self._state_for(profile, state_file)
+        ctx = self._pop_idle(profile)
+        while ctx is not None and not _connected(ctx):
+            # Parked in a browser that went away (e.g. a relaunched shared server)
+            self._discard(ctx)
+            ctx = self._pop_idle(profile)
+        if ctx is None:
+            ctx = self._create(profile, state)
+        self._uses[ctx] += 1
+        return ctx
+
+    def release(self, ctx: BrowserContext) -> None:
+        """Reset `ctx` in place and park it for the next test, or close it if evicted."""
+        profile = self._profile_of.get(ctx)
+        if profile is None:
+            return
+        if self._uses[ctx] >= self._max_uses or self._max_idle <= 0:
+            self._discard(ctx)
+            return
+        try:
+            self._reset(ctx, self._states[profile][1])
+        except PWError:
+            # Broken context (crashed page, closed browser): fall back to a fresh one next time
+            self._discard(ctx)
+            return
+        while len(self._idle) >= self._max_idle:
+            _, oldest = self._idle.popleft()
+            self._discard(oldest)
+        self._idle.append((profile, ctx))
+
+    def prewarm(self, profile: str, state_file: Path, count: int = 1) -> None:
+        """
+        Park up to `count` idle contexts for `profile` before the test that needs
+        them, evicting the oldest idle contexts of other profiles to make room.
+        """
+        state = self._state_for(profile, state_file)
+        parked = sum(1 for p, _ in self._idle if p == profile)
+        while parked < min(count, self._max_idle):
+            if len(self._idle) >= self._max_idle:
+                other = next((e for e in self._idle if e[0] != profile), None)
+                if other is None:
+                    return
+                self._idle.remove(other)
+                self._discard(other[1])
+            self._idle.append((profile, self._create(profile, state)))
+            parked += 1
+
+    def close(self) -> None:
+        """Close every context the pool still owns."""
+        for ctx in list(self._profile_of):
+            self._discard(ctx)
+        self._idle.clear()
+
+    # -------- internals --------
+    def _state_for(self, profile: str, state_file: Path) -> StorageState:
+        """
+        Parse the storage_state once; re-read only when the copy `load_state`
+        reads changed (a rewritten state or a newly written compact `.json.gz`).
+        """
+        source = state_source(state_file)
+        cached = self._states.get(profile)
+        if cached is None or cached[0] != source:
+            if cached is not None:
+                self._drop_profile(profile)
+            state = load_state(state_file)
+            self._states[profile] = (source, state)
+            return state
+        return cached[1]
+
+    def _pop_idle(self, profile: str) -> BrowserContext | None:
+        for i, (p, ctx) in enumerate(self._idle):
+            if p == profile:
+                del self._idle[i]
+                return ctx
+        return None
+
+    def _create(self, profile: str, state: StorageState) -> BrowserContext:
+        ctx = self._browser.new_context(storage_state=state)
+        self._profile_of[ctx] = profile
+        self._uses[ctx] = 0
+        return ctx
+
+    def _discard(self, ctx: BrowserContext) -> None:
+        self._profile_of.pop(ctx, None)
+        self._uses.pop(ctx, None)
+        try:
+            ctx.close()
+        except PWError:
+            pass
+
+    def _drop_profile(self, profile: str) -> None:
+        """Forget idle contexts built from an outdated state file."""
+        stale = [ctx for p, ctx in self._idle if p == profile]
+        self._idle = deque((p, c) for p, c in self._idle if p != profile)
+        for ctx in stale:
+            self._discard(ctx)
+
+    @staticmethod
+    def _reset(ctx: BrowserContext, state: StorageState) -> None:
+        """Close pages, drop routes/permissions and restore cookies + localStorage."""
+        for page in list(ctx.pages):
+            page.close()
+        ctx.unroute_all(behavior="ignoreErrors")
+        ctx.clear_permissions()
+        ctx.set_extra_http_headers({})
+        ctx.set_offline(False)
+        ctx.clear_cookies()
+        if state.get("cookies"):
+            # Saved cookies are valid add_cookies() input; its SetCookieParam type is private
+            ctx.add_cookies(cast(Any, state["cookies"]))
+
+        origins = state.get("origins") or []
+        if not origins:
+            return
+        page = ctx.new_page()
+        try:
+            page.route("**/*", _fulfill_blank)
+            for origin in origins:
+                page.goto(f"{origin['origin']}/", wait_until="domcontentloaded")
+                page.evaluate(_RESTORE_STORAGE_JS, origin.get("localStorage", []))
+        finally:
+            page.close()
+
+
+def _connected(ctx: BrowserContext) -> bool:
+    return ctx.browser is None or ctx.browser.is_connected()
+
+
+def _fulfill_blank(route: Route) -> None:
+    route.fulfill(status=200, content_type="text/html", body=_BLANK_HTML)
@@ -0,0 +1,787 @@
+# utils/fake_page.py
+# A browser-free stand-in for playwright's sync Page/Locator over a static HTML
+# document, for POM contract tests that run in milliseconds.
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Any, Callable, Iterator
+from urllib.parse import urljoin
+
+from playwright.sync_api import Error as PWError, TimeoutError as PWTimeout
+
+from pages.ad_detail_page import EXTRACT_JS, EXTRACT_WHEN_READY_JS
+from pages.home_page import AD_HREFS_JS, AD_TITLES_JS
+from pages.search_results_page import (
+    CARDS_JS,
+    FILTERS_JS,
+    MORE_CARDS_JS,
+    SCROLL_JS,
+)
+from utils.login_probe import PROBE_JS
+
+_VOID = frozenset(
+    "area base br col embed hr img input link meta source track wbr".split()
+)
+# Never rendered, whatever their styles say
+_NOT_RENDERED = frozenset({"head", "script", "style", "template", "title", "noscript"})
+
+
+# -------- document --------
+class Element:
+    """A parsed element; children are Elements and text strings in document order."""
+
+    __slots__ = ("tag", "attrs", "parent", "children")
+
+    def __init__(self, tag: str, attrs: dict[str, str], parent: Element | None):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children: list[Element | str] = []
+
+    def __repr__(self) -> str:
+        marker = self.attrs.get("data-marker")
+        return f"<{self.tag}{f' data-marker={marker!r}' if marker else ''}>"
+
+    def iter(self) -> Iterator[Element]:
+        """Descendants (not self) in document order."""
+        for child in self.children:
+            if isinstance(child, Element):
+                yield child
+                yield from child.iter()
+
+    @property
+    def text_content(self) -> str:
+        return "".join(
+            c if isinstance(c, str) else c.text_content for c in self.children
+        )
+
+    @property
+    def inner_text(self) -> str:
+        parts = [
+            c if isinstance(c, str) else c.inner_text
+            for c in self.children
+            if isinstance(c, str) or c.visible
+        ]
+        return re.sub(r"[ \t\r\f\v]+", " ", "".join(parts)).strip()
+
+    @property
+    def visible(self) -> bool:
+        """No `hidden`, display:none or visibility:hidden on it or an ancestor."""
+        el: Element | None = self
+        while el is not None and el.tag != "#document":
+            style = el.attrs.get("style", "").replace(" ", "").lower()
+            if (
+                el.tag in _NOT_RENDERED
+                or "hidden" in el.attrs
+                or "display:none" in style
+                or "visibility:hidden" in style
+            ):
+                return False
+            el = el.parent
+        return True
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root = Element("#document", {}, None)
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        el = Element(tag, {k: v or "" for k, v in attrs}, self._stack[-1])
+        self._stack[-1].children.append(el)
+        if tag not in _VOID:
+            self._stack.append(el)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        el = Element(tag, {k: v or "" for k, v in attrs}, self._stack[-1])
+        self._stack[-1].children.append(el)
+
+    def handle_endtag(self, tag: str) -> None:
+        for depth in range(len(self._stack) - 1, 0, -1):
+            if self._stack[depth].tag == tag:
+                del self._stack[depth:]
+                return
+
+    def handle_data(self, data: str) -> None:
+        self._stack[-1].children.append(data)
+
+
+def parse_html(html: str) -> Element:
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+# -------- selectors --------
+# Supported: tag, *, #id, .class, [attr], [attr=v] (also ~= ^= $= *=),
+# :has-text("..."), :visible, descendant and child (>) combinators, "a, b" lists.
+_ATTR = re.compile(
+    r"""\[\s*([\w:-]+)\s*(?:([~^$*]?=)\s*(?:"([^"]*)"|'([^']*)'|([^\]\s]+)))?\s*\]"""
+)
+_PSEUDO = re.compile(r""":(has-text|visible)(?:\(\s*(?:"([^"]*)"|'([^']*)')\s*\))?""")
+_SIMPLE = re.compile(r"([#.]?)([\w-]+|\*)")
+
+
+@dataclass
+class _Compound:
+    tag: str | None = None
+    checks: list[Callable[[Element], bool]] = field(default_factory=list)
+
+    def matches(self, el: Element) -> bool:
+        if self.tag not in (None, "*") and el.tag != self.tag:
+            return False
+        return all(check(el) for check in self.checks)
+
+
+def _norm(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def _attr_check(name: str, op: str | None, value: str) -> Callable[[Element], bool]:
+    def check(el: Element) -> bool:
+        if name not in el.attrs:
+            return False
+        actual = el.attrs[name]
+        if op is None:
+            return True
+        if op == "=":
+            return actual == value
+        if op == "~=":
+            return value in actual.split()
+        if op == "^=":
+            return actual.startswith(value)
+        if op == "$=":
+            return actual.endswith(value)
+        return value in actual  # *=
+
+    return check
+
+
+def _has_text(needle: str) -> Callable[[Element], bool]:
+    """playwright's :has-text(): case-insensitive substring of the whitespace-normalized text."""
+    needle = _norm(needle)
+    return lambda el: needle in _norm(el.text_content)
+
+
+def _parse_compound(text: str, selector: str) -> _Compound:
+    compound = _Compound()
+    pos = 0
+    while pos < len(text):
+        if text[pos] == "[":
+            m = _ATTR.match(text, pos)
+            if not m:
+                raise ValueError(f"Unsupported attribute selector in {selector!r}")
+            name, op, v1, v2, v3 = m.groups()
+            value = next((v for v in (v1, v2, v3) if v is not None), "")
+            compound.checks.append(_attr_check(name, op, value))
+        elif text[pos] == ":":
+            m = _PSEUDO.match(text, pos)
+            if not m:
+                raise ValueError(f"Unsupported pseudo-class in {selector!r}")
+            if m.group(1) == "visible":
+                compound.checks.append(lambda el: el.visible)
+            else:
+                needle = m.group(2) if m.group(2) is not None else m.group(3)
+                compound.checks.append(_has_text(needle))
+        else:
+            m = _SIMPLE.match(text, pos)
+            if not m:
+                raise ValueError(f"Unsupported selector {selector!r}")
+            kind, name = m.groups()
+            if kind == "#":
+                compound.checks.append(_attr_check("id", "=", name))
+            elif kind == ".":
+                compound.checks.append(_attr_check("class", "~=", name))
+            else:
+                compound.tag = name.lower()
+        pos = m.end()
+    return compound
+
+
+def _split_top_level(selector: str, separators: str) -> list[str]:
+    """Split on `separators` outside quotes, brackets and parentheses (kept as tokens)."""
+    parts, current, depth, quote = [], "", 0, ""
+    for ch in selector:
+        if quote:
+            quote = "" if ch == quote else quote
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "[(":
+            depth += 1
+        elif ch in "])":
+            depth -= 1
+        elif depth == 0 and ch in separators:
+            parts.append(current)
+            current = ""
+            if ch != ",":
+                parts.append(ch)
+            continue
+        current += ch
+    parts.append(current)
+    return parts
+
+
+# One complex selector: compounds with the combinator to their left (" " or ">")
+_Complex = list[tuple[str, _Compound]]
+
+
+def parse_selector(selector: str) -> list[_Complex]:
+    if selector.strip().startswith(("text=", "css=", "xpath=", "//")):
+        raise ValueError(f"Only CSS selectors are supported by FakePage: {selector!r}")
+    complexes = []
+    for part in _split_top_level(selector, ","):
+        steps: _Complex = []
+        combinator = " "
+        for token in _split_top_level(part.strip(), " >"):
+            if token in (" ", ">"):
+                combinator = ">" if token == ">" or combinator == ">" else " "
+                continue
+            if token.strip():
+                steps.append((combinator, _parse_compound(token.strip(), selector)))
+                combinator = " "
+        if not steps:
+            raise ValueError(f"Empty selector in {selector!r}")
+        complexes.append(steps)
+    return complexes
+
+
+def _matches(el: Element, steps: _Complex, scope: Element) -> bool:
+    combinator, compound = steps[-1]
+    if not compound.matches(el):
+        return False
+    if len(steps) == 1:
+        return True
+    ancestor = el.parent
+    while ancestor is not None and ancestor is not scope.parent:
+        if _matches(ancestor, steps[:-1], scope):
+            return True
+        if combinator == ">":
+            return False
+        ancestor = ancestor.parent
+    return False
+
+
+def query_all(scope: Element, selector: str) -> list[Element]:
+    """Descendants of `scope` matching `selector`, in document order."""
+    complexes = parse_selector(selector)
+    return [el for el in scope.iter() if any(_matches(el, c, scope) for c in complexes)]
+
+
+# -------- roles / text --------
+_INPUT_ROLES = {
+    "button": "button",
+    "submit": "button",
+    "reset": "button",
+    "image": "button",
+    "checkbox": "checkbox",
+    "radio": "radio",
+    "text": "textbox",
+    "email": "textbox",
+    "tel": "textbox",
+    "url": "textbox",
+    "search": "searchbox",
+}
+
+
+def role_of(el: Element) -> str | None:
+    """Explicit `role`, else the implicit ARIA role of the tags POMs target."""
+    if "role" in el.attrs:
+        return el.attrs["role"]
+    if el.tag == "input":
+        return _INPUT_ROLES.get(el.attrs.get("type", "text").lower())
+    if el.tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+        return "heading"
+    return {
+        "button": "button",
+        "textarea": "textbox",
+        "select": "combobox",
+        "img": "img",
+        "a": "link" if "href" in el.attrs else None,
+    }.get(el.tag)
+
+
+def accessible_name(el: Element) -> str:
+    for attr in ("aria-label", "alt"):
+        if el.attrs.get(attr):
+            return el.attrs[attr].strip()
+    if el.tag == "input" and el.attrs.get("type") in ("button", "submit", "reset"):
+        return el.attrs.get("value", "").strip()
+    return re.sub(r"\s+", " ", el.text_content).strip()
+
+
+def _text_matches(actual: str, expected: str, exact: bool) -> bool:
+    if exact:
+        return re.sub(r"\s+", " ", actual).strip() == expected
+    return _norm(expected) in _norm(actual)
+
+
+# -------- page / locator --------
+@dataclass(frozen=True)
+class Call:
+    """One Page/Locator call that would cross the wire to a real browser."""
+
+    target: str
+    method: str
+    args: tuple[Any, ...] = ()
+
+
+# JS the POMs send, emulated over the parsed document: script -> fn(page, arg) for
+# evaluate/wait_for_function, fn(elements, arg, page) for evaluate_all
+SCRIPTS: dict[str, Callable[..., Any]] = {}
+
+
+def emulates(script: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Register a Python stand-in for a JS snippet passed to evaluate*/wait_for_function."""
+
+    def register(fn: Callable[..., Any]) -> Callable[..., Any]:
+        SCRIPTS[script] = fn
+        return fn
+
+    return register
+
+
+class UnknownScript(LookupError):
+    """A POM sent a script that no `@emulates` function stands in for."""
+
+    def __init__(self, script: str) -> None:
+        super().__init__(
+            f"FakePage cannot run this script; register it with @emulates: {script[:80]!r}"
+        )
+        self.script = script
+
+
+def _script(script: str) -> Callable[..., Any]:
+    try:
+        return SCRIPTS[script]
+    except KeyError:
+        raise UnknownScript(script) from None
+
+
+class FakeJSHandle:
+    """A handle to a script's result; reading it is one more round-trip."""
+
+    def __init__(self, page: FakePage, value: Any) -> None:
+        self._page = page
+        self._value = value
+
+    def json_value(self) -> Any:
+        self._page.calls.append(Call("handle", "json_value"))
+        return self._value
+
+
+class FakeLocator:
+    """Lazy like playwright's Locator: resolved against the document on every call."""
+
+    def __init__(
+        self, page: FakePage, resolve: Callable[[], list[Element]], description: str
+    ) -> None:
+        self.page = page
+        self._resolve = resolve
+        self.description = description
+
+    def __repr__(self) -> str:
+        return f"<FakeLocator {self.description}>"
+
+    # ---- chaining (no round-trip) ----
+    def locator(self, selector: str) -> FakeLocator:
+        def resolve() -> list[Element]:
+            found: list[Element] = []
+            for scope in self._resolve():
+                found += [el for el in query_all(scope, selector) if el not in found]
+            return found
+
+        return FakeLocator(self.page, resolve, f"{self.description} >> {selector}")
+
+    def nth(self, index: int) -> FakeLocator:
+        def resolve() -> list[Element]:
+            elements = self._resolve()
+            try:
+                return [elements[index]]
+            except IndexError:
+                return []
+
+        return FakeLocator(self.page, resolve, f"{self.description} >> nth={index}")
+
+    @property
+    def first(self) -> FakeLocator:
+        return self.nth(0)
+
+    @property
+    def last(self) -> FakeLocator:
+        return self.nth(-1)
+
+    def get_by_role(
+        self, role: str, *, name: str | None = None, exact: bool = False
+    ) -> FakeLocator:
+        return self.page._by_role(self._resolve, role, name, exact, self.description)
+
+    def get_by_text(self, text: str, *, exact: bool = False) -> FakeLocator:
+        return self.page._by_text(self._resolve, text, exact, self.description)
+
+    # ---- calls ----
+    def _record(self, method: str, *args: Any) -> None:
+        self.page.calls.append(Call(self.description, method, args))
+
+    def _one(self, timeout: float | None = None) -> Element:
+        """playwright's strictness: exactly one match, or the call fails."""
+        elements = self._resolve()
+        if len(elements) > 1:
+            raise PWError(
+                f"strict mode violation: {self.description} resolved to "
+                f"{len(elements)} elements"
+            )
+        if not elements:
+            raise PWTimeout(
+                f"Timeout {timeout or 30_000}ms exceeded waiting for {self.description}"
+            )
+        return elements[0]
+
+    def count(self) -> int:
+        self._record("count")
+        return len(self._resolve())
+
+    def all(self) -> list[FakeLocator]:
+        self._record("all")
+        return [self.nth(i) for i in range(len(self._resolve()))]
+
+    def is_visible(self) -> bool:
+        self._record("is_visible")
+        elements = self._resolve()
+        if len(elements) > 1:
+            self._one()
+        return bool(elements) and elements[0].visible
+
+    def is_hidden(self) -> bool:
+        return not self.is_visible()
+
+    def wait_for(self, *, state: str = "visible", timeout: float | None = None) -> None:
+        self._record("wait_for", state)
+        elements = self._resolve()
+        if len(elements) > 1:
+            self._one()
+        met = {
+            "attached": bool(elements),
+            "detached": not elements,
+            "visible": bool(elements) and elements[0].visible,
+            "hidden": not elements or not elements[0].visible,
+        }[state]
+        if not met:
+            raise PWTimeout(
+                f"Timeout {timeout or 30_000}ms exceeded waiting for "
+                f"{self.description} to be {state}"
+            )
+
+    def text_content(self, *, timeout: float | None = None) -> str:
+        self._record("text_content")
+        return self._one(timeout).text_content
+
+    def inner_text(self, *, timeout: float | None = None) -> str:
+        self._record("inner_text")
+        return self._one(timeout).inner_text
+
+    def all_text_contents(self) -> list[str]:
+        self._record("all_text_contents")
+        return [el.text_content for el in self._resolve()]
+
+    def get_attribute(self, name: str, *, timeout: float | None = None) -> str | None:
+        self._record("get_attribute", name)
+        return self._one(timeout).attrs.get(name)
+
+    def input_value(self, *, timeout: float | None = None) -> str:
+        self._record("input_value")
+        return self._one(timeout).attrs.get("value", "")
+
+    def fill(self, value: str, *, timeout: float | None = None) -> None:
+        self._record("fill", value)
+        self._one(timeout).attrs["value"] = value
+
+    def click(self, *, timeout: float | None = None, **kwargs: Any) -> None:
+        self._record("click")
+        self._one(timeout)
+
+    def evaluate_all(self, expression: str, arg: Any = None) -> Any:
+        self._record("evaluate_all", expression, arg)
+        return _script(expression)(self._resolve(), arg, self.page)
+
+
+class FakePage:
+    """
+    The subset of playwright's sync Page the POMs use, over parsed HTML.
+
+    Every call that would be a round-trip to a real browser is appended to
+    `calls` (building locators is lazy and free, as in playwright). Scripts
+    passed to evaluate/wait_for_function run through their registered Python
+    emulation (`SCRIPTS`). The document never changes by itself, so waits
+    succeed or time out immediately; `goto` loads the HTML from `routes`.
+    """
+
+    def __init__(
+        self,
+        html: str = "",
+        url: str = "about:blank",
+        routes: dict[str, str] | None = None,
+    ) -> None:
+        self.url = url
+        self.routes = dict(routes or {})
+        self.calls: list[Call] = []
+        self._load(html)
+        self._closed = False
+
+    @property
+    def round_trips(self) -> int:
+        return len(self.calls)
+
+    def calls_to(self, method: str) -> list[Call]:
+        return [c for c in self.calls if c.method == method]
+
+    def _record(self, method: str, *args: Any) -> None:
+        self.calls.append(Call("page", method, args))
+
+    def _load(self, html: str) -> None:
+        self._html = html
+        self.document = parse_html(html)
+
+    # ---- locators (no round-trip) ----
+    def locator(self, selector: str) -> FakeLocator:
+        parse_selector(selector)  # fail fast on unsupported syntax, as playwright does
+        return FakeLocator(self, lambda: query_all(self.document, selector), selector)
+
+    def get_by_role(
+        self, role: str, *, name: str | None = None, exact: bool = False
+    ) -> FakeLocator:
+        return self._by_role(lambda: [self.document], role, name, exact, "page")
+
+    def get_by_text(self, text: str, *, exact: bool = False) -> FakeLocator:
+        return self._by_text(lambda: [self.document], text, exact, "page")
+
+    def _by_role(
+        self,
+        scopes: Callable[[], list[Element]],
+        role: str,
+        name: str | None,
+        exact: bool,
+        parent: str,
+    ) -> FakeLocator:
+        def resolve() -> list[Element]:
+            return [
+                el
+                for scope in scopes()
+                for el in scope.iter()
+                if el.visible
+                and role_of(el) == role
+                and (name is None or _text_matches(accessible_name(el), name, exact))
+            ]
+
+        label = f"role={role}" + (f"[name={name!r}]" if name is not None else "")
+        return FakeLocator(self, resolve, f"{parent} >> {label}")
+
+    def _by_text(
+        self,
+        scopes: Callable[[], list[Element]],
+        text: str,
+        exact: bool,
+        parent: str,
+    ) -> FakeLocator:
+        def resolve() -> list[Element]:
+            hits = [
+                el
+                for scope in scopes()
+                for el in scope.iter()
+                if el.tag not in _NOT_RENDERED
+                and _text_matches(el.text_content, text, exact)
+            ]
+            # The innermost elements holding the text, like playwright's text engine
+            return [el for el in hits if not any(h.parent is el for h in hits)]
+
+        return FakeLocator(self, resolve, f"{parent} >> text={text!r}")
+
+    # ---- page calls ----
+    def goto(self, url: str, **kwargs: Any) -> None:
+        self._record("goto", url)
+        self.url = urljoin(self.url, url)
+        self._load(self.routes.get(self.url, ""))
+
+    def set_content(self, html: str, **kwargs: Any) -> None:
+        self._record("set_content")
+        self._load(html)
+
+    def content(self) -> str:
+        self._record("content")
+        return self._html
+
+    def title(self) -> str:
+        self._record("title")
+        found = query_all(self.document, "title")
+        return found[0].text_content.strip() if found else ""
+
+    def wait_for_load_state(self, state: str = "load", **kwargs: Any) -> None:
+        self._record("wait_for_load_state", state)
+
+    def set_default_timeout(self, timeout: float) -> None:
+        pass  # local setting in playwright too: no round-trip
+
+    def evaluate(self, expression: str, arg: Any = None) -> Any:
+        self._record("evaluate", expression, arg)
+        return _script(expression)(self, arg)
+
+    def wait_for_function(
+        self,
+        expression: str,
+        *,
+        arg: Any = None,
+        timeout: float | None = None,
+        **kw: Any,
+    ) -> FakeJSHandle:
+        self._record("wait_for_function", expression, arg)
+        value = _script(expression)(self, arg)
+        if not value:
+            raise PWTimeout(f"Timeout {timeout or 30_000}ms exceeded.")
+        return FakeJSHandle(self, value)
+
+    def screenshot(self, **kwargs: Any) -> bytes:
+        self._record("screenshot")
+        return b""
+
+    def is_closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        self._record("close")
+        self._closed = True
+
+
+# -------- emulated POM scripts --------
+def _first(page: FakePage, selector: str) -> Element | None:
+    found = query_all(page.document, selector)
+    return found[0] if found else None
+
+
+def _text_or(el: Element | None, default: Any) -> Any:
+    return el.text_content.strip() if el is not None and el.text_content else default
+
+
+@emulates(AD_TITLES_JS)
+def _ad_titles(elements: list[Element], n: int, page: FakePage) -> list[str]:
+    return [el.text_content for el in elements[:n]]
+
+
+@emulates(AD_HREFS_JS)
+def _ad_hrefs(elements: list[Element], n: int, page: FakePage) -> list[str]:
+    # `el.href` is the resolved URL on links only; elsewhere it is undefined
+    hrefs = [
+        urljoin(page.url, el.attrs["href"])
+        for el in elements[:n]
+        if el.tag in ("a", "area") and "href" in el.attrs
+    ]
+    return [href for href in hrefs if href]
+
+
+@emulates(EXTRACT_JS)
+def _extract(page: FakePage, arg: dict[str, Any]) -> dict[str, Any] | None:
+    sel = arg["sel"]
+    title, price = _first(page, sel["title"]), _first(page, sel["price"])
+    shown = [el is not None and el.visible for el in (title, price)]
+    if arg["ready"] and not all(shown):
+        return None
+    location = _first(page, sel["location"])
+    return {
+        "title": _text_or(title, ""),
+        "price": _text_or(price, ""),
+        "location": _text_or(location, None) if location and location.visible else None,
+        "itemId": _text_or(_first(page, sel["itemId"]), None),
+        "url": page.url,
+    }
+
+
+@emulates(EXTRACT_WHEN_READY_JS)
+def _extract_when_ready(page: FakePage, arg: dict[str, Any]) -> dict[str, Any] | None:
+    # A static document never changes: the first check is the final one
+    return _extract(page, {"sel": arg["sel"], "ready": True})
+
+
+@emulates(CARDS_JS)
+def _cards(page: FakePage, arg: dict[str, Any]) -> dict[str, Any]:
+    sel, offset, limit = arg["sel"], arg["offset"], arg["limit"]
+    cards = query_all(page.document, sel["card"])
+    next_link = _first(page, sel["nextPage"])
+
+    def card(el: Element) -> dict[str, Any]:
+        found = query_all(el, sel["title"])
+        link = found[0] if found else None
+        href = link.attrs.get("href") if link is not None else None
+        price = query_all(el, sel["price"])
+        return {
+            "title": _text_or(link, ""),
+            "price": _text_or(price[0] if price else None, ""),
+            "href": urljoin(page.url, href) if href is not None else None,
+            "itemId": el.attrs.get("data-item-id"),
+        }
+
+    next_href = next_link.attrs.get("href") if next_link is not None else None
+    return {
+        "total": len(cards),
+        "next": urljoin(page.url, next_href) if next_href else None,
+        "cards": [card(el) for el in cards[offset : offset + limit]],
+    }
+
+
+@emulates(SCROLL_JS)
+def _scroll(page: FakePage, arg: Any) -> None:
+    return None
+
+
+@emulates(MORE_CARDS_JS)
+def _more_cards(page: FakePage, arg: dict[str, Any]) -> bool:
+    return len(query_all(page.document, arg["sel"])) > arg["rendered"]
+
+
+def _control_value(el: Element) -> str:
+    """`.value` of an input, or of a select (its selected option, else the first)."""
+    if el.tag != "select":
+        return el.attrs.get("value", "")
+    options = query_all(el, "option")
+    chosen = next((o for o in options if "selected" in o.attrs), None)
+    chosen = chosen or (options[0] if options else None)
+    if chosen is None:
+        return ""
+    return chosen.attrs.get("value", chosen.text_content)
+
+
+@emulates(FILTERS_JS)
+def _filters(page: FakePage, arg: dict[str, Any]) -> dict[str, Any]:
+    sel = arg["sel"]
+    controls = {name: _first(page, sel[name]) for name in sel}
+
+    def value(name: str) -> str | None:
+        el = controls[name]
+        return _control_value(el) if el is not None else None
+
+    box = controls["delivery"]
+    return {
+        "url": page.url,
+        "query": value("query"),
+        "priceFrom": value("priceFrom"),
+        "priceTo": value("priceTo"),
+        "sort": value("sort"),
+        "delivery": "checked" in box.attrs if box is not None else None,
+    }
+
+
+@emulates(PROBE_JS)
+def _probe(page: FakePage, s: dict[str, Any]) -> str | None:
+    url = page.url.lower()
+    if "profile/login" in url or query_all(page.document, s["loginForm"]):
+        return "logged_out"
+    if any(el.visible for el in query_all(page.document, s["profileMarkers"])):
+        return "logged_in"
+    clickable = [el for el in query_all(page.document, "a, button") if el.visible]
+    labels = [el.text_content.strip() for el in clickable]
+    if any(t in label for label in labels for t in s["profileTexts"]):
+        return "logged_in"
+    if any(s["continueText"] in label for label in labels):
+        return "interstitial"
+    return "logged_in" if "/profile" in url else None
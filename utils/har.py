@@ -0,0 +1,79 @@
+# utils/har.py
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+from playwright.async_api import (
+    BrowserContext as AsyncBrowserContext,
+    Route as AsyncRoute,
+)
+from playwright.sync_api import BrowserContext, Route
+
+
+class HarSession:
+    """Records or replays the traffic of one test's contexts."""
+
+    def __init__(self, mode: str, har_dir: Path, nodeid: str) -> None:
+        self.mode = mode  # "record" | "replay"
+        self._base = har_dir / re.sub(r"[^\w.-]+", "_", nodeid).strip("_")
+        self._contexts = 0
+        self.unmatched: list[str] = []
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    def har_path(self, index: int) -> Path:
+        """One archive per context: `<test>.har`, `<test>-1.har`, ..."""
+        return self._base.with_name(
+            self._base.name + (f"-{index}" if index else "") + ".har"
+        )
+
+    def attach(self, context: BrowserContext) -> None:
+        """
+        Record into, or replay from, this test's next archive. Routing is
+        context-wide, so popups (e.g. the ad opened from a search result) are covered.
+        Recording is flushed when the context closes, so it needs a non-pooled context.
+        """
+        path = self._next_path()
+        if self.recording:
+            context.route_from_har(
+                path, update=True, update_content="embed", update_mode="minimal"
+            )
+            return
+        # Registered first, so it runs last: only requests the HAR could not serve
+        context.route("**/*", self._abort_unmatched)
+        context.route_from_har(path, not_found="fallback")
+
+    async def attach_async(self, context: AsyncBrowserContext) -> None:
+        """`attach` for contexts of the async API."""
+        path = self._next_path()
+        if self.recording:
+            await context.route_from_har(
+                path, update=True, update_content="embed", update_mode="minimal"
+            )
+            return
+        await context.route("**/*", self._abort_unmatched_async)
+        await context.route_from_har(path, not_found="fallback")
+
+    def _next_path(self) -> Path:
+        path = self.har_path(self._contexts)
+        self._contexts += 1
+        if self.recording:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        elif not path.exists():
+            pytest.fail(
+                f"No HAR recording for this test: {path}\n"
+                f"Record it first with: pytest --har-record <test>"
+            )
+        return path
+
+    def _abort_unmatched(self, route: Route) -> None:
+        self.unmatched.append(f"{route.request.method} {route.request.url}")
+        route.abort("internetdisconnected")
+
+    async def _abort_unmatched_async(self, route: AsyncRoute) -> None:
+        self.unmatched.append(f"{route.request.method} {route.request.url}")
+        await route.abort("internetdisconnected")
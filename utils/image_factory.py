@@ -0,0 +1,170 @@
+# utils/image_factory.py
+# Photos for upload flows: size/format variants are drawn once with Pillow,
+# cached on disk for every worker and in memory for this one, and handed out
+# as `set_input_files` payloads (no paths, no re-encoding per test).
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+from filelock import FileLock
+from PIL import Image, ImageDraw, ImageOps, UnidentifiedImageError
+from playwright.sync_api import FilePayload
+
+ROOT = Path(__file__).resolve().parents[1]
+IMAGE_CACHE_DIR = Path(
+    os.getenv("AVITO_IMAGE_CACHE_DIR", ROOT / "artifacts" / "image-cache")
+)
+# Photographed base for every variant; a synthetic picture is drawn if it is missing or unreadable
+SOURCE_IMAGE = ROOT / "test_data" / "images" / "test_image.jpg"
+_FORMATS = {
+    "JPEG": ("jpg", "image/jpeg"),
+    "PNG": ("png", "image/png"),
+    "WEBP": ("webp", "image/webp"),
+}
+# Bump to invalidate cached variants after changing how they are drawn
+_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class ImageSpec:
+    """One variant. Different seeds give different pictures (Avito rejects duplicate photos)."""
+
+    width: int = 1280
+    height: int = 960
+    format: str = "JPEG"
+    quality: int = 85
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.format not in _FORMATS:
+            raise ValueError(
+                f"Unsupported image format '{self.format}'. Choose one of: {', '.join(_FORMATS)}"
+            )
+        if self.width <= 0 or self.height <= 0:
+            raise ValueError(
+                f"Image size must be positive, got {self.width}x{self.height}"
+            )
+
+    @property
+    def name(self) -> str:
+        ext = _FORMATS[self.format][0]
+        return f"photo_{self.width}x{self.height}_{self.seed}.{ext}"
+
+
+@dataclass(frozen=True, slots=True)
+class ImageVariant:
+    spec: ImageSpec
+    buffer: bytes
+
+    @property
+    def mime_type(self) -> str:
+        return _FORMATS[self.spec.format][1]
+
+    def payload(self) -> FilePayload:
+        """What `set_input_files` takes instead of a path."""
+        return {
+            "name": self.spec.name,
+            "mimeType": self.mime_type,
+            "buffer": self.buffer,
+        }
+
+
+class ImageFactory:
+    """
+    Encodes each ImageSpec at most once per cache directory. Workers share the
+    disk cache (the first one to need a variant draws it under a file lock, the
+    others read its bytes); within a process, variants stay in memory.
+    """
+
+    def __init__(
+        self, cache_dir: Path = IMAGE_CACHE_DIR, source: Path = SOURCE_IMAGE
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.source = source
+        self.generated = 0  # variants this process had to draw and encode
+        self._memory: dict[ImageSpec, ImageVariant] = {}
+        self._base: Image.Image | None = None
+        self._source_key: str | None = None
+
+    def get(self, spec: ImageSpec | None = None) -> ImageVariant:
+        spec = spec or ImageSpec()
+        variant = self._memory.get(spec)
+        if variant is None:
+            variant = ImageVariant(spec, self._load_or_render(spec))
+            self._memory[spec] = variant
+        return variant
+
+    def payloads(
+        self, count: int, width: int = 1280, height: int = 960, format: str = "JPEG"
+    ) -> list[FilePayload]:
+        """`count` distinct photos of one size/format, ready for `set_input_files`."""
+        return [
+            self.get(ImageSpec(width, height, format, seed=seed)).payload()
+            for seed in range(count)
+        ]
+
+    # -------- internals --------
+    def _load_or_render(self, spec: ImageSpec) -> bytes:
+        path = self.cache_dir / f"{self._key(spec)}.{_FORMATS[spec.format][0]}"
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            pass
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with FileLock(str(path.with_name(path.name + ".lock"))):
+            if path.exists():  # drawn by another worker while we waited
+                return path.read_bytes()
+            data = self._render(spec)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        self.generated += 1
+        return data
+
+    def _key(self, spec: ImageSpec) -> str:
+        if self._source_key is None:
+            try:
+                self._source_key = hashlib.sha256(self.source.read_bytes()).hexdigest()
+            except OSError:
+                self._source_key = "synthetic"
+        raw = f"{_VERSION}|{self._source_key}|{spec!r}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+    def _base_image(self) -> Image.Image | None:
+        if self._base is None:
+            try:
+                with Image.open(self.source) as img:
+                    self._base = img.convert("RGB")
+            except (OSError, UnidentifiedImageError):
+                return None
+        return self._base
+
+    def _render(self, spec: ImageSpec) -> bytes:
+        rng = random.Random(spec.seed)
+        size = (spec.width, spec.height)
+        base = self._base_image()
+        if base is not None:
+            img = ImageOps.fit(base, size)
+        else:
+            img = Image.linear_gradient("L").resize(size).convert("RGB")
+        draw = ImageDraw.Draw(img)
+        # A few seeded shapes, so every seed is a different picture
+        for _ in range(6):
+            x, y = rng.randrange(spec.width), rng.randrange(spec.height)
+            w, h = (
+                rng.randint(8, max(9, spec.width // 3)),
+                rng.randint(8, max(9, spec.height // 3)),
+            )
+            colour = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+            draw.rectangle((x, y, x + w, y + h), fill=colour)
+        buf = io.BytesIO()
+        if spec.format == "PNG":
+            img.save(buf, "PNG")
+        else:
+            img.save(buf, spec.format, quality=spec.quality)
+        return buf.getvalue()
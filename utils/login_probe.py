@@ -0,0 +1,104 @@
+# utils/login_probe.py
+# The one "is this session logged in?" check, shared by conftest and tools/.
+from __future__ import annotations
+
+from typing import Literal
+
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import Error as PWError, Page, TimeoutError as PWTimeout
+
+from utils.perf import timed
+
+LoginState = Literal["logged_in", "logged_out", "interstitial", "unknown"]
+
+CONTINUE_TEXT = "Продолжить"
+# Signals the in-page probe looks for; the first one present decides
+SIGNALS = {
+    "loginForm": "input[name='login'], input[type='password']",
+    "profileMarkers": (
+        '[data-marker="header/username-button"], [data-marker="header/tooltip-list"]'
+    ),
+    "profileTexts": ["Мой профиль", "Мои объявления"],
+    "continueText": CONTINUE_TEXT,
+}
+# Interstitials ("Продолжить") clicked through before giving up
+MAX_INTERSTITIALS = 3
+
+# Resolves to a LoginState as soon as one signal shows up, or null to keep
+# polling (once per animation frame, in the page — no Python round-trips).
+PROBE_JS = """
+(s) => {
+    const url = location.href.toLowerCase();
+    if (url.includes("profile/login") || document.querySelector(s.loginForm)) {
+        return "logged_out";
+    }
+    const shown = (el) => el.getClientRects().length > 0;
+    if ([...document.querySelectorAll(s.profileMarkers)].some(shown)) return "logged_in";
+    const clickable = [...document.querySelectorAll("a, button")].filter(shown);
+    const label = (el) => (el.textContent || "").trim();
+    if (clickable.some((el) => s.profileTexts.some((t) => label(el).includes(t)))) {
+        return "logged_in";
+    }
+    if (clickable.some((el) => label(el).includes(s.continueText))) return "interstitial";
+    if (document.readyState === "complete" && url.includes("/profile")) return "logged_in";
+    return null;
+}
+"""
+
+
+def probe_login(page: Page, timeout: float = 15_000) -> LoginState:
+    """Classify the current page in one in-page wait; "unknown" on timeout."""
+    try:
+        return page.wait_for_function(
+            PROBE_JS, arg=SIGNALS, timeout=timeout
+        ).json_value()
+    except PWTimeout:
+        return "unknown"
+
+
+@timed("auth.probe")
+def wait_for_login_state(page: Page, timeout: float = 15_000) -> LoginState:
+    """`probe_login`, clicking through up to MAX_INTERSTITIALS "continue" screens."""
+    state = probe_login(page, timeout)
+    for _ in range(MAX_INTERSTITIALS):
+        if state != "interstitial":
+            break
+        try:
+            page.get_by_text(CONTINUE_TEXT).first.click()
+        except PWError:
+            pass  # the interstitial went away (or re-rendered) under us; re-probe
+        state = probe_login(page, timeout)
+    return state
+
+
+def is_logged_in(page: Page, timeout: float = 15_000) -> bool:
+    return wait_for_login_state(page, timeout) == "logged_in"
+
+
+# --- async twins (pages/aio, async_login_factory, check_state --all) --------
+async def probe_login_async(page: AsyncPage, timeout: float = 15_000) -> LoginState:
+    try:
+        handle = await page.wait_for_function(PROBE_JS, arg=SIGNALS, timeout=timeout)
+    except PWTimeout:
+        return "unknown"
+    return await handle.json_value()
+
+
+@timed("auth.probe")
+async def wait_for_login_state_async(
+    page: AsyncPage, timeout: float = 15_000
+) -> LoginState:
+    state = await probe_login_async(page, timeout)
+    for _ in range(MAX_INTERSTITIALS):
+        if state != "interstitial":
+            break
+        try:
+            await page.get_by_text(CONTINUE_TEXT).first.click()
+        except PWError:
+            pass
+        state = await probe_login_async(page, timeout)
+    return state
+
+
+async def is_logged_in_async(page: AsyncPage, timeout: float = 15_000) -> bool:
+    return await wait_for_login_state_async(page, timeout) == "logged_in"
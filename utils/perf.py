@@ -0,0 +1,210 @@
+# utils/perf.py
+# Per-test timing: POM steps, fixture setup and browser navigation metrics.
+from __future__ import annotations
+
+import csv
+import functools
+import inspect
+import json
+import os
+import time
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+from playwright.async_api import BrowserContext as AsyncBrowserContext
+from playwright.sync_api import BrowserContext
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Navigation metrics reported by the page, in ms since navigation start
+NAV_METRICS = ("ttfb", "dcl", "load", "fcp", "lcp")
+REPORT_COLUMNS = (
+    *("test", "worker", "kind", "name", "ms", "url"),
+    *NAV_METRICS,
+    *("transfer_bytes", "over_budget"),
+)
+
+PERF_BINDING = "__avitoPerf"
+# Installed in every instrumented context: reports Navigation Timing, paint and
+# the latest LCP candidate of the top frame once `load` has finished.
+NAV_TIMING_JS = f"""
+(() => {{
+    if (window !== window.top) return;
+    let lcp = null;
+    try {{
+        new PerformanceObserver((list) => {{
+            const entries = list.getEntries();
+            lcp = entries[entries.length - 1].startTime;
+        }}).observe({{ type: "largest-contentful-paint", buffered: true }});
+    }} catch (e) {{}}
+    let sent = false;
+    const report = () => {{
+        const nav = performance.getEntriesByType("navigation")[0];
+        if (sent || !nav || typeof window.{PERF_BINDING} !== "function") return;
+        sent = true;
+        const paint = {{}};
+        for (const p of performance.getEntriesByType("paint")) paint[p.name] = p.startTime;
+        window.{PERF_BINDING}({{
+            url: location.href,
+            ttfb: nav.responseStart,
+            dcl: nav.domContentLoadedEventEnd,
+            load: nav.loadEventEnd || null,
+            fcp: paint["first-contentful-paint"] ?? null,
+            lcp,
+            transfer_bytes: nav.transferSize,
+        }});
+    }};
+    addEventListener("load", () => setTimeout(report, 0));
+    addEventListener("pagehide", report);
+}})();
+"""
+
+
+@dataclass
+class PerfRecorder:
+    """Rows collected for one test; see `step`, `timed` and `instrument`."""
+
+    test: str
+    rows: list[dict[str, Any]] = field(default_factory=list)
+    # Navigations are attributed to the POM step that most recently started
+    last_step: str | None = None
+
+    def add(self, kind: str, name: str, ms: float | None, **extra: Any) -> None:
+        self.rows.append(
+            {
+                "test": self.test,
+                "worker": os.getenv("PYTEST_XDIST_WORKER", "main"),
+                "kind": kind,  # "step" | "fixture" | "navigation"
+                "name": name,
+                "ms": None if ms is None else round(ms, 1),
+                **extra,
+            }
+        )
+
+
+_ACTIVE: PerfRecorder | None = None
+# Contexts that already carry the init script and binding (pooled contexts are reused)
+_INSTRUMENTED: weakref.WeakSet[Any] = weakref.WeakSet()
+
+
+def activate(recorder: PerfRecorder | None) -> None:
+    """Route steps and navigation reports to `recorder` (None = off)."""
+    global _ACTIVE
+    _ACTIVE = recorder
+
+
+@contextmanager
+def step(name: str, kind: str = "step") -> Iterator[None]:
+    """Time the enclosed block as `name`; free when no recorder is active."""
+    recorder = _ACTIVE
+    if recorder is None:
+        yield
+        return
+    if kind == "step":
+        recorder.last_step = name
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add(kind, name, (time.perf_counter() - started) * 1000)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator form of `step` for POM methods, sync or async."""
+
+    def decorate(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with step(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with step(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def _on_navigation(source: Any, payload: dict[str, Any]) -> None:
+    recorder = _ACTIVE
+    if recorder is None:
+        return
+    recorder.add(
+        "navigation",
+        recorder.last_step or "unattributed",
+        payload.get("load"),
+        url=payload.get("url"),
+        transfer_bytes=payload.get("transfer_bytes"),
+        **{m: _round(payload.get(m)) for m in NAV_METRICS},
+    )
+
+
+def instrument(context: BrowserContext) -> None:
+    """Report navigation metrics of `context` to the active recorder."""
+    if _ACTIVE is None or context in _INSTRUMENTED:
+        return
+    context.add_init_script(NAV_TIMING_JS)
+    context.expose_binding(PERF_BINDING, _on_navigation)
+    _INSTRUMENTED.add(context)
+
+
+async def instrument_async(context: AsyncBrowserContext) -> None:
+    if _ACTIVE is None or context in _INSTRUMENTED:
+        return
+    await context.add_init_script(NAV_TIMING_JS)
+    await context.expose_binding(PERF_BINDING, _on_navigation)
+    _INSTRUMENTED.add(context)
+
+
+def _round(value: Any) -> float | None:
+    return None if value is None else round(float(value), 1)
+
+
+# -------- budgets / report --------
+def load_budgets(path: Path) -> dict[str, float]:
+    """
+    Budgets in ms: "home.navigate" limits the step's wall time,
+    "home.navigate:lcp" a navigation metric attributed to that step.
+    """
+    return {k: float(v) for k, v in json.loads(path.read_text("utf-8")).items()}
+
+
+def check_budgets(rows: list[dict[str, Any]], budgets: dict[str, float]) -> list[str]:
+    """Mark rows over budget (row["over_budget"]) and return one line per breach."""
+    breaches = []
+    for row in rows:
+        if row["kind"] == "navigation":
+            checks = [(f"{row['name']}:{m}", row.get(m)) for m in NAV_METRICS]
+        else:
+            checks = [(row["name"], row["ms"])]
+        over = [
+            f"{key} {value:.0f}>{budgets[key]:.0f}ms"
+            for key, value in checks
+            if key in budgets and value is not None and value > budgets[key]
+        ]
+        row["over_budget"] = ";".join(over)
+        breaches += [f"{row['test']}: {o}" for o in over]
+    return breaches
+
+
+def write_report(rows: list[dict[str, Any]], out_dir: Path) -> tuple[Path, Path]:
+    """Write perf-report.json and perf-report.csv; returns both paths."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    json_path = out_dir / "perf-report.json"
+    csv_path = out_dir / "perf-report.csv"
+    json_path.write_text(json.dumps(rows, ensure_ascii=False, indent=1), "utf-8")
+    with csv_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, REPORT_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    return json_path, csv_path
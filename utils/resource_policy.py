@@ -0,0 +1,107 @@
+# utils/resource_policy.py
+from __future__ import annotations
+
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext as AsyncBrowserContext
+from playwright.async_api import Route as AsyncRoute
+from playwright.sync_api import BrowserContext, Route
+
+# Hosts (and their subdomains) treated as Avito itself; the AVITO_BASE_URL host is always added
+FIRST_PARTY_HOSTS = tuple(
+    h.strip()
+    for h in os.getenv("AVITO_FIRST_PARTY_HOSTS", "avito.ru,avito.st").split(",")
+    if h.strip()
+)
+DEFAULT_POLICY = os.getenv("AVITO_RESOURCE_POLICY", "full").strip()
+
+# Resource types each policy drops on top of "no-third-party". Stylesheets stay:
+# POMs wait for visibility, which depends on layout.
+_BLOCKED_TYPES = {
+    "full": frozenset(),
+    "no-third-party": frozenset(),
+    "text-only": frozenset({"image", "media", "font"}),
+}
+POLICIES = tuple(_BLOCKED_TYPES)
+
+# Blocked requests are never fetched, so "saved bytes" is an estimate from
+# typical Avito transfer sizes per resource type.
+_EST_BYTES = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 60_000,
+    "script": 80_000,
+    "stylesheet": 30_000,
+}
+_EST_BYTES_OTHER = 5_000
+
+
+@dataclass
+class BlockStats:
+    """Per-test counters for requests a policy refused."""
+
+    blocked: int = 0
+    est_saved_bytes: int = 0
+    by_type: Counter[str] = field(default_factory=Counter)
+
+
+def _host_matches(host: str, domains: tuple[str, ...]) -> bool:
+    return any(host == d or host.endswith(f".{d}") for d in domains)
+
+
+class ResourceBlocker:
+    """Applies a named blocking policy to contexts and counts what it blocked."""
+
+    def __init__(self, policy: str = DEFAULT_POLICY) -> None:
+        if policy not in _BLOCKED_TYPES:
+            raise ValueError(
+                f"Unknown resource policy '{policy}'. Choose one of: {', '.join(POLICIES)}"
+            )
+        self.policy = policy
+        self.stats = BlockStats()
+
+    def apply(self, context: BrowserContext) -> None:
+        """Install the policy on `context` (a no-op for "full")."""
+        if self.policy != "full":
+            context.route("**/*", self._handle)
+
+    async def apply_async(self, context: AsyncBrowserContext) -> None:
+        """`apply` for contexts of the async API (pages/aio, batch tools)."""
+        if self.policy != "full":
+            await context.route("**/*", self._handle_async)
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """Decide for one request; documents are never blocked."""
+        if self.policy == "full" or resource_type == "document":
+            return False
+        if resource_type in _BLOCKED_TYPES[self.policy]:
+            return True
+        host = (urlsplit(url).hostname or "").lower()
+        if not host or urlsplit(url).scheme not in ("http", "https"):
+            return False
+        base_host = (urlsplit(os.getenv("AVITO_BASE_URL", "")).hostname or "").lower()
+        return not _host_matches(host, FIRST_PARTY_HOSTS + (base_host,))
+
+    def _count(self, url: str, resource_type: str) -> bool:
+        """Decide for one request and record it if blocked."""
+        if not self.should_block(url, resource_type):
+            return False
+        self.stats.blocked += 1
+        self.stats.by_type[resource_type] += 1
+        self.stats.est_saved_bytes += _EST_BYTES.get(resource_type, _EST_BYTES_OTHER)
+        return True
+
+    def _handle(self, route: Route) -> None:
+        if self._count(route.request.url, route.request.resource_type):
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    async def _handle_async(self, route: AsyncRoute) -> None:
+        if self._count(route.request.url, route.request.resource_type):
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
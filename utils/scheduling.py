@@ -0,0 +1,183 @@
+# utils/scheduling.py
+# Which profile each test logs in as, how long it took last time, and the
+# per-worker plan built from both (used by plugins/scheduling.py).
+from __future__ import annotations
+
+import ast
+import json
+import math
+from pathlib import Path
+from statistics import median
+
+# Fixtures whose first argument names the profile; called without one they use this
+FACTORY_NAMES = ("login_factory", "async_login_factory")
+DEFAULT_PROFILE = "profile1"
+# Weight of the latest run in the recorded duration (exponential moving average)
+DURATION_SMOOTHING = 0.5
+DEFAULT_DURATION = 1.0
+
+
+# -------- profile discovery --------
+def _marker_profile(decorators: list[ast.expr]) -> str | None:
+    """`@pytest.mark.profile("buyer")` (or `@mark.profile(...)`) -> "buyer"."""
+    for deco in decorators:
+        if (
+            isinstance(deco, ast.Call)
+            and isinstance(deco.func, ast.Attribute)
+            and deco.func.attr == "profile"
+            and deco.args
+            and isinstance(deco.args[0], ast.Constant)
+            and isinstance(deco.args[0].value, str)
+        ):
+            return deco.args[0].value.lower().strip()
+    return None
+
+
+def _called_profile(func: ast.AST) -> str | None:
+    """First `login_factory("x")` / `login_factory(profile="x")` in the test body."""
+    calls = [
+        node
+        for node in ast.walk(func)
+        if isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in FACTORY_NAMES
+    ]
+    for call in sorted(calls, key=lambda c: (c.lineno, c.col_offset)):
+        args = [*call.args[:1], *(k.value for k in call.keywords if k.arg == "profile")]
+        if not args:
+            return DEFAULT_PROFILE
+        if isinstance(args[0], ast.Constant) and isinstance(args[0].value, str):
+            return args[0].value.lower().strip()
+    return None
+
+
+def _module_profiles(tree: ast.Module) -> dict[str, str | None]:
+    """Profile of every test function in a module, keyed "Class::test" or "test"."""
+    module_marker = None
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == "pytestmark" for t in node.targets
+        ):
+            value = node.value
+            markers = (
+                value.elts if isinstance(value, (ast.List, ast.Tuple)) else [value]
+            )
+            module_marker = _marker_profile(markers)
+
+    found: dict[str, str | None] = {}
+
+    def visit(body: list[ast.stmt], prefix: str, inherited: str | None) -> None:
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                marker = _marker_profile(node.decorator_list) or inherited
+                visit(node.body, f"{prefix}{node.name}::", marker)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                found[prefix + node.name] = (
+                    _marker_profile(node.decorator_list)
+                    or inherited
+                    or _called_profile(node)
+                )
+
+    visit(tree.body, "", module_marker)
+    return found
+
+
+def discover_profiles(nodeids: list[str], rootdir: Path) -> dict[str, str | None]:
+    """
+    Profile each test logs in as: its `profile` marker (function, class or
+    module `pytestmark`), else the first literal `login_factory("...")` call
+    in its body; None for tests that log in as nobody (or dynamically).
+    """
+    modules: dict[str, dict[str, str | None]] = {}
+    result: dict[str, str | None] = {}
+    for nodeid in nodeids:
+        path, _, name = nodeid.partition("::")
+        if path not in modules:
+            try:
+                tree = ast.parse((rootdir / path).read_text("utf-8"))
+                modules[path] = _module_profiles(tree)
+            except (OSError, SyntaxError, ValueError):
+                modules[path] = {}
+        result[nodeid] = modules[path].get(name.split("[", 1)[0])
+    return result
+
+
+# -------- duration history --------
+def load_durations(path: Path) -> dict[str, float]:
+    try:
+        return {k: float(v) for k, v in json.loads(path.read_text("utf-8")).items()}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def update_durations(path: Path, measured: dict[str, float]) -> dict[str, float]:
+    """Blend this run's per-test seconds into the history file; returns the result."""
+    history = load_durations(path)
+    for nodeid, seconds in measured.items():
+        old = history.get(nodeid)
+        history[nodeid] = round(
+            seconds
+            if old is None
+            else DURATION_SMOOTHING * seconds + (1 - DURATION_SMOOTHING) * old,
+            3,
+        )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(history, indent=1, sort_keys=True), "utf-8")
+    return history
+
+
+def estimate_durations(nodeids: list[str], history: dict[str, float]) -> list[float]:
+    """Recorded seconds per test; unseen tests get the median of the known ones."""
+    known = [history[n] for n in nodeids if n in history]
+    fallback = median(known) if known else DEFAULT_DURATION
+    return [history.get(n, fallback) for n in nodeids]
+
+
+# -------- planning --------
+def _lightest(loads: list[float]) -> int:
+    return min(range(len(loads)), key=loads.__getitem__)
+
+
+def plan(
+    durations: list[float], profiles: list[str | None], workers: int
+) -> list[list[int]]:
+    """
+    Split test indices into one ordered queue per worker.
+
+    Tests of one profile form a unit that stays on one worker, so the profile
+    is validated and its contexts pooled there once. A profile with more work
+    than a worker's fair share is split into balanced shards. Units are
+    placed longest-first on the least loaded worker; each queue then runs
+    its units in order of their longest test, longest tests first inside.
+    """
+    target = sum(durations) / max(workers, 1)
+    by_profile: dict[str, list[int]] = {}
+    units: list[tuple[float, list[int]]] = []
+    for index, profile in enumerate(profiles):
+        if profile is None:
+            units.append((durations[index], [index]))
+        else:
+            by_profile.setdefault(profile, []).append(index)
+
+    for indices in by_profile.values():
+        indices.sort(key=lambda i: -durations[i])
+        work = sum(durations[i] for i in indices)
+        shards = min(len(indices), max(1, math.ceil(work / target))) if target else 1
+        buckets: list[list[int]] = [[] for _ in range(shards)]
+        loads = [0.0] * shards
+        for i in indices:
+            k = _lightest(loads)
+            buckets[k].append(i)
+            loads[k] += durations[i]
+        units += zip(loads, buckets)
+
+    queues: list[list[list[int]]] = [[] for _ in range(workers)]
+    worker_loads = [0.0] * workers
+    for work, unit in sorted(units, key=lambda u: -u[0]):
+        k = _lightest(worker_loads)
+        queues[k].append(unit)
+        worker_loads[k] += work
+    return [
+        [i for unit in sorted(q, key=lambda u: -durations[u[0]]) for i in unit]
+        for q in queues
+    ]
@@ -0,0 +1,445 @@
+# utils/standin_server.py
+from __future__ import annotations
+
+import html
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from email.message import EmailMessage, MIMEPart
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, quote, urlencode, urlsplit
+
+from playwright.sync_api import StorageState
+
+from pages.search_query import SearchQuery, Sort, parse_amount
+
+# Route names used for latency/failure injection and request counters
+ROUTES = ("home", "search", "item", "login", "profile", "post")
+
+_ITEM_PATH = re.compile(r"^/[\w-]+/[\w-]+/[\w-]+_(\d+)$")
+SESSION_COOKIE = "sessid"
+# Avito's `s` values: cheaper first / dearer first, newest first
+_SORT_LABELS = {
+    Sort.DEFAULT: "По умолчанию",
+    Sort.DATE: "По дате",
+    Sort.PRICE_ASC: "Дешевле",
+    Sort.PRICE_DESC: "Дороже",
+}
+
+
+@dataclass
+class StandInConfig:
+    """Knobs for the stand-in: per-route latency (s) and failure rate (0..1)."""
+
+    result_count: int = 20  # per listing page
+    page_count: int = 3
+    latency: dict[str, float] = field(default_factory=dict)
+    failure_rate: dict[str, float] = field(default_factory=dict)
+    # Credentials accepted by the login form; any sessid cookie counts as logged in
+    username: str = "standin@example.com"
+    password: str = "standin"
+    seed: int = 0
+
+
+def _page(title: str, body: str) -> str:
+    return (
+        "<!doctype html><html lang='ru'><head><meta charset='utf-8'>"
+        f"<title>{html.escape(title)}</title></head><body>"
+        "<header><a href='/profile' data-marker='header/username-button'>Мой профиль</a></header>"
+        f"{body}</body></html>"
+    )
+
+
+@dataclass(frozen=True)
+class PostedAd:
+    """An ad submitted through the stand-in's /additem form."""
+
+    item_id: int
+    title: str
+    price: int | None  # the form's price field, parsed like a listing filter
+    photos: tuple[tuple[str, str, int], ...]  # (file name, content type, bytes)
+
+
+def _multipart(content_type: str, body: bytes) -> tuple[dict[str, str], list[MIMEPart]]:
+    """(text fields, file parts) of a multipart/form-data body."""
+    message = BytesParser(EmailMessage, policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+    )
+    fields: dict[str, str] = {}
+    files: list[MIMEPart] = []
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if part.get_filename() is not None:
+            files.append(part)
+        elif isinstance(name, str):
+            # Browsers send fields in the page's charset (utf-8) without declaring it
+            raw = part.get_payload(decode=True)
+            if isinstance(raw, bytes):
+                fields[name] = raw.decode("utf-8").strip()
+    return fields, files
+
+
+def _page_number(raw: str) -> int:
+    """`p` as Avito treats it: anything but a positive number is page 1."""
+    return int(raw) if raw.isdigit() and int(raw) > 0 else 1
+
+
+def _price(item_id: int) -> int:
+    return 1_000 + (item_id * 7_919) % 150_000
+
+
+def _has_delivery(item_id: int) -> bool:
+    return item_id % 3 != 0
+
+
+def _format_price(value: int) -> str:
+    return f"{value:,}".replace(",", " ") + " ₽"
+
+
+class AvitoStandIn:
+    """
+    Local HTTP server rendering Avito's data-marker structure for the POMs:
+    home search form, result list, ad page, login form and the /profile probe.
+    """
+
+    def __init__(self, config: StandInConfig | None = None) -> None:
+        self.config = config or StandInConfig()
+        self.requests: Counter[str] = Counter()
+        self.posted: list[PostedAd] = []
+        self.failures: Counter[str] = Counter()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    # -------- lifecycle --------
+    def start(self) -> AvitoStandIn:
+        """Bind to a random free port and serve from a daemon thread."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="avito-standin", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None, "stand-in server is not running"
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def storage_state(self, profile: str) -> StorageState:
+        """A storage_state the stand-in accepts as logged in for `profile`."""
+        host = urlsplit(self.base_url).hostname or "127.0.0.1"
+        return {
+            "cookies": [
+                {
+                    "name": SESSION_COOKIE,
+                    "value": f"standin-{profile}",
+                    "domain": host,
+                    "path": "/",
+                    "expires": time.time() + 86_400,
+                    "httpOnly": True,
+                    "secure": False,
+                    "sameSite": "Lax",
+                }
+            ],
+            "origins": [],
+        }
+
+    # -------- fault injection --------
+    def _inject(self, route: str) -> bool:
+        """Apply latency; return True if this request should fail."""
+        with self._lock:
+            self.requests[route] += 1
+            failed = self._rng.random() < self.config.failure_rate.get(route, 0.0)
+            if failed:
+                self.failures[route] += 1
+        delay = self.config.latency.get(route, 0.0)
+        if delay:
+            time.sleep(delay)
+        return failed
+
+    # -------- rendering --------
+    def render_home(self) -> str:
+        return _page(
+            "Авито",
+            "<form action='/all' method='get' data-marker='search-form'>"
+            "<input name='q' data-marker='search-form/suggest/input' placeholder='Поиск по объявлениям'>"
+            "<button type='submit' data-marker='search-form/submit-button'>Найти</button>"
+            "</form>",
+        )
+
+    def catalogue(self, filters: SearchQuery | None = None) -> list[int]:
+        """Item ids a search returns, filtered and sorted like Avito's listing."""
+        f = filters or SearchQuery()
+        count = self.config.result_count * self.config.page_count
+        ids = [
+            item_id
+            for item_id in range(1_000_001, 1_000_001 + count)
+            if (f.price_min is None or _price(item_id) >= f.price_min)
+            and (f.price_max is None or _price(item_id) <= f.price_max)
+            and (not f.delivery or _has_delivery(item_id))
+        ]
+        if f.sort in (Sort.PRICE_ASC, Sort.PRICE_DESC):
+            ids.sort(key=_price, reverse=f.sort is Sort.PRICE_DESC)
+        elif f.sort is Sort.DATE:
+            ids.reverse()
+        return ids
+
+    def render_results(
+        self, query: str, page_no: int = 1, filters: SearchQuery | None = None
+    ) -> str:
+        f = filters or SearchQuery()
+        per_page = self.config.result_count
+        found = self.catalogue(f)
+        region = f.region if f.region != "all" else "moskva"
+        category = f.category or "telefony"
+        cards = []
+        for item_id in found[(page_no - 1) * per_page : page_no * per_page]:
+            i = item_id - 1_000_000
+            title = f"{query or 'Товар'} — объявление {i}"
+            href = f"/{region}/{category}/{quote(_slug(title))}_{item_id}"
+            cards.append(
+                f"<div data-marker='item' data-item-id='{item_id}'>"
+                f"<a data-marker='item-title' href='{href}' target='_blank' itemprop='url'>"
+                f"<h3 itemprop='name'>{html.escape(title)}</h3></a>"
+                f"<p data-marker='item-price'><meta itemprop='price' content='{_price(item_id)}'>"
+                f"{_format_price(_price(item_id))}</p></div>"
+            )
+        pagination = ""
+        if page_no * per_page < len(found):
+            params = {**f.params(), "q": query, "p": str(page_no + 1)}
+            pagination = (
+                f"<a data-marker='pagination-button/nextPage' "
+                f"href='?{html.escape(urlencode(params))}'>Следующая</a>"
+            )
+        return _page(
+            f"{query} — Авито",
+            f"{self._render_filters(query, f)}"
+            f"<div data-marker='catalog-serp'>{''.join(cards)}</div>{pagination}",
+        )
+
+    @staticmethod
+    def _render_filters(query: str, f: SearchQuery) -> str:
+        def amount(value: int | None) -> str:
+            return "" if value is None else f"{value:,}".replace(",", " ")
+
+        sorts = "".join(
+            f"<option value='{sort.value}'{' selected' if sort is f.sort else ''}>{label}</option>"
+            for sort, label in _SORT_LABELS.items()
+        )
+        return (
+            "<form method='get' data-marker='search-filters'>"
+            f"<input name='q' data-marker='search-form/suggest/input' value='{html.escape(query)}'>"
+            f"<input name='pmin' data-marker='price/from' value='{amount(f.price_min)}'>"
+            f"<input name='pmax' data-marker='price/to' value='{amount(f.price_max)}'>"
+            f"<select name='s' data-marker='sort/select'>{sorts}</select>"
+            "<label><input type='checkbox' name='d' value='1' data-marker='delivery-filter/checkbox'"
+            f"{' checked' if f.delivery else ''}>С Авито Доставкой</label>"
+            "</form>"
+        )
+
+    def render_item(self, item_id: int) -> str:
+        index = item_id - 1_000_000
+        return _page(
+            f"Объявление {item_id}",
+            "<div class='js-item-view-title-info'>"
+            f"<h1 data-marker='item-view/title-info'>Объявление {index}</h1>"
+            f"<span data-marker='item-view/item-price'>{_format_price(_price(item_id))}</span>"
+            "</div>"
+            f"<span data-marker='item-view/item-id'>№ {item_id}</span>"
+            "<div itemprop='address'>Москва, Тверская ул., 1</div>",
+        )
+
+    def render_post_ad(self) -> str:
+        return _page(
+            "Новое объявление",
+            "<form method='post' action='/additem' enctype='multipart/form-data' data-marker='post-ad'>"
+            "<input name='title' data-marker='post-ad/title'>"
+            "<textarea name='description' data-marker='post-ad/description'></textarea>"
+            "<input name='price' data-marker='post-ad/price'>"
+            "<label data-marker='post-ad/photos'>Фотографии"
+            "<input type='file' name='photos' accept='image/*' multiple></label>"
+            "<div data-marker='post-ad/previews'></div>"
+            "<button type='submit' data-marker='post-ad/submit'>Разместить</button>"
+            "</form>"
+            f"<script>{_PREVIEW_SCRIPT}</script>",
+        )
+
+    def post_ad(self, fields: dict[str, str], files: list[MIMEPart]) -> PostedAd:
+        photos = tuple(
+            (
+                part.get_filename() or "",
+                part.get_content_type(),
+                len(part.get_content()),
+            )
+            for part in files
+            if part.get_content_type().startswith("image/")
+        )
+        with self._lock:
+            ad = PostedAd(
+                2_000_001 + len(self.posted),
+                fields.get("title", ""),
+                parse_amount(fields.get("price")),
+                photos,
+            )
+            self.posted.append(ad)
+        return ad
+
+    def render_posted(self, ad: PostedAd) -> str:
+        href = f"/moskva/lichnye_veschi/{quote(_slug(ad.title))}_{ad.item_id}"
+        return _page(
+            "Объявление размещено",
+            "<div data-marker='post-ad/success'>"
+            f"<a href='{href}'>{html.escape(ad.title)}</a>"
+            f"<span data-marker='post-ad/photo-count'>{len(ad.photos)} фото</span></div>",
+        )
+
+    def render_login(self, error: str | None = None) -> str:
+        error_html = (
+            f"<div data-marker='login-form/error'>{html.escape(error)}</div>"
+            if error
+            else ""
+        )
+        return (
+            "<!doctype html><html lang='ru'><head><meta charset='utf-8'><title>Вход</title></head><body>"
+            "<form method='post' action='/profile/login' data-marker='login-form'>"
+            "<input name='login' type='text'><input name='password' type='password'>"
+            f"<button type='submit'>Войти</button>{error_html}</form></body></html>"
+        )
+
+    def render_profile(self) -> str:
+        return _page(
+            "Мой профиль",
+            "<h1>Личный кабинет</h1><a href='/profile' data-marker='header/tooltip-list'>Мои объявления</a>",
+        )
+
+
+# Shows a preview per selected file, as Avito's photo step does
+_PREVIEW_SCRIPT = """
+const input = document.querySelector("[data-marker='post-ad/photos'] input");
+input.addEventListener("change", () => {
+    const previews = Array.from(input.files).map((file) => {
+        const img = document.createElement("img");
+        img.dataset.marker = "post-ad/photo-preview";
+        img.alt = file.name;
+        img.width = 80;
+        img.height = 60;
+        img.src = URL.createObjectURL(file);
+        return img;
+    });
+    document.querySelector("[data-marker='post-ad/previews']").replaceChildren(...previews);
+});
+"""
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^\w]+", "_", text.lower()).strip("_")[:40] or "item"
+
+
+def _make_handler(standin: AvitoStandIn) -> type[BaseHTTPRequestHandler]:
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass  # keep pytest output clean
+
+        def do_GET(self) -> None:
+            url = urlsplit(self.path)
+            query = parse_qs(url.query)
+            item = _ITEM_PATH.match(url.path)
+            if url.path == "/favicon.ico":
+                self._send(404, "")
+            elif url.path == "/":
+                self._serve("home", standin.render_home)
+            elif url.path == "/profile/login":
+                self._serve("login", standin.render_login)
+            elif url.path.rstrip("/") == "/additem":
+                if not self._logged_in():
+                    self._redirect("/profile/login")
+                else:
+                    self._serve("post", standin.render_post_ad)
+            elif url.path.rstrip("/") == "/profile":
+                if not self._logged_in():
+                    self._redirect("/profile/login")
+                else:
+                    self._serve("profile", standin.render_profile)
+            elif item:
+                self._serve("item", lambda: standin.render_item(int(item.group(1))))
+            else:
+                page_no = _page_number(query.get("p", [""])[0])
+                filters = SearchQuery.from_url(self.path)
+                self._serve(
+                    "search",
+                    lambda: standin.render_results(filters.text, page_no, filters),
+                )
+
+        def do_POST(self) -> None:
+            path = urlsplit(self.path).path
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length)
+            if path == "/additem" and self._logged_in():
+                fields, files = _multipart(self.headers.get("Content-Type", ""), body)
+                self._serve(
+                    "post",
+                    lambda: standin.render_posted(standin.post_ad(fields, files)),
+                )
+                return
+            if path != "/profile/login":
+                self._send(404, "")
+                return
+            form = parse_qs(body.decode("utf-8"))
+            if standin._inject("login"):
+                self._send(503, "Service Unavailable")
+                return
+            cfg = standin.config
+            if (
+                form.get("login", [""])[0] == cfg.username
+                and form.get("password", [""])[0] == cfg.password
+            ):
+                self._redirect("/profile", cookie=f"{SESSION_COOKIE}=standin; Path=/")
+            else:
+                self._send(200, standin.render_login("Неправильный логин или пароль"))
+
+        # -------- helpers --------
+        def _logged_in(self) -> bool:
+            cookies = SimpleCookie(self.headers.get("Cookie", ""))
+            return SESSION_COOKIE in cookies
+
+        def _serve(self, route: str, render: Any) -> None:
+            if standin._inject(route):
+                self._send(503, "Service Unavailable")
+            else:
+                self._send(200, render())
+
+        def _redirect(self, location: str, cookie: str | None = None) -> None:
+            self.send_response(302)
+            self.send_header("Location", location)
+            if cookie:
+                self.send_header("Set-Cookie", cookie)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def _send(self, status: int, body: str) -> None:
+            payload = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return _Handler
@@ -0,0 +1,160 @@
+# utils/tracing.py
+# Playwright tracing policies: off / on-failure / sampled:<percent> / always.
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import weakref
+from pathlib import Path
+from typing import Any
+
+from playwright.async_api import BrowserContext as AsyncBrowserContext
+from playwright.sync_api import BrowserContext, Error as PWError
+
+ROOT = Path(__file__).resolve().parents[1]
+TRACE_DIR = Path(os.getenv("AVITO_TRACE_DIR", ROOT / "artifacts" / "traces"))
+DEFAULT_TRACING = os.getenv("AVITO_TRACING", "off").strip()
+MODES = ("off", "on-failure", "sampled:<percent>", "always")
+
+# Traced contexts always record actions, network and DOM snapshots (what a
+# failure is debugged from). The screencast and source capture, the expensive
+# parts, are only recorded under `always` (and for sampled tests).
+
+# context -> whether tracing was started with screenshots + sources; pooled
+# contexts keep tracing across tests and only open a new chunk per test
+_STARTED: weakref.WeakKeyDictionary[Any, bool] = weakref.WeakKeyDictionary()
+
+
+class TracePolicy:
+    """A parsed --trace-policy value; `mode_for` resolves sampling per test/run."""
+
+    def __init__(self, spec: str = DEFAULT_TRACING) -> None:
+        spec = spec.strip().lower()
+        self.spec = spec
+        self.percent = 0.0
+        if spec.startswith("sampled:"):
+            try:
+                self.percent = float(spec.split(":", 1)[1].rstrip("%"))
+            except ValueError:
+                self.percent = -1
+            if not 0 <= self.percent <= 100:
+                raise ValueError(f"Bad sample rate in '{spec}': use sampled:0..100")
+            self.mode = "sampled"
+        elif spec in ("off", "on-failure", "always"):
+            self.mode = spec
+        else:
+            raise ValueError(
+                f"Unknown tracing mode '{spec}'. Choose one of: {', '.join(MODES)}"
+            )
+
+    def mode_for(self, key: str) -> str:
+        """Mode for one test: off, on-failure or always (sampling is stable per key)."""
+        if self.mode != "sampled":
+            return self.mode
+        bucket = int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:8], 16) % 10_000
+        return "always" if bucket < self.percent * 100 else "off"
+
+
+class TraceSession:
+    """
+    Traces the contexts one test (or one tool run) uses. Each context gets a
+    chunk for the session; `finish` writes the chunks out if the mode keeps
+    them (always, or on-failure after `failed` was set) and discards them otherwise.
+    Sampling is decided on `name`; `stamp` (e.g. a run timestamp) only goes into
+    the file name, so repeated runs of one profile are sampled alike.
+    """
+
+    def __init__(
+        self,
+        policy: TracePolicy,
+        name: str,
+        out_dir: Path = TRACE_DIR,
+        *,
+        stamp: str = "",
+    ) -> None:
+        self.name = name
+        self.stamp = stamp
+        self.mode = policy.mode_for(name)
+        self.out_dir = out_dir
+        self.failed = False
+        self.saved: list[Path] = []
+        self._contexts: list[Any] = []
+
+    @property
+    def full(self) -> bool:
+        return self.mode == "always"
+
+    def attach(self, context: BrowserContext) -> None:
+        if self.mode == "off" or context in self._contexts:
+            return
+        started = _STARTED.get(context)
+        if started != self.full:
+            if started is not None:
+                context.tracing.stop()
+            context.tracing.start(
+                screenshots=self.full, snapshots=True, sources=self.full
+            )
+            _STARTED[context] = self.full
+        context.tracing.start_chunk(title=self.name)
+        self._contexts.append(context)
+
+    async def attach_async(self, context: AsyncBrowserContext) -> None:
+        if self.mode == "off" or context in self._contexts:
+            return
+        started = _STARTED.get(context)
+        if started != self.full:
+            if started is not None:
+                await context.tracing.stop()
+            await context.tracing.start(
+                screenshots=self.full, snapshots=True, sources=self.full
+            )
+            _STARTED[context] = self.full
+        await context.tracing.start_chunk(title=self.name)
+        self._contexts.append(context)
+
+    @property
+    def keep(self) -> bool:
+        return self.mode == "always" or (self.mode == "on-failure" and self.failed)
+
+    def detach(self, context: BrowserContext) -> Path | None:
+        """End the context's chunk (call before closing or pooling it); returns the saved path."""
+        if context not in self._contexts:
+            return None
+        path = self._next_path() if self.keep else None
+        self._contexts.remove(context)
+        try:
+            context.tracing.stop_chunk(path=path)
+        except PWError:  # context already gone: nothing left to save
+            return None
+        return self._saved(path)
+
+    async def detach_async(self, context: AsyncBrowserContext) -> Path | None:
+        if context not in self._contexts:
+            return None
+        path = self._next_path() if self.keep else None
+        self._contexts.remove(context)
+        try:
+            await context.tracing.stop_chunk(path=path)
+        except PWError:
+            return None
+        return self._saved(path)
+
+    def finish(self) -> list[Path]:
+        """Detach every context still attached; returns all traces saved."""
+        for context in list(self._contexts):
+            self.detach(context)
+        return self.saved
+
+    def _next_path(self) -> Path:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^\w.-]+", "_", self.name).strip("_")[:120]
+        if self.stamp:
+            slug = f"{slug}_{self.stamp}"
+        suffix = f"-{len(self.saved) + 1}" if self.saved else ""
+        return self.out_dir / f"trace_{slug}{suffix}.zip"
+
+    def _saved(self, path: Path | None) -> Path | None:
+        if path is not None:
+            self.saved.append(path)
+        return path